@@ -0,0 +1,127 @@
+"""
+Requests and detection latency of fixed vs adaptive conditional polling.
+
+A local launch API serves the newest launches with an ETag and answers
+304 when the list is unchanged. Launches follow a compressed day: a
+quiet stretch, a burst and a trickle. The tracker polls it once with a
+fixed interval and unconditional requests (the previous behaviour) and
+once with AdaptivePoller, with every interval scaled down by `scale` so
+the run takes seconds rather than hours. Lags are reported unscaled.
+
+Usage:
+    python benchmarks/bench_adaptive_polling.py [seconds] [scale]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+
+import numpy as np
+from aiohttp import web
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('GMGN_API_KEY', 'test')
+os.environ.setdefault('PUMPFUN_API_KEY', 'test')
+
+from grok.polling import AdaptivePoller, DEFAULT_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+from grok.sources import GMGNSource
+from grok.tracker import LaunchTracker
+
+
+def launch_schedule(seconds):
+    """
+    Returns:
+        tuple: (launch offsets, burst start, burst end), quiet for 40% of
+            the run, 10/s burst for 20%, one every 2s after
+    """
+    quiet, burst = seconds * 0.4, seconds * 0.2
+    offsets = list(np.arange(quiet, quiet + burst, 0.1))
+    offsets += list(np.arange(quiet + burst, seconds, 2.0))
+    return offsets, quiet, quiet + burst
+
+
+def create_app(offsets, conditional):
+    state = {'start': None, 'requests': []}  # (offset, status) per request
+
+    async def handler(request):
+        elapsed = time.time() - state['start']
+        total = sum(1 for offset in offsets if offset <= elapsed)
+        published = offsets[max(total - 50, 0):total]
+        etag = f'"{total}"'
+        if conditional and request.headers.get('If-None-Match') == etag:
+            state['requests'].append((elapsed, 304))
+            return web.Response(status=304, headers={'ETag': etag})
+        state['requests'].append((elapsed, 200))
+        body = [
+            {'token_address': f'mint{i}', 'symbol': f'TOK{i}', 'launch_time': state['start'] + offset}
+            for i, offset in enumerate(published, total - len(published))
+        ]
+        return web.json_response(body, headers={'ETag': etag})
+
+    app = web.Application()
+    app['state'] = state
+    app.router.add_get('/new_launches', handler)
+    return app
+
+
+async def run(seconds, poller, conditional):
+    offsets, burst_start, burst_end = launch_schedule(seconds)
+    app = create_app(offsets, conditional)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    tracker = LaunchTracker(sources=[GMGNSource(base, poller=poller)])
+    lags = []
+
+    async def callback(launch):
+        offset = launch['launch_time'] - app['state']['start']
+        lags.append((burst_start <= offset < burst_end, time.time() - launch['launch_time']))
+
+    app['state']['start'] = time.time()
+    task = asyncio.create_task(tracker._run_source(tracker.sources['gmgn'], callback))
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await tracker.close()
+    await runner.cleanup()
+    phases = {'burst': [0, 0], 'off-peak': [0, 0]}  # [requests, 304s]
+    for offset, status in app['state']['requests']:
+        phase = phases['burst' if burst_start <= offset < burst_end else 'off-peak']
+        phase[0] += 1
+        phase[1] += status == 304
+    return phases, lags, len(offsets), poller.get_stats()
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scale = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    logging.basicConfig(level=logging.ERROR)
+
+    fixed = AdaptivePoller(
+        interval=DEFAULT_POLL_INTERVAL * scale,
+        min_interval=DEFAULT_POLL_INTERVAL * scale,
+        max_interval=DEFAULT_POLL_INTERVAL * scale
+    )
+    adaptive = AdaptivePoller(
+        interval=DEFAULT_POLL_INTERVAL * scale,
+        min_interval=DEFAULT_MIN_POLL_INTERVAL * scale,
+        max_interval=DEFAULT_MAX_POLL_INTERVAL * scale
+    )
+    print(f"{seconds:.0f}s run, intervals scaled by {scale}")
+    for name, poller, conditional in (('fixed', fixed, False), ('adaptive', adaptive, True)):
+        phases, lags, launches, stats = asyncio.run(run(seconds, poller, conditional))
+        print(f"{name:>9}: {len(lags)}/{launches} launches detected, {stats['new_per_poll']:.2f} new per poll")
+        for phase, (requests, not_modified) in phases.items():
+            phase_lags = np.array([lag for in_burst, lag in lags if in_burst == (phase == 'burst')] or [np.nan])
+            p50, p99 = np.percentile(phase_lags * 1000 / scale, (50, 99))
+            print(f"{phase:>18}: {requests:>4} requests, {requests - not_modified:>4} full lists, "
+                  f"detection lag p50 {p50:>6.0f}ms p99 {p99:>6.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
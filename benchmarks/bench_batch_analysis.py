@@ -0,0 +1,68 @@
+"""
+Compare per-token and batch analysis passes of DataAnalyzer.
+
+Usage:
+    python benchmarks/bench_batch_analysis.py [token counts...]
+"""
+import os
+import sys
+import time
+import asyncio
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.analyzer import DataAnalyzer
+
+TICKS_PER_TOKEN = 200
+
+
+def build_analyzer(tokens, batch_mode, seed=7):
+    """Fill an analyzer with synthetic random-walk ticks"""
+    rng = np.random.default_rng(seed)
+    analyzer = DataAnalyzer(tick_capacity=TICKS_PER_TOKEN, batch_mode=batch_mode)
+
+    # Prediction trains a model per token and would dominate both modes
+    async def no_prediction(token_address, ticks):
+        return None
+    analyzer._predict_price = no_prediction
+
+    start = time.time() - TICKS_PER_TOKEN
+    for token in range(tokens):
+        prices = np.cumprod(1 + rng.normal(0, 0.01, TICKS_PER_TOKEN))
+        volumes = rng.random(TICKS_PER_TOKEN) * 1000
+        address = f"token{token}"
+        for i in range(TICKS_PER_TOKEN):
+            analyzer.update_token_data(address, {
+                'timestamp': start + i,
+                'price': prices[i],
+                'volume': volumes[i],
+                'liquidity': 500000.0
+            })
+    return analyzer
+
+
+async def time_pass(analyzer):
+    results = 0
+
+    async def callback(analysis):
+        nonlocal results
+        results += 1
+
+    start = time.perf_counter()
+    await analyzer._analyze_all_tokens(callback)
+    return time.perf_counter() - start, results
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    print(f"{'tokens':>8} {'per-token (s)':>14} {'batch (s)':>10} {'speedup':>8}")
+    for tokens in counts:
+        per_token, _ = asyncio.run(time_pass(build_analyzer(tokens, False)))
+        batch, _ = asyncio.run(time_pass(build_analyzer(tokens, True)))
+        print(f"{tokens:>8} {per_token:>14.3f} {batch:>10.3f} {per_token / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
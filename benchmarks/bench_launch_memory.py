@@ -0,0 +1,119 @@
+"""
+Memory of tracked launches over a simulated week of launch traffic.
+
+Feeds synthetic pump.fun-style launches through LaunchTracker in polls
+of 50, every launch returned twice as real feeds do, and samples traced
+memory as they accumulate: the original unbounded dict of launch
+records vs the bounded seen-address index plus LRU record store. The
+cost of one dedup check is timed separately, without tracing.
+
+Usage:
+    python benchmarks/bench_launch_memory.py [launches] [records]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('GMGN_API_KEY', 'test')
+os.environ.setdefault('PUMPFUN_API_KEY', 'test')
+
+from grok.symbols import BASE58_ALPHABET
+from grok.tracker import LaunchTracker
+
+POLL_SIZE = 50
+
+
+def synthetic_launches(count, seed=5):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'token_address': '8' + ''.join(rng.choice(BASE58_ALPHABET) for _ in range(43)),
+            'symbol': f'TOK{i}',
+            'name': f'Token number {i}',
+            'launch_time': 1700000000 + i * 2.5,
+            'initial_price': rng.random() / 1000,
+            'initial_liquidity': rng.random() * 10000,
+            'launch_type': 'fair',
+            'platform': 'pump.fun',
+            'pair_address': '9' + ''.join(rng.choice(BASE58_ALPHABET) for _ in range(43))
+        }
+
+
+class LegacyTracker(LaunchTracker):
+    """The original unbounded dict of records checked with `in`"""
+
+    async def _process_launches(self, launches, source, callback):
+        new_launches = 0
+        for launch in launches:
+            token_address = launch['token_address']
+            if token_address not in self.legacy:
+                self.legacy[token_address] = dict(launch, source=source)
+                new_launches += 1
+        return new_launches
+
+
+async def feed(tracker, count):
+    async def callback(launch):
+        pass
+
+    samples = []
+    polls = list(synthetic_launches(count))
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for offset in range(0, count, POLL_SIZE):
+        batch = polls[offset:offset + POLL_SIZE]
+        # The previous poll's launches come back once more
+        previous = polls[max(offset - POLL_SIZE, 0):offset]
+        await tracker._process_launches(previous + batch, 'pumpfun', callback)
+        if (offset // POLL_SIZE) % max(count // POLL_SIZE // 7, 1) == 0:
+            samples.append((offset + len(batch), tracemalloc.get_traced_memory()[0] - base))
+    samples.append((count, tracemalloc.get_traced_memory()[0] - base))
+    tracemalloc.stop()
+    return samples
+
+
+def time_checks(tracker, legacy, count):
+    """Seconds per dedup check of an already seen address"""
+    addresses = list(legacy)[-count:]
+    start = time.perf_counter()
+    for address in addresses:
+        address in legacy
+    legacy_check = (time.perf_counter() - start) / len(addresses)
+
+    start = time.perf_counter()
+    for address in addresses:
+        tracker.seen_launches.add(address)
+    bounded_check = (time.perf_counter() - start) / len(addresses)
+    return legacy_check, bounded_check
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 250000  # About a week of pump.fun launches
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    legacy = LegacyTracker()
+    legacy.legacy = {}
+    bounded = LaunchTracker(launch_records=records, seen_launches=count // 2)
+
+    print(f"{count} launches, {records} records kept, {count // 2} addresses remembered")
+    results = {}
+    for name, tracker in (('unbounded dict', legacy), ('bounded', bounded)):
+        results[name] = asyncio.run(feed(tracker, count))
+
+    print(f"{'launches':>10} {'dict MB':>9} {'bounded MB':>11}")
+    for (seen, legacy_bytes), (_, bounded_bytes) in zip(results['unbounded dict'], results['bounded']):
+        print(f"{seen:>10} {legacy_bytes / 2 ** 20:>9.1f} {bounded_bytes / 2 ** 20:>11.1f}")
+    print(f"bounded stats: {bounded.get_stats()['launches']}")
+
+    legacy_check, bounded_check = time_checks(bounded, legacy.legacy, count // 4)
+    print(f"dedup check: dict {legacy_check * 1e6:.2f} us, "
+          f"seen index {bounded_check * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
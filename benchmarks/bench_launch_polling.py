@@ -0,0 +1,114 @@
+"""
+Launch poll latency with per-poll sessions vs pooled keep-alive sessions.
+
+Serves the GMGN and PumpFun launch endpoints from a local aiohttp server
+that counts the TCP connections it accepts, then polls both sources the
+way the tracker used to (a new ClientSession per poll) and through
+LaunchTracker's long-lived sessions. Over localhost the saving is the
+TCP handshake and session setup only; against the real APIs each new
+connection also pays DNS, a network round trip per handshake and TLS.
+
+Usage:
+    python benchmarks/bench_launch_polling.py [polls] [launches_per_response]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('GMGN_API_KEY', 'test')
+os.environ.setdefault('PUMPFUN_API_KEY', 'test')
+
+from grok.stats import LatencyWindow
+from grok.tracker import LaunchTracker
+
+
+def create_app(launches):
+    state = {'connections': set()}
+    body = [
+        {'token_address': f'mint{i}', 'symbol': f'TOK{i}', 'name': f'Token {i}', 'initial_price': 0.001}
+        for i in range(launches)
+    ]
+
+    async def handler(request):
+        state['connections'].add(request.transport.get_extra_info('peername'))  # Client port per connection
+        return web.json_response(body)
+
+    app = web.Application()
+    app['state'] = state
+    app.router.add_get('/new_launches', handler)
+    app.router.add_get('/launches', handler)
+    return app
+
+
+async def legacy_poll(url, latency):
+    """The original per-poll session"""
+    start = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers={'Content-Type': 'application/json'}) as response:
+            await response.json()
+    latency.record(time.perf_counter() - start)
+
+
+async def run(polls, launches):
+    app = create_app(launches)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    state = app['state']
+
+    async def callback(launch):
+        pass
+
+    legacy = {'gmgn': LatencyWindow(), 'pumpfun': LatencyWindow()}
+    start = time.perf_counter()
+    for _ in range(polls):
+        await asyncio.gather(
+            legacy_poll(f"{base}/new_launches", legacy['gmgn']),
+            legacy_poll(f"{base}/launches", legacy['pumpfun'])
+        )
+    legacy_wall = time.perf_counter() - start
+    legacy_connections = len(state['connections'])
+
+    state['connections'].clear()
+    tracker = LaunchTracker(gmgn_url=base, pumpfun_url=base)
+    start = time.perf_counter()
+    for _ in range(polls):
+        await asyncio.gather(*(tracker._poll(source, callback) for source in tracker.sources.values()))
+    pooled_wall = time.perf_counter() - start
+    pooled_connections = len(state['connections'])
+    await tracker.close()
+    await runner.cleanup()
+
+    return (
+        (legacy_wall, legacy_connections, {source: w.summary() for source, w in legacy.items()}),
+        (pooled_wall, pooled_connections, {name: source.health.latency.summary() for name, source in tracker.sources.items()})
+    )
+
+
+def main():
+    polls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    launches = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    logging.basicConfig(level=logging.ERROR)
+
+    results = asyncio.run(run(polls, launches))
+    print(f"{polls} polls of both sources, {launches} launches per response")
+    for name, (wall, connections, latency) in zip(('per-poll session', 'pooled sessions'), results):
+        sources = ', '.join(
+            f"{source} p50 {stats['p50']:.2f}ms p99 {stats['p99']:.2f}ms"
+            for source, stats in latency.items()
+        )
+        print(f"{name:>16}: {wall / polls * 1000:.2f}ms per poll, "
+              f"{connections} TCP connections, {sources}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Detection lag of healthy launch sources next to a slow and a failing one.
+
+Runs `healthy` in-process FakeLaunchSources alongside one whose fetches
+take up to 3s and one that fails half its polls, all on a fixed poll
+interval. The previous loop polled every source with one
+asyncio.gather per cycle, so each cycle waited for the slowest fetch;
+LaunchTracker.start_tracking runs each source in its own task with its
+own timeout. Reports polls, status and the lag from a launch's creation
+to its callback, per source kind.
+
+Usage:
+    python benchmarks/bench_launch_sources.py [seconds] [healthy]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.polling import AdaptivePoller
+from grok.sources import FakeLaunchSource
+from grok.tracker import LaunchTracker
+
+INTERVAL = 0.5  # Seconds between polls of every source
+RATE = 4.0  # Launches per second per source
+
+
+def create_sources(healthy):
+    def poller():
+        return AdaptivePoller(interval=INTERVAL, min_interval=INTERVAL, max_interval=INTERVAL)
+
+    sources = [
+        FakeLaunchSource(f'healthy{i}', rate=RATE, latency=0.05, seed=i, poller=poller())
+        for i in range(healthy)
+    ]
+    sources.append(FakeLaunchSource('slow', rate=RATE, latency=3.0, seed=1001, timeout=1.0, poller=poller()))
+    sources.append(FakeLaunchSource('failing', rate=RATE, latency=0.05, failure_rate=0.5, seed=1002, poller=poller()))
+    return sources
+
+
+class GatherTracker(LaunchTracker):
+    """The previous loop, every source polled once per cycle"""
+
+    async def start_tracking(self, callback):
+        while True:
+            results = await asyncio.gather(
+                *(source.fetch() for source in self.sources.values()),
+                return_exceptions=True
+            )
+            for source, result in zip(self.sources.values(), results):
+                if isinstance(result, Exception) or result[1] is None:
+                    source.health.record_error()
+                    continue
+                source.health.record_success(0.0)
+                await self._process_launches(result[1], source.name, callback)
+            await asyncio.sleep(INTERVAL)
+
+
+async def run(tracker_class, seconds, healthy):
+    tracker = tracker_class(sources=create_sources(healthy))
+    lags = {}  # Source kind -> seconds from creation to callback
+
+    async def callback(launch):
+        if launch['event'] == 'launch':
+            kind = launch['source'].rstrip('0123456789')
+            lags.setdefault(kind, []).append(time.time() - launch['launch_time'])
+
+    task = asyncio.create_task(tracker.start_tracking(callback))
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return tracker, lags
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    healthy = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print(f"{seconds:.0f}s, {healthy} healthy sources + slow + failing, "
+          f"{RATE:.0f} launches/s each, polled every {INTERVAL}s")
+    for name, tracker_class in (('gather per cycle', GatherTracker), ('task per source', LaunchTracker)):
+        tracker, lags = asyncio.run(run(tracker_class, seconds, healthy))
+        stats = tracker.get_stats()
+        print(f"{name}: {stats['launches']['seen']} launches")
+        for kind in ('healthy', 'slow', 'failing'):
+            sources = [s for n, s in stats.items() if n.rstrip('0123456789') == kind]
+            requests = sum(s['requests'] for s in sources) / len(sources)
+            errors = sum(s['errors'] for s in sources) / len(sources)
+            statuses = sorted({s['status'] for s in sources})
+            p50, p99 = np.percentile(np.array(lags.get(kind) or [np.nan]) * 1000, (50, 99))
+            print(f"{kind:>12}: {requests:>5.1f} polls, {errors:>4.1f} errors, {'/'.join(statuses):>17}, "
+                  f"detection lag p50 {p50:>6.0f}ms p99 {p99:>6.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Memory of raw mention storage, dict per mention vs compact records.
+
+Stores a synthetic workload of viral mentions (a few hundred influencers
+repeatedly mentioning a few thousand symbols) both as the original list
+of mention dicts and as MentionHistory records sharing UserTable
+profiles, measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_mention_memory.py [mentions] [symbols] [users]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.mentions import MentionHistory, Mention, UserTable
+
+
+def synthetic_mentions(count, symbols, users, seed=3):
+    """(timestamp, tweet_id, symbol, user_id, followers, retweets, likes) columns"""
+    rng = np.random.default_rng(seed)
+    start = time.time() - 86400
+    return (
+        (start + np.sort(rng.random(count)) * 86400).tolist(),
+        (10 ** 18 + np.arange(count)).tolist(),
+        # Zipf-like skew: a few symbols and authors dominate a viral burst
+        np.minimum(rng.zipf(1.3, count), symbols).tolist(),
+        np.minimum(rng.zipf(1.2, count), users).tolist(),
+        rng.integers(100, 500000, users + 1).tolist(),
+        rng.integers(0, 1000, count).tolist(),
+        rng.integers(0, 5000, count).tolist()
+    )
+
+
+def store_dicts(columns, followers):
+    trends = {}
+    for timestamp, tweet_id, symbol, user_id, retweets, likes in zip(*columns):
+        trends.setdefault(f'SYM{symbol}', []).append({
+            'timestamp': datetime.fromtimestamp(timestamp),
+            'tweet_id': tweet_id,
+            'user': f'user_{user_id}',
+            'followers': followers[user_id],
+            'retweets': retweets,
+            'likes': likes
+        })
+    return trends
+
+
+def store_compact(columns, followers):
+    trends = {}
+    users = UserTable()
+    for timestamp, tweet_id, symbol, user_id, retweets, likes in zip(*columns):
+        user = users.observe(user_id, f'user_{user_id}', followers[user_id], timestamp)
+        history = trends.get(f'SYM{symbol}')
+        if history is None:
+            history = trends[f'SYM{symbol}'] = MentionHistory()
+        history.append(Mention(timestamp, tweet_id, user, retweets, likes))
+    return trends, users
+
+
+def measure(build, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    users = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+
+    timestamps, tweet_ids, symbol_ids, user_ids, followers, retweets, likes = \
+        synthetic_mentions(count, symbols, users)
+    columns = (timestamps, tweet_ids, symbol_ids, user_ids, retweets, likes)
+
+    dicts, dict_bytes, dict_time = measure(store_dicts, columns, followers)
+    del dicts
+    (compact, table), compact_bytes, compact_time = measure(store_compact, columns, followers)
+
+    # Lazy views hand back the original shape
+    symbol = next(iter(compact))
+    assert set(compact[symbol][0]) == {'timestamp', 'tweet_id', 'user', 'followers', 'retweets', 'likes', 'weight'}
+
+    print(f"{count} mentions of {len(compact)} symbols by {len(table)} users")
+    print(f"{'storage':>8}  {'MB':>8}  {'bytes/mention':>13}  {'build (s)':>9}")
+    for name, size, elapsed in (
+        ('dicts', dict_bytes, dict_time),
+        ('compact', compact_bytes, compact_time)
+    ):
+        print(f"{name:>8}  {size / 1e6:8.1f}  {size / count:13.1f}  {elapsed:9.2f}")
+    print(f"saving: {1 - compact_bytes / dict_bytes:.0%}")
+
+
+if __name__ == '__main__':
+    main()
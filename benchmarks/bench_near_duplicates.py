@@ -0,0 +1,129 @@
+"""
+Near-duplicate filtering of synthetic shill bursts.
+
+Mixes organic tweets with campaigns posting one template from many
+accounts, each copy with a different handle, t.co link, emoji or swapped
+word. Reports the per-tweet cost of NearDuplicateFilter, how many copies
+it collapses, organic tweets wrongly merged, and the mentions the
+scanner counts for a shilled symbol with and without the filter.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [tweets] [burst_rate] [batch_size]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.neardup import NearDuplicateFilter
+from grok.scanner import TwitterScanner
+from grok.stream import StreamTweet, StreamUser
+
+WORDS = (
+    'just aped into this gem on solana the chart looks insane dev is based '
+    'community takeover happening now do not fade this one lfg pumping send '
+    'it moon soon bag holders rug pull new launch early entry low cap'
+).split()
+EMOJIS = ('🚀', '🔥', '💎', '🌕', '')
+TICKERS = ('WIF', 'BONK', 'POPCAT', 'MEW', 'SLERF', 'BOME', 'MYRO', 'PONKE')
+
+
+def campaign_copy(template, rng):
+    """One copy of a shill template as posted by a bot account"""
+    words = template.split()
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words))
+        if not words[i].startswith('$'):
+            words[i] = rng.choice(WORDS)
+    return (f"@{rng.choice(('degen', 'whale', 'ape'))}{rng.randint(1, 99999)} " + ' '.join(words) +
+            f" {rng.choice(EMOJIS)} https://t.co/{rng.getrandbits(40):x}")
+
+
+def synthetic_tweets(count, burst_rate, seed=3):
+    """
+    Returns:
+        list: (text, campaign index or None) per tweet
+    """
+    rng = random.Random(seed)
+    templates = [
+        ' '.join(rng.choices(WORDS, k=rng.randint(12, 20)) + [f'${TICKERS[i % len(TICKERS)]}'])
+        for i in range(20)
+    ]
+    tweets = []
+    while len(tweets) < count:
+        if rng.random() < burst_rate:
+            # A burst of copies of one campaign
+            campaign = rng.randrange(len(templates))
+            for _ in range(rng.randint(20, 80)):
+                tweets.append((campaign_copy(templates[campaign], rng), campaign))
+        else:
+            words = rng.choices(WORDS, k=rng.randint(8, 25))
+            words.insert(rng.randrange(len(words) + 1), f'${rng.choice(TICKERS)}')
+            tweets.append((' '.join(words), None))
+    return tweets[:count]
+
+
+async def scanner_mentions(tweets, batch_size, duplicates):
+    scanner = TwitterScanner(
+        mode='stream',
+        stream=object(),
+        cursor_path=None,
+        duplicates=NearDuplicateFilter() if duplicates else NearDuplicateFilter(threshold=2.0)  # 2.0 never matches
+    )
+
+    async def callback(alert):
+        pass
+
+    rng = random.Random(4)
+    statuses = [
+        StreamTweet(i, text, StreamUser(rng.randint(1, 10 ** 6), 'user', rng.randint(10, 10000)), 0, 0)
+        for i, (text, _) in enumerate(tweets)
+    ]
+    for offset in range(0, len(statuses), batch_size):
+        await scanner._process_tweets(statuses[offset:offset + batch_size], callback)
+    return {symbol: (len(window), window.copies) for symbol, window in scanner.windows.items()}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    burst_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01  # Chance a campaign burst starts
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    logging.basicConfig(level=logging.ERROR)
+
+    tweets = synthetic_tweets(count, burst_rate)
+    texts = [text for text, _ in tweets]
+    tags = [text.rsplit('$', 1)[-1].split()[0] for text in texts]  # Shilled ticker
+
+    duplicates = NearDuplicateFilter(maxsize=5000)
+    results = []
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        results += duplicates.add_batch(texts[offset:offset + batch_size], tags[offset:offset + batch_size])
+    elapsed = time.perf_counter() - start
+
+    spam = sum(1 for _, campaign in tweets if campaign is not None)
+    collapsed = sum(1 for (_, campaign), (_, dup) in zip(tweets, results) if campaign is not None and dup)
+    merged = sum(1 for (_, campaign), (_, dup) in zip(tweets, results) if campaign is None and dup)
+    organic = count - spam
+    stats = duplicates.get_stats()
+    print(f"{count} tweets ({spam} campaign copies), batches of {batch_size}: "
+          f"{elapsed / count * 1e6:.1f} us/tweet")
+    print(f"campaign copies collapsed: {collapsed}/{spam} ({collapsed / max(spam, 1):.1%}), "
+          f"organic tweets merged: {merged}/{organic} ({merged / max(organic, 1):.2%})")
+    print(f"clusters created {stats['clusters']}, active {stats['active_clusters']}/5000, "
+          f"evicted {stats['evicted']}, buckets {stats['buckets']}")
+
+    without = asyncio.run(scanner_mentions(tweets, batch_size, False))
+    with_filter = asyncio.run(scanner_mentions(tweets, batch_size, True))
+    print("24h mentions per symbol, without -> with the filter (copies counted):")
+    for symbol in sorted(without, key=without.get, reverse=True):
+        mentions, copies = with_filter.get(symbol, (0, 0))
+        print(f"{symbol:>8}: {without[symbol][0]:>7} -> {mentions:>7} ({copies})")
+
+
+if __name__ == '__main__':
+    main()
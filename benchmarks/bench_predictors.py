@@ -0,0 +1,97 @@
+"""
+Compare the random forest and online price prediction engines on replayed ticks.
+
+Each tick is replayed in order: the engine is fed the labelled rows known
+at that point and asked for the next price, as DataAnalyzer does. Reports
+fit (update) and predict latency plus prediction error for both engines.
+
+Usage:
+    python benchmarks/bench_predictors.py [ticks]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.features import FeatureStore
+from grok.models import fit_random_forest, OnlinePredictor, DEFAULT_RETRAIN_EVERY
+
+WARMUP = 48
+
+
+def replay_data(ticks, seed=11):
+    """Synthetic price path with drifting trend and volume bursts"""
+    rng = np.random.default_rng(seed)
+    drift = np.cumsum(rng.normal(0, 0.0005, ticks))
+    prices = np.exp(np.cumsum(drift + rng.normal(0, 0.01, ticks)))
+    volumes = rng.gamma(2.0, 500.0, ticks)
+    return prices, volumes
+
+
+def labelled_features(prices, volumes):
+    """Feature rows as DataAnalyzer builds them, labelled with the next price"""
+    store = FeatureStore(capacity=len(prices), max_age=None)
+    for i in range(len(prices)):
+        store.update(i, prices[i], volumes[i])
+    X, y, _ = store.training_set(include_social=False)
+    return np.array(X), np.array(y)
+
+
+def run_random_forest(X, y):
+    """Refit every DEFAULT_RETRAIN_EVERY rows like the registry policy"""
+    model = None
+    fit_times, predict_times, errors = [], [], []
+    for row in range(WARMUP, len(X) - 1):
+        if model is None or row % DEFAULT_RETRAIN_EVERY == 0:
+            start = time.perf_counter()
+            model = fit_random_forest(X[:row], y[:row])
+            fit_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        prediction = model.predict(X[row:row + 1])[0]
+        predict_times.append(time.perf_counter() - start)
+        errors.append(abs(prediction - y[row]) / y[row])
+    return fit_times, predict_times, errors
+
+
+def run_online(X, y):
+    """One RLS update per new row"""
+    engine = OnlinePredictor()
+    engine.update('bench', X[:WARMUP], y[:WARMUP], WARMUP)
+    fit_times, predict_times, errors = [], [], []
+    for row in range(WARMUP, len(X) - 1):
+        start = time.perf_counter()
+        engine.update('bench', X[:row], y[:row], row)
+        fit_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        prediction = engine.predict('bench', X[row:row + 1])
+        predict_times.append(time.perf_counter() - start)
+        errors.append(abs(prediction - y[row]) / y[row])
+    return fit_times, predict_times, errors
+
+
+def report(name, fit_times, predict_times, errors):
+    fit_ms = np.array(fit_times) * 1000
+    predict_us = np.array(predict_times) * 1e6
+    print(
+        f"{name:>14} {len(fit_ms):>6} {np.median(fit_ms):>12.3f} {fit_ms.sum() / 1000:>10.2f} "
+        f"{np.median(predict_us):>12.1f} {np.mean(errors) * 100:>8.3f}%"
+    )
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    X, y = labelled_features(*replay_data(ticks))
+
+    print(f"{len(X)} labelled rows, {X.shape[1]} features")
+    print(f"{'engine':>14} {'fits':>6} {'fit p50 (ms)':>12} {'fit total':>10} {'predict (us)':>12} {'MAPE':>9}")
+    report('random_forest', *run_random_forest(X, y))
+    report('online', *run_online(X, y))
+
+
+if __name__ == '__main__':
+    main()
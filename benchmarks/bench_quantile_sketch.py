@@ -0,0 +1,95 @@
+"""
+Error bound and cost of the streaming support/resistance quantile sketch.
+
+Replays a synthetic price walk with jumps through a WindowedQuantileSketch
+and compares its quantiles with exact np.percentile over the same window.
+
+Usage:
+    python benchmarks/bench_quantile_sketch.py [ticks] [tick_seconds]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.quantiles import WindowedQuantileSketch, DEFAULT_RELATIVE_ACCURACY
+from grok.tickstore import DEFAULT_MAX_AGE
+
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+
+def synthetic_prices(ticks, seed=11):
+    """Geometric random walk with occasional pumps and dumps"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.004, ticks)
+    jumps = rng.random(ticks) < 0.0005
+    returns[jumps] += rng.normal(0, 0.3, int(jumps.sum()))
+    return 0.001 * np.exp(np.cumsum(returns))
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    tick_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    prices = synthetic_prices(ticks)
+    timestamps = 1.7e9 + np.arange(ticks) * tick_seconds
+    sketch = WindowedQuantileSketch(DEFAULT_MAX_AGE)
+    bucket = sketch.bucket_seconds
+
+    worst = {q: 0.0 for q in QUANTILES}
+    worst_linear = {q: 0.0 for q in QUANTILES}
+    update_time = 0.0
+    checks = 0
+    for start in range(0, ticks, 1000):
+        stop = min(start + 1000, ticks)
+        began = time.perf_counter()
+        for timestamp, price in zip(timestamps[start:stop].tolist(), prices[start:stop].tolist()):
+            sketch.add(timestamp, price)
+        update_time += time.perf_counter() - began
+
+        # Exact percentiles over the ticks the bucketed window still holds
+        cutoff = timestamps[stop - 1] - DEFAULT_MAX_AGE
+        first = np.searchsorted(timestamps, np.floor(cutoff / bucket) * bucket, side='left')
+        window = prices[first:stop]
+        assert len(window) == len(sketch), (len(window), len(sketch))
+        for q in QUANTILES:
+            estimate = sketch.quantile(q)
+            exact = np.percentile(window, q * 100, method='lower')
+            linear = np.percentile(window, q * 100)
+            worst[q] = max(worst[q], abs(estimate - exact) / exact)
+            worst_linear[q] = max(worst_linear[q], abs(estimate - linear) / linear)
+        checks += 1
+
+    print(f"{ticks} ticks every {tick_seconds:g}s, {checks} checks, window holds {len(sketch)} ticks")
+    print(f"relative accuracy bound: {DEFAULT_RELATIVE_ACCURACY:.4f}, sketch memory: {sketch.nbytes} bytes")
+    for q in QUANTILES:
+        print(
+            f"  q={q:<5} max rel error {worst[q]:.5f} (rank), "
+            f"{worst_linear[q]:.5f} (interpolated percentile)"
+        )
+
+    # Read cost against the np.percentile call it replaces
+    window = prices[-min(len(prices), 20000):]
+    reads = 2000
+    began = time.perf_counter()
+    for _ in range(reads):
+        sketch.add(timestamps[-1], prices[-1])  # Invalidate the cached counts
+        sketch.quantile(0.25)
+        sketch.quantile(0.75)
+    sketch_read = (time.perf_counter() - began) / reads
+    began = time.perf_counter()
+    for _ in range(reads):
+        np.percentile(window, 25)
+        np.percentile(window, 75)
+    exact_read = (time.perf_counter() - began) / reads
+
+    print(f"update: {update_time / ticks * 1e6:.2f} us/tick")
+    print(f"support+resistance: sketch {sketch_read * 1e6:.1f} us (incl. one update), "
+          f"np.percentile over {len(window)} ticks {exact_read * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
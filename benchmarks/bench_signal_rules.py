@@ -0,0 +1,82 @@
+"""
+Time vectorized signal rule evaluation over a synthetic metrics table.
+
+Usage:
+    python benchmarks/bench_signal_rules.py [rules] [tokens]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.signals import SignalEngine, DEFAULT_RULES
+
+NUMERIC_FIELDS = (
+    'price_change_1h', 'price_change_24h', 'volume_1h', 'volume_24h',
+    'volatility', 'momentum', 'liquidity_score', 'social_score'
+)
+
+
+def synthetic_rules(count, seed=5):
+    """Default rules plus random tail-threshold rules with one or two conditions"""
+    rng = np.random.default_rng(seed)
+    rules = list(DEFAULT_RULES)
+    while len(rules) < count:
+        conditions = []
+        for _ in range(rng.integers(1, 3)):
+            upper = rng.random() < 0.5
+            conditions.append({
+                'field': str(rng.choice(NUMERIC_FIELDS)),
+                'operator': '>' if upper else '<',
+                'threshold': float(rng.uniform(1.5, 3) * (1 if upper else -1))
+            })
+        rules.append({
+            'name': f'rule_{len(rules)}',
+            'strength': 0.5,
+            'reason': f'Synthetic rule {len(rules)}',
+            'conditions': conditions
+        })
+    return rules
+
+
+def synthetic_table(tokens, seed=9):
+    rng = np.random.default_rng(seed)
+    table = {field: rng.normal(size=tokens) for field in NUMERIC_FIELDS}
+    table['current_price'] = rng.random(tokens)
+    table['support_level'] = rng.random(tokens)
+    table['volume_ma24'] = np.abs(rng.normal(size=tokens))
+    table['trend'] = rng.choice(
+        np.array(['uptrend', 'downtrend', 'sideways'], dtype=object), tokens
+    )
+    return table
+
+
+def main():
+    rules = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    engine = SignalEngine(rules=synthetic_rules(rules), path=None)
+    table = synthetic_table(tokens)
+
+    # Masks only, then masks plus building the per-token signal lists
+    timings = {'masks': [], 'signals': []}
+    for _ in range(20):
+        start = time.perf_counter()
+        engine.masks(table, tokens)
+        timings['masks'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        signals = engine.evaluate(table, tokens)
+        timings['signals'].append(time.perf_counter() - start)
+
+    matches = sum(len(token_signals) for token_signals in signals)
+    print(f"{rules} rules x {tokens} tokens, {matches} signals emitted")
+    for name, values in timings.items():
+        print(f"{name:>8}: {np.median(values) * 1000:.2f} ms (median of {len(values)})")
+
+
+if __name__ == '__main__':
+    main()
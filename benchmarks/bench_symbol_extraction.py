@@ -0,0 +1,103 @@
+"""
+Tweets per second of cashtag and mint address extraction.
+
+Compares the original per-tweet regex + stopword filter with the batch
+SymbolExtractor (cashtags, base58 mints and pump.fun links) on synthetic
+shill tweets.
+
+Usage:
+    python benchmarks/bench_symbol_extraction.py [tweets] [batch_size]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.symbols import SymbolExtractor, BASE58_ALPHABET
+
+WORDS = (
+    'just aped into this gem on solana the chart looks insane dev is based '
+    'community takeover happening now do not fade this one lfg'
+).split()
+
+
+def random_mint(rng):
+    return '7' + ''.join(rng.choice(BASE58_ALPHABET) for _ in range(43))
+
+
+def synthetic_tweets(count, seed=1):
+    rng = random.Random(seed)
+    tickers = [''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(3, 6))) for _ in range(500)]
+    tickers += ['SOL', 'BTC', 'THE', 'USDC']
+    mints = [random_mint(rng) for _ in range(200)]
+    tweets = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(8, 30))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), f'${rng.choice(tickers)}')
+        if rng.random() < 0.2:
+            words.append(f'https://pump.fun/coin/{rng.choice(mints)}')
+        elif rng.random() < 0.1:
+            words.append(f'CA: {rng.choice(mints)}')
+        tweets.append(' '.join(words))
+    return tweets
+
+
+def legacy_extract(text, pattern=re.compile(r'\$[A-Z]{3,10}\b')):
+    """The original per-tweet _extract_symbols"""
+    filtered = set()
+    common_words = {'THE', 'AND', 'FOR', 'SOL'}
+    for symbol in pattern.findall(text):
+        symbol = symbol[1:]
+        if symbol not in common_words:
+            filtered.add(symbol)
+    return filtered
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    tweets = synthetic_tweets(count)
+    extractor = SymbolExtractor(stopwords_path=None)
+
+    start = time.perf_counter()
+    for text in tweets:
+        legacy_extract(text)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in tweets:
+        extractor.extract(text)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mints = 0
+    for offset in range(0, count, batch_size):
+        for _, found in extractor.extract_batch(tweets[offset:offset + batch_size]):
+            mints += len(found)
+    batch = time.perf_counter() - start
+
+    # A large blacklist costs the same frozenset lookup
+    rng = random.Random(2)
+    blacklist = {''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(7)) for _ in range(50000)}
+    large = SymbolExtractor(blacklist=blacklist, stopwords_path=None)
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        large.extract_batch(tweets[offset:offset + batch_size])
+    large_batch = time.perf_counter() - start
+
+    print(f"{count} tweets, {len(extractor.stopwords)} stopwords, {mints} mint references")
+    for name, elapsed in (
+        ('legacy per-tweet (cashtags only)', legacy),
+        ('extractor per-tweet', single),
+        (f'extractor batches of {batch_size}', batch),
+        (f'+{len(blacklist)} blacklisted symbols', large_batch)
+    ):
+        print(f"{name:>34}: {count / elapsed:>10,.0f} tweets/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Throughput and reconnect behaviour of filtered-stream ingestion.
+
+Runs TwitterScanner in stream mode against mock_stream_server.py in the
+same process: first streaming as fast as the scanner consumes, then with
+the server dropping the connection every few thousand tweets after
+failing the first connections.
+
+Usage:
+    python benchmarks/bench_tweet_stream.py [seconds]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from mock_stream_server import create_app, start
+from grok.scanner import TwitterScanner
+from grok.stream import TweetStream
+
+
+async def run(seconds, **server_options):
+    runner, url = await start(create_app(**server_options))
+    stream = TweetStream(bearer_token='test', url=url, rules=['memecoin solana'], queue_size=2000)
+    scanner = TwitterScanner(mode='stream', stream=stream, cursor_path=None)
+
+    alerts = 0
+
+    async def callback(alert):
+        nonlocal alerts
+        alerts += 1
+
+    task = asyncio.create_task(scanner.start_scanning(callback))
+    start_time = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start_time
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await runner.cleanup()
+
+    stats = scanner.get_stats()
+    processed = stats['tweets']['total']['new'] + stats['tweets']['total']['duplicate']
+    return processed / elapsed, stats['stream'], alerts, runner.app['state']
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    logging.basicConfig(level=logging.ERROR)  # Reconnect warnings are expected here
+
+    rate, stream, alerts, server = asyncio.run(run(seconds))
+    print(f"unthrottled: {rate:,.0f} tweets/s through extraction and scoring, "
+          f"queue depth at stop {stream['queue_depth']}/2000 (reads pause when full)")
+
+    rate, stream, alerts, server = asyncio.run(
+        run(max(seconds, 10), disconnect_every=5000, fail_first=1, fail_status=503)
+    )
+    print(f"flaky server: {rate:,.0f} tweets/s, first connection failed with 503, "
+          f"{server['connections']} connection attempts, "
+          f"{stream['connects']} connected, {stream['disconnects']} disconnects, "
+          f"rules on server: {[rule['value'] for rule in server['rules']]}")
+
+
+if __name__ == '__main__':
+    main()
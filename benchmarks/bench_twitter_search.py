@@ -0,0 +1,85 @@
+"""
+Scan wall time and event loop stalls of the concurrent Twitter search.
+
+Runs TwitterScanner against a fake API whose search blocks for a random
+round trip, compared with calling every query in turn on the loop.
+
+Usage:
+    python benchmarks/bench_twitter_search.py [scans] [max_latency_ms]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from grok.scanner import TwitterScanner
+
+
+class FakeSearchAPI:
+    """Blocking search_tweets with a random round trip and no results"""
+
+    def __init__(self, max_latency):
+        self.max_latency = max_latency
+        self.slowest = 0.0
+
+    def search_tweets(self, **kwargs):
+        latency = random.uniform(self.max_latency / 4, self.max_latency)
+        self.slowest = max(self.slowest, latency)
+        time.sleep(latency)
+        return []
+
+
+async def max_loop_stall(task, tick=0.005):
+    """Longest gap between ticks of a coroutine sharing the loop with `task`"""
+    stall = 0.0
+    last = time.perf_counter()
+    while not task.done():
+        await asyncio.sleep(tick)
+        now = time.perf_counter()
+        stall = max(stall, now - last - tick)
+        last = now
+    await task
+    return stall
+
+
+async def run(scans, max_latency):
+    api = FakeSearchAPI(max_latency)
+    scanner = TwitterScanner(api=api)
+
+    async def sequential():
+        for query in scanner.keywords:
+            scanner._search(query)  # The blocking pre-change behaviour
+
+    results = {}
+    for name, scan in (('sequential', sequential), ('concurrent', scanner._search_tweets)):
+        walls, stalls, slowest = [], [], []
+        for _ in range(scans):
+            api.slowest = 0.0
+            start = time.perf_counter()
+            stalls.append(await max_loop_stall(asyncio.ensure_future(scan())))
+            walls.append(time.perf_counter() - start)
+            slowest.append(api.slowest)
+        results[name] = (walls, stalls, slowest)
+    scanner.close()
+    return results
+
+
+def main():
+    scans = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 400) / 1000
+
+    results = asyncio.run(run(scans, max_latency))
+    print(f"{scans} scans of 5 queries, round trips up to {max_latency * 1000:.0f} ms")
+    print(f"{'mode':>11}  {'scan (ms)':>10}  {'slowest query (ms)':>19}  {'max loop stall (ms)':>20}")
+    for name, (walls, stalls, slowest) in results.items():
+        print(
+            f"{name:>11}  {sum(walls) / scans * 1000:10.1f}  "
+            f"{sum(slowest) / scans * 1000:19.1f}  {max(stalls) * 1000:20.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Local stand-in for the Twitter v2 filtered-stream endpoints.
+
+Streams synthetic memecoin tweets as chunked newline-delimited JSON with
+blank keep-alive lines, drops the connection every N tweets and can fail
+the first connections with an HTTP status, so TweetStream throughput and
+reconnect behaviour can be exercised offline.
+
+Usage:
+    python benchmarks/mock_stream_server.py [--port 8081] [--rate 1000] [--disconnect-every 5000]
+
+Then point the scanner at it:
+    TWITTER_INGEST_MODE=stream TWITTER_BEARER_TOKEN=test \\
+    TWITTER_STREAM_URL=http://127.0.0.1:8081/2/tweets/search/stream ...
+"""
+import json
+import random
+import asyncio
+import argparse
+import itertools
+
+from aiohttp import web
+
+STREAM_PATH = '/2/tweets/search/stream'
+TICKERS = ('WIF', 'BONK', 'POPCAT', 'MEW', 'SLERF', 'BOME', 'MYRO', 'PONKE')
+
+
+def tweet_line(tweet_id, rng):
+    """One filtered-stream JSON object with its author expanded"""
+    author_id = str(rng.randint(1, 5000))
+    return json.dumps({
+        'data': {
+            'id': str(tweet_id),
+            'author_id': author_id,
+            'text': f"${rng.choice(TICKERS)} is sending, ${rng.choice(TICKERS)} next",
+            'public_metrics': {
+                'retweet_count': rng.randint(0, 500),
+                'like_count': rng.randint(0, 2000)
+            }
+        },
+        'includes': {'users': [{
+            'id': author_id,
+            'username': f'user_{author_id}',
+            'public_metrics': {'followers_count': rng.randint(10, 200000)}
+        }]},
+        'matching_rules': [{'id': '1', 'tag': 'memecoin'}]
+    }).encode() + b'\r\n'
+
+
+def create_app(rate=None, disconnect_every=None, fail_first=0, fail_status=503,
+               keep_alive=20.0, chunk=100, seed=7):
+    """
+    Build the mock server
+
+    Args:
+        rate: Tweets per second, None streams as fast as the client reads
+        disconnect_every: Close each connection after this many tweets
+        fail_first: Number of initial connections answered with fail_status
+        keep_alive: Seconds between blank keep-alive lines when idle
+        chunk: Tweets written per chunk
+    """
+    rng = random.Random(seed)
+    ids = itertools.count(10 ** 18)
+    state = {'connections': 0, 'tweets': 0, 'rules': [], 'rule_ids': 0}
+
+    async def stream(request):
+        state['connections'] += 1
+        if state['connections'] <= fail_first:
+            return web.json_response({'title': 'Unavailable'}, status=fail_status)
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        sent = 0
+        idle = 0.0
+        try:
+            while disconnect_every is None or sent < disconnect_every:
+                if rate == 0:
+                    await asyncio.sleep(1)
+                    idle += 1
+                    if idle >= keep_alive:
+                        await response.write(b'\r\n')
+                        idle = 0.0
+                    continue
+                count = chunk if disconnect_every is None else min(chunk, disconnect_every - sent)
+                await response.write(b''.join(tweet_line(next(ids), rng) for _ in range(count)))
+                sent += count
+                state['tweets'] += count
+                if rate:
+                    await asyncio.sleep(count / rate)
+        except ConnectionError:
+            pass  # Client went away
+        return response  # Ends the chunked body, the client sees a disconnect
+
+    async def get_rules(request):
+        return web.json_response({'data': state['rules'], 'meta': {'result_count': len(state['rules'])}})
+
+    async def post_rules(request):
+        body = await request.json()
+        for rule in body.get('add', ()):
+            state['rule_ids'] += 1
+            state['rules'].append({'id': str(state['rule_ids']), 'value': rule['value']})
+        deleted = set(body.get('delete', {}).get('ids', ()))
+        state['rules'] = [rule for rule in state['rules'] if rule['id'] not in deleted]
+        return web.json_response({'meta': {'summary': {
+            'created': len(body.get('add', ())),
+            'deleted': len(deleted)
+        }}})
+
+    app = web.Application()
+    app['state'] = state
+    app.router.add_get(STREAM_PATH, stream)
+    app.router.add_get(f'{STREAM_PATH}/rules', get_rules)
+    app.router.add_post(f'{STREAM_PATH}/rules', post_rules)
+    return app
+
+
+async def start(app, host='127.0.0.1', port=0):
+    """Run the app in the current loop, returns (runner, base URL of the stream)"""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://{host}:{port}{STREAM_PATH}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--rate', type=float, default=1000, help='tweets per second, 0 sends only keep-alives')
+    parser.add_argument('--disconnect-every', type=int, default=None)
+    parser.add_argument('--fail-first', type=int, default=0)
+    parser.add_argument('--fail-status', type=int, default=503)
+    args = parser.parse_args()
+
+    app = create_app(args.rate, args.disconnect_every, args.fail_first, args.fail_status)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
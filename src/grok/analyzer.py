@@ -1,17 +1,108 @@
-import pandas as pd
+import os
+import time
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 import asyncio
 
+from .tickstore import TickBuffer, to_epoch, DEFAULT_CAPACITY, DEFAULT_MAX_AGE
+from .indicators import StreamingIndicators
+from .batch import analyze_batch, DEFAULT_BATCH_WINDOW, DEFAULT_BATCH_SIZE, DEFAULT_TREND_HOURS, TREND_RESOLUTION, MIN_TREND_BARS
+from .models import ModelRegistry, OnlinePredictor
+from .features import FeatureStore, DEFAULT_FEATURE_CAPACITY
+from .scheduler import AnalysisScheduler, DEFAULT_SPIKE_FACTOR
+from .bars import BarAggregator
+from .signals import SignalEngine
+from .quantiles import WindowedQuantileSketch
+from .dispatch import CallbackDispatcher, DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS
+
 logger = logging.getLogger(__name__)
 
+EXPIRE_INTERVAL = 60  # Seconds between sweeps for tokens whose ticks all aged out
+
+# Metrics read straight from the analyze_batch output
+BATCH_METRICS = (
+    'current_price',
+    'price_change_1h',
+    'price_change_24h',
+    'volume_1h',
+    'volume_24h',
+    'volume_ma24',
+    'volatility',
+    'support_level',
+    'resistance_level',
+    'momentum',
+    'liquidity_score',
+    'social_score'
+)
+
+
+# Price prediction engines selectable with ANALYZER_PREDICTOR
+PREDICTOR_ENGINES = {
+    ModelRegistry.name: ModelRegistry,
+    OnlinePredictor.name: OnlinePredictor
+}
+
+
+def create_predictor(engine=None):
+    """
+    Create the price prediction engine for this deployment
+    
+    Args:
+        engine: Engine name, defaults to ANALYZER_PREDICTOR or 'random_forest'
+    """
+    engine = engine or os.getenv('ANALYZER_PREDICTOR', ModelRegistry.name)
+    if engine not in PREDICTOR_ENGINES:
+        raise ValueError(
+            f"Unknown predictor engine '{engine}', expected one of {sorted(PREDICTOR_ENGINES)}"
+        )
+    return PREDICTOR_ENGINES[engine]()
+
+
+def _optional(value):
+    """Convert a batch matrix cell to float, NaN becomes None"""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
 class DataAnalyzer:
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100)
-        self.token_data = {}  # Store historical data
+    def __init__(
+        self,
+        tick_capacity=DEFAULT_CAPACITY,
+        max_age=DEFAULT_MAX_AGE,
+        batch_mode=False,
+        batch_window=DEFAULT_BATCH_WINDOW,
+        batch_size=DEFAULT_BATCH_SIZE,
+        predictor=None,
+        feature_capacity=DEFAULT_FEATURE_CAPACITY,
+        scheduler=None,
+        spike_factor=DEFAULT_SPIKE_FACTOR,
+        signal_engine=None,
+        dispatch_queue_size=DEFAULT_QUEUE_SIZE,
+        dispatch_workers=DEFAULT_WORKERS,
+        dispatch_overflow='coalesce'
+    ):
+        self.predictor = predictor or create_predictor()  # Price prediction engine
+        self.tick_capacity = tick_capacity
+        self.max_age = max_age
+        self.batch_mode = batch_mode  # Compute metrics of all tokens in one vectorized pass, predictions stay per token
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.token_data = {}  # Token address -> TickBuffer of historical data
+        self.indicators = {}  # Token address -> StreamingIndicators
+        self.feature_capacity = feature_capacity
+        self.features = {}  # Token address -> FeatureStore of ML feature rows
+        self.bars = {}  # Token address -> BarAggregator of 1s/1m/5m/1h OHLCV bars
+        self.levels = {}  # Token address -> WindowedQuantileSketch of prices over max_age
         self.analysis_results = {}  # Store analysis results
+        self.scheduler = scheduler or AnalysisScheduler()  # Picks tokens to re-analyze
+        self.spike_factor = spike_factor  # Volume spike that makes a token hot
+        self.signal_engine = signal_engine or SignalEngine()  # Declarative signal rules
+        self.dispatch_queue_size = dispatch_queue_size
+        self.dispatch_workers = dispatch_workers
+        self.dispatch_overflow = dispatch_overflow  # 'coalesce' or 'drop_oldest'
+        self.dispatcher = None
+        self._next_expiry = 0.0
         
     async def start_analysis(self, callback):
         """
@@ -20,104 +111,248 @@ class DataAnalyzer:
         Args:
             callback: Function to call with analysis results
         """
+        await self.predictor.load()  # Warm start from persisted state
+        
+        # Results go through a bounded queue so a slow consumer can't stall a pass
+        self.dispatcher = CallbackDispatcher(
+            callback,
+            maxsize=self.dispatch_queue_size,
+            workers=self.dispatch_workers,
+            overflow=self.dispatch_overflow,
+            key=lambda analysis: analysis['token_address']
+        )
+        self.dispatcher.start()
+        callback = self.dispatcher.submit
+        
         while True:
             try:
-                await self._analyze_all_tokens(callback)
-                await asyncio.sleep(30)  # Analyze every 30 seconds
+                # Only tokens with new data, hot ones at a sub-second cadence
+                due = self.scheduler.pop_due()
+                if due:
+                    await self._analyze_all_tokens(callback, due)
+                if time.time() >= self._next_expiry:
+                    self.expire_tokens()
+                    self._next_expiry = time.time() + EXPIRE_INTERVAL
+                await asyncio.sleep(
+                    self.scheduler.next_due_in(cap=self.scheduler.hot_interval)
+                )
                 
             except Exception as e:
                 logger.error(f"Error in data analysis: {str(e)}")
                 await asyncio.sleep(60)  # Wait longer on error
                 
-    async def _analyze_all_tokens(self, callback):
-        """Analyze all tracked tokens"""
-        for token_address in self.token_data:
+    async def _analyze_all_tokens(self, callback, token_addresses=None):
+        """
+        Analyze tracked tokens
+        
+        Args:
+            callback: Function to call with analysis results
+            token_addresses: Tokens to analyze, defaults to all tracked tokens
+        """
+        # Snapshot, update_token_data may add tokens while we await
+        if token_addresses is None:
+            tokens = list(self.token_data.items())
+        else:
+            tokens = [
+                (token_address, self.token_data[token_address])
+                for token_address in token_addresses
+                if token_address in self.token_data
+            ]
+        
+        if self.batch_mode:
+            await self._analyze_batch(tokens, callback)
+            return
+            
+        analyzed = []
+        for token_address, _ in tokens:
             try:
-                analysis = await self._analyze_token(token_address)
-                if analysis:
-                    self.analysis_results[token_address] = analysis
-                    await callback(analysis)
+                metrics = await self._calculate_metrics(token_address)
+                if metrics:
+                    analyzed.append((token_address, metrics))
             except Exception as e:
                 logger.error(f"Error analyzing token {token_address}: {str(e)}")
                 
+        await self._publish(analyzed, callback)
+        
+    async def _publish(self, analyzed, callback, table=None):
+        """
+        Evaluate signal rules for all analyzed tokens at once and publish
+        
+        Args:
+            analyzed: List of (token_address, metrics) pairs
+            callback: Function to call with analysis results
+            table: Prebuilt metrics table, built from the metrics if omitted
+        """
+        signals = self._generate_signals(
+            [metrics for _, metrics in analyzed], table
+        )
+        
+        for (token_address, metrics), token_signals in zip(analyzed, signals):
+            try:
+                analysis = self._build_analysis(token_address, metrics, token_signals)
+                self.analysis_results[token_address] = analysis
+                await callback(analysis)
+            except Exception as e:
+                logger.error(f"Error publishing analysis of {token_address}: {str(e)}")
+                
+    async def _analyze_batch(self, tokens, callback):
+        """
+        Analyze tokens in chunks of vectorized passes
+        
+        Args:
+            tokens: List of (token_address, TickBuffer) pairs
+            callback: Function to call with analysis results
+        """
+        # Tokens that never had a price have no bars
+        tokens = [token for token in tokens if token[0] in self.bars]
+        
+        for start in range(0, len(tokens), self.batch_size):
+            chunk = tokens[start:start + self.batch_size]
+            batch = analyze_batch(
+                [ticks for _, ticks in chunk],
+                [self.bars[token_address] for token_address, _ in chunk],
+                [self.levels[token_address] for token_address, _ in chunk],
+                window=self.batch_window
+            )
+            rows = np.flatnonzero(batch['mask'])
+            batch['trend'] = np.array(
+                [self._trend_label(_optional(slope)) for slope in batch['slope']],
+                dtype=object
+            )
+            
+            analyzed = []
+            predictions = np.full(len(rows), np.nan)
+            for i, row in enumerate(rows):
+                token_address, ticks = chunk[row]
+                try:
+                    metrics = {
+                        name: float(batch[name][row]) for name in BATCH_METRICS
+                    }
+                    for name in ('support_level', 'resistance_level', 'liquidity_score', 'social_score'):
+                        metrics[name] = _optional(metrics[name])
+                    metrics['trend'] = batch['trend'][row]
+                    metrics['predicted_price'] = await self._predict_price(token_address, ticks)
+                    if metrics['predicted_price'] is not None:
+                        predictions[i] = metrics['predicted_price']
+                    analyzed.append((token_address, metrics))
+                except Exception as e:
+                    logger.error(f"Error analyzing token {token_address}: {str(e)}")
+                    
+            if len(analyzed) == len(rows):
+                # Signal rules read the batch columns directly
+                table = {
+                    name: batch[name][rows]
+                    for name in BATCH_METRICS + ('trend',)
+                }
+                table['predicted_price'] = predictions
+                await self._publish(analyzed, callback, table)
+            else:
+                await self._publish(analyzed, callback)
+                
     async def _analyze_token(self, token_address):
         """Analyze single token data"""
-        data = self.token_data.get(token_address)
-        if not data or len(data) < 10:  # Need minimum data points
+        metrics = await self._calculate_metrics(token_address)
+        if metrics is None:
             return None
-            
-        df = pd.DataFrame(data)
+        signals = self._generate_signals([metrics])[0]
+        return self._build_analysis(token_address, metrics, signals)
         
-        # Basic indicators
-        current_price = df['price'].iloc[-1]
-        price_change = self._calculate_price_change(df)
-        volume = self._calculate_volume(df)
-        volatility = self._calculate_volatility(df)
-        trend = self._detect_trend(df)
+    async def _calculate_metrics(self, token_address):
+        """Calculate all metrics of a single token"""
+        ticks = self.token_data.get(token_address)
+        if ticks is None or len(ticks) < 10:  # Need minimum data points
+            return None
+        indicators = self.indicators.get(token_address)
+        if indicators is None:
+            return None
+            
+        bars = self.bars[token_address]
+        now = time.time()
+            
+        # Basic indicators, time windows read hourly and finer bars
+        current_price = ticks.last('price')
+        price_change = self._calculate_price_change(current_price, bars, now)
+        volume = self._calculate_volume(bars, now)
+        volume_1h = self._calculate_volume(bars, now, hours=1, resolution='1m')
+        volatility = self._calculate_volatility(bars, now)
+        trend = self._detect_trend(bars, now)
         
         # Advanced analysis
-        support, resistance = self._calculate_support_resistance(df)
-        momentum = self._calculate_momentum(df)
-        liquidity = self._analyze_liquidity(df)
-        prediction = await self._predict_price(df)
+        support, resistance = self._calculate_support_resistance(self.levels[token_address])
+        momentum = self._calculate_momentum(indicators)
+        liquidity = self._analyze_liquidity(ticks)
+        prediction = await self._predict_price(token_address, ticks)
         
         # Social metrics if available
-        social_score = self._calculate_social_score(df)
+        social_score = self._calculate_social_score(ticks)
+        
+        return {
+            'current_price': current_price,
+            'price_change_1h': price_change['1h'],
+            'price_change_24h': price_change['24h'],
+            'volume_1h': volume_1h,
+            'volume_24h': volume,
+            'volume_ma24': volume / DEFAULT_TREND_HOURS,  # Average hourly volume
+            'volatility': volatility,
+            'trend': trend,
+            'support_level': support,
+            'resistance_level': resistance,
+            'momentum': momentum,
+            'liquidity_score': liquidity,
+            'social_score': social_score,
+            'predicted_price': prediction
+        }
         
+    def _build_analysis(self, token_address, metrics, signals):
+        """Wrap token metrics and their signals into an analysis result"""
         return {
             'token_address': token_address,
             'timestamp': datetime.now().isoformat(),
-            'metrics': {
-                'current_price': current_price,
-                'price_change_1h': price_change['1h'],
-                'price_change_24h': price_change['24h'],
-                'volume_24h': volume,
-                'volatility': volatility,
-                'trend': trend,
-                'support_level': support,
-                'resistance_level': resistance,
-                'momentum': momentum,
-                'liquidity_score': liquidity,
-                'social_score': social_score,
-                'predicted_price': prediction
-            },
-            'signals': self._generate_signals(locals())
+            'metrics': metrics,
+            'signals': signals
         }
         
-    def _calculate_price_change(self, df):
+    def _calculate_price_change(self, current, bars, now):
         """Calculate price changes over different periods"""
-        current = df['price'].iloc[-1]
         changes = {}
         
         for period, hours in [('1h', 1), ('24h', 24)]:
-            if len(df) >= hours:
-                previous = df['price'].iloc[-hours]
-                changes[period] = ((current - previous) / previous) * 100
+            previous = bars.price_at(now - hours * 3600)
+            if previous:
+                changes[period] = (current - previous) / previous * 100
             else:
                 changes[period] = 0
                 
         return changes
         
-    def _calculate_volume(self, df, hours=24):
-        """Calculate trading volume"""
-        if len(df) < hours:
-            return df['volume'].sum()
-        return df['volume'].tail(hours).sum()
-        
-    def _calculate_volatility(self, df, hours=24):
-        """Calculate price volatility"""
-        if len(df) < hours:
-            return df['price'].std()
-        return df['price'].tail(hours).std()
-        
-    def _detect_trend(self, df, hours=24):
-        """Detect price trend using linear regression"""
-        if len(df) < hours:
-            return 'insufficient_data'
+    def _calculate_volume(self, bars, now, hours=DEFAULT_TREND_HOURS, resolution='1h'):
+        """Calculate trading volume from bars"""
+        volumes = bars[resolution].since('volume', now - hours * 3600)
+        return float(volumes.sum())
+        
+    def _calculate_volatility(self, bars, now, hours=DEFAULT_TREND_HOURS):
+        """Calculate price volatility of the trend bars' closes"""
+        closes = bars[TREND_RESOLUTION].since('close', now - hours * 3600)
+        if len(closes) < 2:
+            return float('nan')
+        return float(closes.std(ddof=1))
+        
+    def _detect_trend(self, bars, now, hours=DEFAULT_TREND_HOURS):
+        """Detect price trend using linear regression of closes on bar time"""
+        series = bars[TREND_RESOLUTION]
+        cutoff = now - hours * 3600
+        closes = series.since('close', cutoff)
+        if len(closes) < MIN_TREND_BARS:
+            return self._trend_label(None)
             
-        prices = df['price'].tail(hours)
-        x = np.arange(len(prices))
-        slope = np.polyfit(x, prices, 1)[0]
+        # Slope per hour, so gaps between bars don't skew it
+        hours_ago = (series.since('start', cutoff) - now) / 3600
+        return self._trend_label(np.polyfit(hours_ago, closes, 1)[0])
+        
+    def _trend_label(self, slope):
+        """Classify a regression slope, None means not enough data"""
+        if slope is None:
+            return 'insufficient_data'
         
         if slope > 0.01:
             return 'uptrend'
@@ -126,35 +361,34 @@ class DataAnalyzer:
         else:
             return 'sideways'
             
-    def _calculate_support_resistance(self, df):
+    def _calculate_support_resistance(self, levels):
         """Calculate support and resistance levels"""
-        prices = df['price'].values
-        
-        # Simple method using percentiles
-        support = np.percentile(prices, 25)
-        resistance = np.percentile(prices, 75)
+        # 25th/75th price percentiles, read from the streaming sketch within 1%
+        support = levels.quantile(0.25)
+        resistance = levels.quantile(0.75)
         
         return support, resistance
         
-    def _calculate_momentum(self, df):
-        """Calculate price momentum"""
-        roc = df['price'].pct_change(periods=12)  # Rate of change
-        return roc.mean() * 100
+    def _calculate_momentum(self, indicators):
+        """Calculate price momentum from the streaming rate of change"""
+        return indicators.momentum()
         
-    def _analyze_liquidity(self, df):
+    def _analyze_liquidity(self, ticks):
         """Analyze token liquidity"""
-        if 'liquidity' not in df.columns:
+        if not ticks.has('liquidity'):
             return None
             
-        recent = df.tail(24)  # Last 24 hours
+        # Last 24 hours
+        liquidity = ticks.tail('liquidity', 24)
+        volume = ticks.tail('volume', 24)
         
         # Calculate liquidity score based on:
         # - Average liquidity
         # - Liquidity stability
         # - Volume/Liquidity ratio
-        avg_liquidity = recent['liquidity'].mean()
-        liquidity_stability = 1 - recent['liquidity'].std() / avg_liquidity
-        volume_liquidity_ratio = recent['volume'].sum() / avg_liquidity
+        avg_liquidity = np.nanmean(liquidity)
+        liquidity_stability = 1 - np.nanstd(liquidity, ddof=1) / avg_liquidity
+        volume_liquidity_ratio = np.nansum(volume) / avg_liquidity
         
         # Combine metrics into score (0-1)
         score = (
@@ -163,117 +397,181 @@ class DataAnalyzer:
             0.3 * min(volume_liquidity_ratio / 0.5, 1)  # Cap at 50% turnover
         )
         
-        return score
+        return float(score)
         
-    def _calculate_social_score(self, df):
+    def _calculate_social_score(self, ticks):
         """Calculate social sentiment score"""
-        if 'social_mentions' not in df.columns:
+        if not ticks.has('social_mentions'):
             return None
             
-        recent = df.tail(24)
-        
         # Combine different social metrics
-        mentions = recent['social_mentions'].sum()
-        sentiment = recent.get('sentiment', pd.Series([0])).mean()
+        mentions = np.nansum(ticks.tail('social_mentions', 24))
+        if ticks.has('sentiment'):
+            sentiment = np.nanmean(ticks.tail('sentiment', 24))
+        else:
+            sentiment = 0
         
         # Normalize and combine
         norm_mentions = min(mentions / 1000, 1)  # Cap at 1000 mentions
         norm_sentiment = (sentiment + 1) / 2  # Convert -1,1 to 0,1
         
-        return (norm_mentions * 0.7 + norm_sentiment * 0.3)
+        return float(norm_mentions * 0.7 + norm_sentiment * 0.3)
+        
+    async def _predict_price(self, token_address, ticks):
+        """
+        Predict next price with the configured prediction engine
         
-    async def _predict_price(self, df):
-        """Predict future price using ML"""
-        if len(df) < 48:  # Need enough historical data
+        Only inference and cheap incremental updates run on the event loop,
+        the random forest engine refits in a process pool.
+        """
+        store = self.features.get(token_address)
+        if store is None or len(ticks) < 48:  # Need enough historical data
             return None
             
         try:
-            # Create features
-            X = self._create_features(df)
-            y = df['price'].shift(-1).dropna()
-            
-            if len(X) != len(y):
+            # Labelled feature rows, read from the incremental feature store
+            X, y, latest = self._create_features(store, ticks)
+            if not len(latest):
                 return None
                 
-            # Train on recent data
-            train_size = int(len(X) * 0.8)
-            X_train = X[:train_size]
-            y_train = y[:train_size]
-            
-            # Fit model
-            self.model.fit(X_train, y_train)
-            
+            if len(X):
+                self.predictor.update(token_address, X, y, store.total - 1)
+                
             # Predict next price
-            next_price = self.model.predict(X[-1:])
-            return float(next_price[0])
+            return self.predictor.predict(token_address, latest)
             
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
             return None
             
-    def _create_features(self, df):
-        """Create feature set for ML prediction"""
-        features = pd.DataFrame()
+    def _create_features(self, store, ticks):
+        """
+        Get the feature set for ML prediction
+        
+        Returns:
+            tuple: (X, y, latest) views of the token's FeatureStore
+        """
+        # Social features only once the token has social data
+        return store.training_set(include_social=ticks.has('social_mentions'))
         
-        # Price changes over different periods
-        for period in [1, 3, 6, 12, 24]:
-            features[f'price_change_{period}h'] = df['price'].pct_change(period)
+    def _generate_signals(self, metrics_list, table=None):
+        """
+        Generate trading signals for many tokens at once
+        
+        Args:
+            metrics_list: Metric dicts, one per token
+            table: Optional prebuilt columnar table of the same metrics
             
-        # Volume features
-        features['volume_ma24'] = df['volume'].rolling(24).mean()
-        features['volume_std24'] = df['volume'].rolling(24).std()
+        Returns:
+            list: Signal list per token
+        """
+        # Rules can be changed on disk without a deploy
+        self.signal_engine.reload_if_changed()
         
-        # Price features
-        features['price_ma24'] = df['price'].rolling(24).mean()
-        features['price_std24'] = df['price'].rolling(24).std()
+        if table is None:
+            return self.signal_engine.evaluate_metrics(metrics_list)
+        return self.signal_engine.evaluate(table, len(metrics_list))
         
-        # Add social metrics if available
-        if 'social_mentions' in df.columns:
-            features['social_ma24'] = df['social_mentions'].rolling(24).mean()
+    def update_token_data(self, token_address, new_data):
+        """Update historical data for a token"""
+        timestamp = to_epoch(new_data.get('timestamp'))
+        if self.max_age and timestamp <= time.time() - self.max_age:
+            return  # Would be evicted straight away
             
-        return features.dropna()
-        
-    def _generate_signals(self, data):
-        """Generate trading signals based on analysis"""
-        signals = []
-        metrics = data['metrics']
-        
-        # Trend following signals
-        if metrics['trend'] == 'uptrend' and metrics['momentum'] > 0:
-            signals.append({
-                'type': 'buy',
-                'strength': 0.7,
-                'reason': 'Strong uptrend with positive momentum'
-            })
+        ticks = self.token_data.get(token_address)
+        if ticks is None:
+            ticks = TickBuffer(self.tick_capacity, self.max_age)
+            self.token_data[token_address] = ticks
             
-        # Reversal signals
-        if metrics['price'] <= metrics['support_level']:
-            signals.append({
-                'type': 'buy',
-                'strength': 0.6,
-                'reason': 'Price at support level'
-            })
+        # O(1) append, ticks older than max_age are evicted by binary search
+        if not ticks.append(new_data, timestamp):
+            return  # Older than the token's newest tick
+        
+        self.scheduler.mark_dirty(token_address)
+        
+        price = new_data.get('price')
+        if price is not None:
+            indicators = self.indicators.get(token_address)
+            if indicators is None:
+                indicators = StreamingIndicators()
+                self.indicators[token_address] = indicators
+                
+            # Volume spikes promote the token to the hot analysis cadence
+            volume = new_data.get('volume')
+            if volume and indicators.count:
+                average = indicators.volume_sum() / indicators.count
+                if average > 0 and volume > average * self.spike_factor:
+                    self.scheduler.mark_hot(token_address)
+                    
+            indicators.update(price, volume)
             
-        # Volume-based signals
-        if metrics['volume_24h'] > metrics.get('volume_ma24', 0) * 2:
-            signals.append({
-                'type': 'buy',
-                'strength': 0.5,
-                'reason': 'High volume spike'
-            })
+            bars = self.bars.get(token_address)
+            if bars is None:
+                bars = BarAggregator()
+                self.bars[token_address] = bars
+            bars.update(timestamp, price, volume)
             
-        return signals
-        
-    def update_token_data(self, token_address, new_data):
-        """Update historical data for a token"""
-        if token_address not in self.token_data:
-            self.token_data[token_address] = []
+            levels = self.levels.get(token_address)
+            if levels is None:
+                levels = WindowedQuantileSketch(self.max_age or DEFAULT_MAX_AGE)
+                self.levels[token_address] = levels
+            levels.add(timestamp, price)
+            
+            features = self.features.get(token_address)
+            if features is None:
+                features = FeatureStore(self.feature_capacity, self.max_age)
+                self.features[token_address] = features
+            features.update(
+                timestamp,
+                price,
+                new_data.get('volume'),
+                new_data.get('social_mentions')
+            )
             
-        self.token_data[token_address].append(new_data)
-        
-        # Keep only last 7 days of data
-        cutoff = datetime.now() - timedelta(days=7)
-        self.token_data[token_address] = [
-            d for d in self.token_data[token_address]
-            if datetime.fromisoformat(d['timestamp']) > cutoff
-        ]
+    def expire_tokens(self, now=None):
+        """
+        Drop every token whose ticks have all aged past max_age
+        
+        Ticks are only evicted on append, so tokens that stopped trading
+        are swept here, along with their indicators, bars, scheduling
+        state and price model.
+        
+        Returns:
+            int: Number of tokens dropped
+        """
+        if not self.max_age:
+            return 0
+        cutoff = (now or time.time()) - self.max_age
+        expired = []
+        for token_address, ticks in self.token_data.items():
+            ticks.evict_before(cutoff)
+            if not len(ticks):
+                expired.append(token_address)
+        for token_address in expired:
+            for state in (
+                self.token_data, self.indicators, self.features,
+                self.bars, self.levels, self.analysis_results
+            ):
+                state.pop(token_address, None)
+            self.scheduler.forget(token_address)
+            self.predictor.forget(token_address)
+        if expired:
+            logger.info(f"Dropped {len(expired)} tokens without ticks in the last {self.max_age}s")
+        return len(expired)
+        
+    def set_open_positions(self, token_addresses):
+        """Keep tokens with open positions on the hot analysis cadence"""
+        self.scheduler.set_pinned(token_addresses)
+        
+    def get_stats(self):
+        """Get analyzer statistics"""
+        return {
+            'tracked_tokens': len(self.token_data),
+            'scheduler': self.scheduler.get_stats(),
+            'predictor': self.predictor.get_stats(),
+            'dispatch': self.dispatcher.get_stats() if self.dispatcher else None
+        }
+        
+    def close(self):
+        """Release background training resources"""
+        self.predictor.close()
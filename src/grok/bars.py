@@ -0,0 +1,114 @@
+import math
+import logging
+
+import numpy as np
+
+from .tickstore import ColumnRing
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ('start', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+# Bar length in seconds and bars kept per resolution
+RESOLUTIONS = {
+    '1s': 1,
+    '1m': 60,
+    '5m': 300,
+    '1h': 3600
+}
+DEFAULT_RETENTION = {
+    '1s': 300,  # 5 minutes
+    '1m': 180,  # 3 hours
+    '5m': 300,  # 25 hours, covers 24h price change at 5 minute precision
+    '1h': 168  # 7 days
+}
+
+
+class BarSeries(ColumnRing):
+    """
+    Streaming OHLCV bars of one resolution with bounded retention.
+
+    The newest row is the bar currently being built and is updated in
+    place; a tick in a later bucket opens a new row. Ticks older than the
+    open bar are ignored, so memory never exceeds `retention` rows.
+    """
+
+    def __init__(self, seconds, retention):
+        super().__init__(BAR_COLUMNS, retention, initial_size=min(retention, 16))
+        self.seconds = seconds
+        self.late_ticks = 0
+
+    def update(self, timestamp, price, volume=0.0):
+        """Fold one tick into the bar its timestamp falls in"""
+        start = math.floor(timestamp / self.seconds) * self.seconds
+        current = self.last('start')
+
+        if current is None or start > current:
+            self.append_row((start, price, price, price, price, volume, 1))
+        elif start == current:
+            self.set_last('high', max(self.last('high'), price))
+            self.set_last('low', min(self.last('low'), price))
+            self.set_last('close', price)
+            self.set_last('volume', self.last('volume') + volume)
+            self.set_last('ticks', self.last('ticks') + 1)
+        else:
+            self.late_ticks += 1
+
+    def since(self, name, cutoff):
+        """Get a view of a column for bars starting after `cutoff`"""
+        starts = self.column('start')
+        first = int(np.searchsorted(starts, cutoff, side='right'))
+        return self.column(name)[first:]
+
+    def close_at(self, timestamp):
+        """
+        Get the close of the last bar starting at or before `timestamp`
+
+        Returns:
+            float: Close price, or None if retention doesn't reach back that far
+        """
+        starts = self.column('start')
+        index = int(np.searchsorted(starts, timestamp, side='right')) - 1
+        if index < 0:
+            return None
+        return float(self.column('close')[index])
+
+
+class BarAggregator:
+    """
+    Rolls raw ticks of one token into 1s, 1m, 5m and 1h OHLCV bars.
+
+    Each resolution keeps a fixed number of bars, so memory stays flat for
+    long-lived tokens and a 24 hour window reads 24 hourly rows instead
+    of every tick.
+    """
+
+    def __init__(self, retention=None):
+        retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.series = {
+            name: BarSeries(seconds, retention[name])
+            for name, seconds in RESOLUTIONS.items()
+        }
+
+    def __getitem__(self, resolution):
+        return self.series[resolution]
+
+    def update(self, timestamp, price, volume=None):
+        """Fold one tick into every resolution"""
+        if volume is None or math.isnan(volume):
+            volume = 0.0
+        for series in self.series.values():
+            series.update(timestamp, price, volume)
+
+    def price_at(self, timestamp):
+        """
+        Get the price at a past time from the finest resolution covering it
+
+        Returns:
+            float: Close of the bar holding `timestamp`, or None if no
+                resolution reaches back that far
+        """
+        for series in self.series.values():
+            if len(series) and series.column('start')[0] <= timestamp:
+                return series.close_at(timestamp)
+        return None
@@ -0,0 +1,214 @@
+import time
+import logging
+import warnings
+
+import numpy as np
+
+from .indicators import DEFAULT_WINDOW, DEFAULT_ROC_PERIODS, DEFAULT_MOMENTUM_WINDOW
+from .bars import RESOLUTIONS
+
+logger = logging.getLogger(__name__)
+
+# Enough rows for a full momentum window of rate of change values
+DEFAULT_BATCH_WINDOW = DEFAULT_MOMENTUM_WINDOW + DEFAULT_ROC_PERIODS
+DEFAULT_BATCH_SIZE = 4096  # Tokens packed per matrix, bounds peak memory
+DEFAULT_TREND_HOURS = 24  # Hours of bars behind volume, volatility and trend
+TREND_RESOLUTION = '5m'  # Bars volatility and trend read, fine enough for tokens minutes old
+MIN_TREND_BARS = 6  # Bars in the window before a trend is reported
+MIN_DATA_POINTS = 10
+
+
+def pack_tail(buffers, column, window):
+    """
+    Pack the last `window` values of a column from many TickBuffers
+
+    Rows are right-aligned so the latest value of every token sits in the
+    last column; missing history is NaN.
+
+    Returns:
+        tuple: (tokens x window matrix, array of row lengths)
+    """
+    matrix = np.full((len(buffers), window), np.nan)
+    lengths = np.zeros(len(buffers), dtype=np.int64)
+
+    for row, ticks in enumerate(buffers):
+        values = ticks.tail(column, window)
+        n = len(values)
+        if n:
+            matrix[row, window - n:] = values
+            lengths[row] = n
+
+    return matrix, lengths
+
+
+def pack_rows(arrays, window):
+    """
+    Right-align 1D arrays of different lengths into a NaN-padded matrix
+
+    Returns:
+        tuple: (rows x window matrix, array of row lengths)
+    """
+    matrix = np.full((len(arrays), window), np.nan)
+    lengths = np.zeros(len(arrays), dtype=np.int64)
+
+    for row, values in enumerate(arrays):
+        n = min(len(values), window)
+        if n:
+            matrix[row, window - n:] = values[-n:]
+            lengths[row] = n
+
+    return matrix, lengths
+
+
+def analyze_batch(
+    buffers,
+    bars,
+    levels,
+    now=None,
+    window=DEFAULT_BATCH_WINDOW,
+    hours=DEFAULT_TREND_HOURS,
+    roc_periods=DEFAULT_ROC_PERIODS,
+    min_points=MIN_DATA_POINTS
+):
+    """
+    Compute analyzer metrics for many tokens in one vectorized pass
+
+    Price predictions aren't part of the pass, the analyzer still asks
+    its predictor once per token.
+
+    Args:
+        buffers: Sequence of TickBuffer, one per token
+        bars: Sequence of BarAggregator, aligned with buffers
+        levels: Sequence of WindowedQuantileSketch of prices, aligned with buffers
+        now: Epoch the time windows end at, defaults to now
+        window: Ticks of history packed per token
+        hours: Hours in the volume/volatility/trend window
+        roc_periods: Lag of the rate of change used for momentum
+        min_points: Tokens with fewer ticks are masked out
+
+    Returns:
+        dict: Metric name -> array with one entry per token, plus 'mask'
+    """
+    now = now or time.time()
+    prices, lengths = pack_tail(buffers, 'price', window)
+    mask = lengths >= min_points
+
+    # Volume reads hourly bars, volatility and trend the closes and start
+    # times of the finer trend bars in the window, whatever bars there are
+    cutoff = now - hours * 3600
+    bar_volumes, _ = pack_rows(
+        [aggregator['1h'].since('volume', cutoff) for aggregator in bars], hours
+    )
+    trend_bars = hours * 3600 // RESOLUTIONS[TREND_RESOLUTION]
+    closes, bar_counts = pack_rows(
+        [aggregator[TREND_RESOLUTION].since('close', cutoff) for aggregator in bars], trend_bars
+    )
+    starts, _ = pack_rows(
+        [aggregator[TREND_RESOLUTION].since('start', cutoff) for aggregator in bars], trend_bars
+    )
+
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        # All-NaN rows are expected for short or masked tokens
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        current = prices[:, -1]
+        changes = {}
+        for period, seconds in [('1h', 3600), ('24h', 86400)]:
+            previous = np.array([
+                aggregator.price_at(now - seconds) or np.nan for aggregator in bars
+            ])
+            changes[period] = np.where(
+                np.isnan(previous), 0.0, (current - previous) / previous * 100
+            )
+
+        volume_sum = np.nansum(bar_volumes, axis=1)
+        volume_1h = np.array([
+            aggregator['1m'].since('volume', now - 3600).sum() for aggregator in bars
+        ])
+        volatility = np.nanstd(closes, axis=1, ddof=1)
+
+        # Least-squares slope per hour against bar start times, NaN padding
+        # drops out of the sums
+        x = (starts - now) / 3600
+        dx = x - np.nanmean(x, axis=1, keepdims=True)
+        dy = closes - np.nanmean(closes, axis=1, keepdims=True)
+        slope = np.nansum(dx * dy, axis=1) / np.nansum(dx * dx, axis=1)
+        slope = np.where(bar_counts >= MIN_TREND_BARS, slope, np.nan)
+
+        # Same price sketches as the per-token pass, one bin lookup per token
+        support = _sketch_quantiles(levels, 0.25)
+        resistance = _sketch_quantiles(levels, 0.75)
+
+        roc = prices[:, roc_periods:] / prices[:, :-roc_periods] - 1
+        momentum = np.nanmean(roc, axis=1) * 100
+
+        recent = min(DEFAULT_WINDOW, window)
+        volumes, _ = pack_tail(buffers, 'volume', recent)
+        liquidity_score = _liquidity_scores(buffers, volumes, recent)
+        social_score = _social_scores(buffers, recent)
+
+    return {
+        'mask': mask,
+        'current_price': current,
+        'price_change_1h': changes['1h'],
+        'price_change_24h': changes['24h'],
+        'volume_1h': volume_1h,
+        'volume_24h': volume_sum,
+        'volume_ma24': volume_sum / hours,
+        'volatility': volatility,
+        'slope': slope,
+        'support_level': support,
+        'resistance_level': resistance,
+        'momentum': momentum,
+        'liquidity_score': liquidity_score,
+        'social_score': social_score
+    }
+
+
+def _sketch_quantiles(levels, q):
+    """Quantile q of every token's price sketch, NaN where a sketch is empty"""
+    values = (sketch.quantile(q) for sketch in levels)
+    return np.fromiter(
+        (np.nan if value is None else value for value in values),
+        dtype=float, count=len(levels)
+    )
+
+
+def _liquidity_scores(buffers, volumes, recent):
+    """Vectorized DataAnalyzer._analyze_liquidity, NaN where unavailable"""
+    has_liquidity = np.fromiter(
+        (ticks.has('liquidity') for ticks in buffers), dtype=bool, count=len(buffers)
+    )
+    liquidity, _ = pack_tail(buffers, 'liquidity', recent)
+
+    avg_liquidity = np.nanmean(liquidity, axis=1)
+    stability = 1 - np.nanstd(liquidity, axis=1, ddof=1) / avg_liquidity
+    turnover = np.nansum(volumes, axis=1) / avg_liquidity
+
+    score = (
+        0.4 * np.minimum(avg_liquidity / 1000000, 1) +
+        0.3 * stability +
+        0.3 * np.minimum(turnover / 0.5, 1)
+    )
+    return np.where(has_liquidity, score, np.nan)
+
+
+def _social_scores(buffers, recent):
+    """Vectorized DataAnalyzer._calculate_social_score, NaN where unavailable"""
+    has_mentions = np.fromiter(
+        (ticks.has('social_mentions') for ticks in buffers),
+        dtype=bool, count=len(buffers)
+    )
+    has_sentiment = np.fromiter(
+        (ticks.has('sentiment') for ticks in buffers),
+        dtype=bool, count=len(buffers)
+    )
+    mentions, _ = pack_tail(buffers, 'social_mentions', recent)
+    sentiment, _ = pack_tail(buffers, 'sentiment', recent)
+
+    norm_mentions = np.minimum(np.nansum(mentions, axis=1) / 1000, 1)
+    norm_sentiment = (
+        np.where(has_sentiment, np.nanmean(sentiment, axis=1), 0.0) + 1
+    ) / 2
+    score = norm_mentions * 0.7 + norm_sentiment * 0.3
+    return np.where(has_mentions, score, np.nan)
@@ -0,0 +1,107 @@
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERT_WINDOW = float(os.getenv('TWITTER_ALERT_WINDOW', 60))  # Seconds between updates per symbol
+DEFAULT_MIN_CHANGE = float(os.getenv('TWITTER_ALERT_MIN_CHANGE', 0.1))  # Strength change that skips the window
+
+
+class AlertState:
+    """Emission state of one symbol"""
+
+    __slots__ = ('emitted_at', 'strength', 'mentions', 'pending', 'suppressed')
+
+    def __init__(self):
+        self.emitted_at = None
+        self.strength = None  # Strength of the last emitted alert
+        self.mentions = 0  # Mention count of the last emitted alert
+        self.pending = None  # Latest suppressed alert
+        self.suppressed = 0  # Alerts folded into pending
+
+
+class AlertCoalescer:
+    """
+    Per-symbol coalescing of trend alerts.
+
+    The first alert of a symbol goes out at once; later ones within
+    `window` seconds are folded into one pending update that keeps the
+    latest tweet and is emitted when the window ends. A strength change
+    of at least `min_change` since the last emitted alert goes out early.
+    Emitted alerts carry `mentions_delta` (mentions since the previous
+    update) and `coalesced` (alerts folded into it).
+    """
+
+    def __init__(self, window=DEFAULT_ALERT_WINDOW, min_change=DEFAULT_MIN_CHANGE, key='symbol'):
+        self.window = window
+        self.min_change = min_change
+        self.key = key
+        self._states = {}  # Key -> AlertState
+        self.stats = {'emitted': 0, 'early': 0, 'suppressed': 0}
+
+    def _emit(self, state, alert, now):
+        emitted = {
+            **alert,
+            'mentions_delta': alert.get('mentions', 0) - state.mentions,
+            'coalesced': state.suppressed
+        }
+        state.emitted_at = now
+        state.strength = alert.get('trend_strength')
+        state.mentions = alert.get('mentions', 0)
+        state.pending = None
+        state.suppressed = 0
+        self.stats['emitted'] += 1
+        return emitted
+
+    def offer(self, alert, now=None):
+        """
+        Submit an alert
+
+        Returns:
+            dict: Alert to emit now, or None if it was folded into a pending update
+        """
+        now = now or time.time()
+        state = self._states.get(alert[self.key])
+        if state is None:
+            state = AlertState()
+            self._states[alert[self.key]] = state
+
+        if state.emitted_at is None or now - state.emitted_at >= self.window:
+            return self._emit(state, alert, now)
+
+        strength = alert.get('trend_strength')
+        if strength is not None and abs(strength - state.strength) >= self.min_change:
+            self.stats['early'] += 1
+            return self._emit(state, alert, now)
+
+        state.pending = alert
+        state.suppressed += 1
+        self.stats['suppressed'] += 1
+        return None
+
+    def flush_due(self, now=None):
+        """
+        Get pending updates whose window has ended
+
+        Symbols idle for a full window are forgotten, so their next alert
+        goes out immediately.
+        """
+        now = now or time.time()
+        due = []
+        idle = []
+        for key, state in self._states.items():
+            if now - state.emitted_at < self.window:
+                continue
+            if state.pending is not None:
+                due.append(self._emit(state, state.pending, now))
+            else:
+                idle.append(key)
+        for key in idle:
+            del self._states[key]
+        return due
+
+    def get_stats(self):
+        """Get emitted, early and suppressed alert counts"""
+        pending = sum(1 for state in self._states.values() if state.pending is not None)
+        return {**self.stats, 'pending': pending}
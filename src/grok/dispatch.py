@@ -0,0 +1,132 @@
+import time
+import asyncio
+import logging
+import itertools
+from collections import OrderedDict
+
+from .stats import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('drop_oldest', 'coalesce')
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_WORKERS = 4
+
+
+class CallbackDispatcher:
+    """
+    Bounded, non-blocking fan-out of results to a slow async callback.
+
+    submit() never waits on the consumer: items go into a bounded queue
+    drained by a pool of worker tasks. When the queue is full the oldest
+    item is dropped. With the 'coalesce' policy a pending item for the
+    same key is replaced in place, so a busy token only ever has its
+    latest result waiting and can't crowd out the others.
+    """
+
+    def __init__(
+        self,
+        callback,
+        maxsize=DEFAULT_QUEUE_SIZE,
+        workers=DEFAULT_WORKERS,
+        overflow='coalesce',
+        key=None
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}"
+            )
+        self.callback = callback
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow = overflow
+        self.key = key  # Item -> coalescing key
+        self._pending = OrderedDict()  # Key -> (item, enqueued_at)
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self._tasks = []
+        self.stats = {
+            'submitted': 0,
+            'delivered': 0,
+            'dropped': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+        self.queue_wait = LatencyWindow()
+        self.consumer_latency = LatencyWindow()
+
+    def start(self):
+        """Start the consumer tasks"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self, drain=False):
+        """Stop the consumer tasks, optionally delivering what is queued first"""
+        if drain:
+            while self._pending:
+                await asyncio.sleep(0.01)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, item):
+        """Queue an item without waiting for the consumer"""
+        self.put_nowait(item)
+
+    def put_nowait(self, item):
+        """Queue an item, applying the overflow policy when full"""
+        self.stats['submitted'] += 1
+        now = time.perf_counter()
+
+        if self.overflow == 'coalesce' and self.key is not None:
+            key = self.key(item)
+            if key in self._pending:
+                # Keep the queue position and original wait, replace the payload
+                self._pending[key] = (item, self._pending[key][1])
+                self.stats['coalesced'] += 1
+                return
+        else:
+            key = next(self._sequence)
+
+        if len(self._pending) >= self.maxsize:
+            self._pending.popitem(last=False)
+            self.stats['dropped'] += 1
+
+        self._pending[key] = (item, now)
+        self._ready.set()
+
+    async def _worker(self):
+        while True:
+            while not self._pending:
+                self._ready.clear()
+                await self._ready.wait()
+
+            _, (item, enqueued_at) = self._pending.popitem(last=False)
+            start = time.perf_counter()
+            self.queue_wait.record(start - enqueued_at)
+            try:
+                await self.callback(item)
+                self.stats['delivered'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Callback error: {str(e)}")
+            finally:
+                self.consumer_latency.record(time.perf_counter() - start)
+
+    def get_stats(self):
+        """Get queue depth, drop counters and latency percentiles"""
+        return {
+            'queue_depth': len(self._pending),
+            'maxsize': self.maxsize,
+            'workers': len(self._tasks),
+            'overflow': self.overflow,
+            **self.stats,
+            'queue_wait_ms': self.queue_wait.summary(),
+            'consumer_latency_ms': self.consumer_latency.summary()
+        }
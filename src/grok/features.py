@@ -0,0 +1,136 @@
+import time
+import math
+import logging
+
+import numpy as np
+
+from .indicators import RollingStats, DEFAULT_WINDOW
+from .tickstore import ColumnRing, DEFAULT_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+PRICE_CHANGE_PERIODS = (1, 3, 6, 12, 24)
+
+# Feature columns in storage order, social_ma24 last so it can be sliced off
+FEATURE_NAMES = tuple(
+    [f'price_change_{period}h' for period in PRICE_CHANGE_PERIODS] +
+    ['volume_ma24', 'volume_std24', 'price_ma24', 'price_std24', 'social_ma24']
+)
+SOCIAL_FEATURE = FEATURE_NAMES.index('social_ma24')
+
+DEFAULT_FEATURE_CAPACITY = 1024  # Feature rows kept per token
+
+
+class FeatureStore:
+    """
+    Incrementally built ML feature rows for one token.
+
+    Every tick after warm-up appends exactly one feature row, computed from
+    running-window state (a ring of lagged prices for the price changes and
+    rolling mean/std of price, volume and social mentions). Rows live in a
+    ColumnRing with a 2D row column, so storage grows with the rows like
+    TickBuffer and training and inference read contiguous 2D slices
+    without copying.
+    """
+
+    def __init__(
+        self,
+        capacity=DEFAULT_FEATURE_CAPACITY,
+        max_age=DEFAULT_MAX_AGE,
+        window=DEFAULT_WINDOW
+    ):
+        self.capacity = capacity
+        self.max_age = max_age
+        # Feature row, tick price and timestamp of every row. Rows are
+        # float32, the precision random forests train on anyway
+        self._ring = ColumnRing(
+            ('row', 'price', 'timestamp'),
+            capacity,
+            widths={'row': len(FEATURE_NAMES)},
+            dtypes={'row': np.float32}
+        )
+
+        # Running-window state
+        self._lag_size = max(PRICE_CHANGE_PERIODS) + 1
+        self._lagged = np.zeros(self._lag_size)
+        self._lag_pos = 0
+        self._seen = 0
+        self._price_stats = RollingStats(window)
+        self._volume_stats = RollingStats(window)
+        self._social_stats = RollingStats(window)
+
+    def __len__(self):
+        return len(self._ring)
+
+    @property
+    def total(self):
+        """Number of feature rows ever appended"""
+        return self._ring.total
+
+    def update(self, timestamp, price, volume=None, social_mentions=None):
+        """
+        Advance the running state by one tick and append its feature row
+
+        Missing volume or social mentions count as 0.
+
+        Returns:
+            bool: True once warm-up is over and a row was appended
+        """
+        volume = _value_or_zero(volume)
+        social_mentions = _value_or_zero(social_mentions)
+
+        self._lagged[self._lag_pos] = price
+        self._lag_pos = (self._lag_pos + 1) % self._lag_size
+        self._seen += 1
+        self._price_stats.push(price)
+        self._volume_stats.push(volume)
+        self._social_stats.push(social_mentions)
+
+        if self._seen < self._lag_size or not self._price_stats.full:
+            return False
+
+        row = np.empty(len(FEATURE_NAMES))
+        newest = (self._lag_pos - 1) % self._lag_size
+        for i, period in enumerate(PRICE_CHANGE_PERIODS):
+            previous = self._lagged[(newest - period) % self._lag_size]
+            row[i] = price / previous - 1 if previous else np.nan
+        row[len(PRICE_CHANGE_PERIODS):] = (
+            self._volume_stats.mean(),
+            self._volume_stats.std(),
+            self._price_stats.mean(),
+            self._price_stats.std(),
+            self._social_stats.mean()
+        )
+
+        self._append(timestamp, price, row)
+        return True
+
+    def _append(self, timestamp, price, row):
+        self._ring.append_row((row, price, timestamp))
+
+        if self.max_age:
+            cutoff = time.time() - self.max_age
+            drop = int(np.searchsorted(self._ring.column('timestamp'), cutoff, side='right'))
+            self._ring.drop_oldest(drop)
+
+    def features(self, include_social=True):
+        """Get a read-only view of all feature rows in time order"""
+        rows = self._ring.column('row')
+        return rows if include_social else rows[:, :SOCIAL_FEATURE]
+
+    def training_set(self, include_social=True):
+        """
+        Get labelled rows for training and the latest row for inference
+
+        Returns:
+            tuple: (X, y, latest) where y[i] is the price after row X[i]
+        """
+        rows = self.features(include_social)
+        prices = self._ring.column('price')
+        return rows[:-1], prices[1:], rows[-1:]
+
+
+def _value_or_zero(value):
+    if value is None or math.isnan(value):
+        return 0.0
+    return value
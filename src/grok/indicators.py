@@ -0,0 +1,171 @@
+import math
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 24  # Rows in the rolling window (volume for spike detection, feature stats)
+DEFAULT_ROC_PERIODS = 12  # Lag of the rate of change used for momentum
+DEFAULT_MOMENTUM_WINDOW = 168  # Rate of change values averaged for momentum
+RESYNC_INTERVAL = 4096  # Updates between exact recomputes of running sums
+
+
+class StreamingIndicators:
+    """
+    Incrementally maintained tick indicators for one token.
+
+    Each update is O(1): a running volume sum over the window, for volume
+    spike detection, and a ring of lagged prices feeding a windowed mean
+    of the rate of change. Volatility and trend read hourly bars instead.
+    Reads are constant-time. Running sums are recomputed exactly from the
+    window every RESYNC_INTERVAL updates to bound float drift.
+    """
+
+    def __init__(
+        self,
+        window=DEFAULT_WINDOW,
+        roc_periods=DEFAULT_ROC_PERIODS,
+        momentum_window=DEFAULT_MOMENTUM_WINDOW
+    ):
+        self.window = window
+        self.roc_periods = roc_periods
+        self.momentum_window = momentum_window
+
+        # Rolling window of volumes
+        self._volumes = np.zeros(window)
+        self._pos = 0
+        self._n = 0
+        self._volume_sum = 0.0
+
+        # Lagged prices for the rate of change
+        self._lagged = np.zeros(roc_periods)
+        self._lag_pos = 0
+        self._lag_n = 0
+
+        # Windowed mean of the rate of change
+        self._roc = np.zeros(momentum_window)
+        self._roc_pos = 0
+        self._roc_n = 0
+        self._roc_sum = 0.0
+
+        self._updates = 0
+
+    @property
+    def count(self):
+        """Number of values currently in the rolling window"""
+        return self._n
+
+    def update(self, price, volume=0.0):
+        """
+        Add one tick
+
+        Args:
+            price: Tick price
+            volume: Tick volume (None or NaN counts as 0)
+        """
+        if volume is None or math.isnan(volume):
+            volume = 0.0
+
+        # The oldest volume sits at the write position once the window is full
+        if self._n == self.window:
+            self._volume_sum -= self._volumes[self._pos]
+        else:
+            self._n += 1
+        self._volume_sum += volume
+        self._volumes[self._pos] = volume
+        self._pos = (self._pos + 1) % self.window
+
+        self._update_momentum(price)
+
+        self._updates += 1
+        if self._updates % RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _update_momentum(self, price):
+        if self._lag_n == self.roc_periods:
+            previous = self._lagged[self._lag_pos]
+            if previous:
+                roc = price / previous - 1
+                if self._roc_n == self.momentum_window:
+                    self._roc_sum -= self._roc[self._roc_pos]
+                else:
+                    self._roc_n += 1
+                self._roc[self._roc_pos] = roc
+                self._roc_sum += roc
+                self._roc_pos = (self._roc_pos + 1) % self.momentum_window
+        else:
+            self._lag_n += 1
+
+        self._lagged[self._lag_pos] = price
+        self._lag_pos = (self._lag_pos + 1) % self.roc_periods
+
+    def _resync(self):
+        """Recompute running sums exactly from the stored windows"""
+        self._volume_sum = float(self._volumes[:self._n].sum())
+        self._roc_sum = float(self._roc[:self._roc_n].sum())
+
+    def volume_sum(self):
+        """Sum of volumes in the window"""
+        return float(self._volume_sum)
+
+    def momentum(self):
+        """Mean rate of change in percent over the momentum window"""
+        if not self._roc_n:
+            return float('nan')
+        return float(self._roc_sum / self._roc_n * 100)
+
+
+class RollingStats:
+    """
+    Sliding-window count, sum, mean and sample variance in O(1) per value.
+
+    Uses the add/remove form of Welford's algorithm over a ring of the last
+    `window` values.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._values = np.zeros(window)
+        self._pos = 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self):
+        return self._n
+
+    @property
+    def full(self):
+        return self._n == self.window
+
+    def push(self, value):
+        """Add a value, dropping the oldest one once the window is full"""
+        if self._n == self.window:
+            oldest = self._values[self._pos]
+            self._n -= 1
+            if self._n:
+                delta = oldest - self._mean
+                self._mean -= delta / self._n
+                self._m2 -= delta * (oldest - self._mean)
+            else:
+                self._mean = 0.0
+                self._m2 = 0.0
+
+        self._n += 1
+        delta = value - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (value - self._mean)
+
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self.window
+
+    def mean(self):
+        return self._mean if self._n else float('nan')
+
+    def std(self):
+        """Sample standard deviation (ddof=1)"""
+        if self._n < 2:
+            return float('nan')
+        return math.sqrt(max(self._m2, 0.0) / (self._n - 1))
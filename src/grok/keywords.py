@@ -0,0 +1,174 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 10.0  # Seconds between polls of the most productive query
+DEFAULT_MAX_INTERVAL = 300.0  # Seconds between polls of a cold query
+DEFAULT_QUOTA = 180  # Search requests per quota window, v1.1 user auth limit
+DEFAULT_QUOTA_WINDOW = 900.0  # Seconds per rate limit window
+QUOTA_RESERVE = 0.1  # Share of the remaining quota never planned for
+YIELD_SMOOTHING = 0.3  # Weight of the newest request in a query's yield average
+DISCOVERY_WEIGHT = 10.0  # A first-seen token counts as this many relevant tweets
+MIN_SCORE = 0.1  # Yield floor so cold queries are still probed now and then
+
+
+class QueryStats:
+    """Polling state and yield of one keyword query"""
+
+    __slots__ = (
+        'query', 'requests', 'new_tweets', 'relevant', 'discoveries',
+        'score', 'interval', 'last_polled', 'next_due'
+    )
+
+    def __init__(self, query, now):
+        self.query = query
+        self.requests = 0
+        self.new_tweets = 0  # Tweets not seen before
+        self.relevant = 0  # New tweets mentioning at least one token
+        self.discoveries = 0  # Tokens first seen in one of its tweets
+        self.score = 1.0  # Smoothed yield per request, optimistic until measured
+        self.interval = DEFAULT_MIN_INTERVAL
+        self.last_polled = None
+        self.next_due = now  # New queries run on the next pass
+
+
+class KeywordScheduler:
+    """
+    Quota-aware polling scheduler for search keyword queries.
+
+    The request budget comes from the rate limit headers: the remaining
+    requests (minus a reserve) spread over the time left until the window
+    resets. The budget is split between queries in proportion to their
+    smoothed yield of relevant tweets and token discoveries per request,
+    so productive queries are polled up to every `min_interval` seconds
+    and cold ones back off towards `max_interval`. Queries can be added
+    and removed at runtime.
+    """
+
+    def __init__(
+        self,
+        keywords,
+        min_interval=DEFAULT_MIN_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL,
+        quota=DEFAULT_QUOTA,
+        quota_window=DEFAULT_QUOTA_WINDOW
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.quota = quota
+        self.quota_window = quota_window
+        self.remaining = None  # Requests left in the current window, from headers
+        self.reset_at = None  # Epoch the window resets, from headers
+        self.queries = {}  # Query -> QueryStats
+        self.set_keywords(keywords)
+
+    @property
+    def keywords(self):
+        return list(self.queries)
+
+    def set_keywords(self, keywords):
+        """Replace the query set, keeping the stats of queries that stay"""
+        now = time.time()
+        keywords = list(dict.fromkeys(keywords))
+        self.queries = {
+            query: self.queries.get(query) or QueryStats(query, now)
+            for query in keywords
+        }
+        self._rebalance(now)
+        logger.info(f"Scheduling {len(keywords)} search keyword queries")
+
+    def add_keyword(self, query):
+        self.set_keywords([*self.queries, query])
+
+    def remove_keyword(self, query):
+        self.set_keywords([keyword for keyword in self.queries if keyword != query])
+
+    def update_quota(self, remaining, reset_at):
+        """Record the rate limit state from response headers"""
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+    def _request_rate(self, now):
+        """Requests per second the remaining quota allows"""
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            budget, seconds = self.quota, self.quota_window
+        else:
+            budget, seconds = self.remaining, self.reset_at - now
+        return budget * (1 - QUOTA_RESERVE) / max(seconds, 1.0)
+
+    def _rebalance(self, now):
+        if not self.queries:
+            return
+        rate = self._request_rate(now)
+        scores = {query: max(stats.score, MIN_SCORE) for query, stats in self.queries.items()}
+        total = sum(scores.values())
+        for query, stats in self.queries.items():
+            share = rate * scores[query] / total
+            interval = 1 / share if share > 0 else self.max_interval
+            stats.interval = min(max(interval, self.min_interval), self.max_interval)
+            if stats.last_polled is not None:
+                stats.next_due = stats.last_polled + stats.interval
+
+    def due(self, now=None):
+        """
+        Get the queries to poll now
+
+        Nothing is due while the quota is exhausted, until the window resets.
+        """
+        now = now or time.time()
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at and now < self.reset_at:
+            return []
+        return [query for query, stats in self.queries.items() if stats.next_due <= now]
+
+    def record(self, query, new_tweets, relevant, discoveries, now=None):
+        """
+        Record the outcome of one request and reschedule
+
+        Args:
+            new_tweets: Tweets not seen before
+            relevant: New tweets that mentioned at least one token
+            discoveries: Tokens first seen in those tweets
+        """
+        stats = self.queries.get(query)
+        if stats is None:
+            return  # Removed while the request ran
+        now = now or time.time()
+        stats.requests += 1
+        stats.new_tweets += new_tweets
+        stats.relevant += relevant
+        stats.discoveries += discoveries
+        value = relevant + DISCOVERY_WEIGHT * discoveries
+        stats.score += YIELD_SMOOTHING * (value - stats.score)
+        stats.last_polled = now
+        self._rebalance(now)
+
+    def next_due_in(self, now=None, cap=None):
+        """Seconds until the next query is due, at most `cap`"""
+        now = now or time.time()
+        wait = cap if cap is not None else self.max_interval
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at and now < self.reset_at:
+            return min(wait, self.reset_at - now)
+        for stats in self.queries.values():
+            wait = min(wait, max(stats.next_due - now, 0.0))
+        return wait
+
+    def get_stats(self):
+        """Get quota state and per-query yield"""
+        return {
+            'quota_remaining': self.remaining,
+            'quota_reset_at': self.reset_at,
+            'queries': {
+                query: {
+                    'requests': stats.requests,
+                    'new_tweets': stats.new_tweets,
+                    'relevant': stats.relevant,
+                    'discoveries': stats.discoveries,
+                    'discoveries_per_request': (
+                        stats.discoveries / stats.requests if stats.requests else 0.0
+                    ),
+                    'interval': stats.interval
+                }
+                for query, stats in self.queries.items()
+            }
+        }
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+
+from .stats import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAUNCH_RECORDS = int(os.getenv('TRACKER_LAUNCH_RECORDS', 10000))  # Full launch records kept in memory
+DEFAULT_LAUNCH_TTL = float(os.getenv('TRACKER_LAUNCH_TTL', 86400))  # Seconds a record is kept after its last use
+DEFAULT_SPILL_PATH = os.getenv('TRACKER_SPILL_PATH') or None  # JSON lines file for evicted records
+DEFAULT_SEEN_LAUNCHES = int(os.getenv('TRACKER_SEEN_LAUNCHES', 250000))  # Addresses remembered for dedup
+DEFAULT_SEEN_TTL = float(os.getenv('TRACKER_SEEN_TTL', 7 * 86400))  # Seconds an address is remembered
+SPILL_BATCH = 1000  # Evicted records buffered before they're written
+SPILL_INTERVAL = 60  # Seconds a buffered record waits for a write at most
+
+
+class LaunchStore:
+    """
+    Recent launch records, bounded by count and age.
+
+    Records are kept in least recently used order and evicted once there
+    are more than `maxsize` or they haven't been stored or read for `ttl`
+    seconds. Evicted records are appended to `spill_path` as JSON lines
+    when it is set, buffered and written in batches off the event loop,
+    and passed to `on_evict` so indexes built on the records can drop
+    them too. Mapping reads (len, in, items, get) behave like the dict it
+    replaces.
+    """
+
+    def __init__(
+        self,
+        maxsize=DEFAULT_LAUNCH_RECORDS,
+        ttl=DEFAULT_LAUNCH_TTL,
+        spill_path=DEFAULT_SPILL_PATH,
+        on_evict=None
+    ):
+        if maxsize <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.spill_path = spill_path
+        if spill_path:
+            os.makedirs(os.path.dirname(spill_path) or '.', exist_ok=True)
+        self.on_evict = on_evict
+        self._records = OrderedDict()  # Address -> [last used, record], least recently used first
+        self.evicted = 0
+        self.spilled = 0
+        self._spill = []  # JSON lines of evicted records not written yet
+        self._spill_since = None  # Epoch the oldest buffered record was evicted
+        self._spill_write = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, address):
+        return address in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __getitem__(self, address):
+        record = self.get(address)
+        if record is None:
+            raise KeyError(address)
+        return record
+
+    def get(self, address, default=None, now=None):
+        """Get a record, marking it recently used"""
+        entry = self._records.get(address)
+        if entry is None:
+            return default
+        entry[0] = now or time.time()
+        self._records.move_to_end(address)
+        return entry[1]
+
+    def items(self):
+        return ((address, entry[1]) for address, entry in self._records.items())
+
+    def values(self):
+        return (entry[1] for entry in self._records.values())
+
+    def add(self, address, record, now=None):
+        """Store or replace a record"""
+        now = now or time.time()
+        self._records[address] = [now, record]
+        self._records.move_to_end(address)
+        evicted = []
+        while len(self._records) > self.maxsize:
+            evicted.append(self._records.popitem(last=False))
+        evicted += self._expired(now)
+        self._evict(evicted, now)
+
+    def expire(self, now=None):
+        """Evict records unused for ttl seconds"""
+        now = now or time.time()
+        self._evict(self._expired(now), now)
+
+    def _expired(self, now):
+        cutoff = now - self.ttl
+        expired = []
+        while self._records:
+            address, entry = next(iter(self._records.items()))
+            if entry[0] > cutoff:
+                break
+            expired.append(self._records.popitem(last=False))
+        return expired
+
+    def _evict(self, evicted, now):
+        if evicted:
+            self.evicted += len(evicted)
+            if self.on_evict is not None:
+                for address, (_, record) in evicted:
+                    self.on_evict(address, record)
+            if self.spill_path:
+                if not self._spill:
+                    self._spill_since = now
+                self._spill.extend(json.dumps(record, default=str) + '\n' for _, (_, record) in evicted)
+        self._flush_spill(now)
+
+    def _flush_spill(self, now):
+        """Write a full or old enough spill buffer in the background, one write at a time"""
+        if not self._spill:
+            return
+        if len(self._spill) < SPILL_BATCH and now - self._spill_since < SPILL_INTERVAL:
+            return
+        if self._spill_write is not None and not self._spill_write.done():
+            return  # The next eviction writes what has piled up
+        lines, self._spill = self._spill, []
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._on_spilled(lines, self._write_spill(lines))
+            return
+        self._spill_write = loop.run_in_executor(None, self._write_spill, lines)
+        self._spill_write.add_done_callback(lambda future: self._on_spilled(
+            lines, OSError('write cancelled') if future.cancelled() else future.result()
+        ))
+
+    async def flush(self):
+        """Write every buffered record, waiting for a write in progress"""
+        if self._spill_write is not None:
+            await asyncio.gather(self._spill_write, return_exceptions=True)
+        if self._spill:
+            lines, self._spill = self._spill, []
+            error = await asyncio.get_running_loop().run_in_executor(None, self._write_spill, lines)
+            self._on_spilled(lines, error)
+
+    def _write_spill(self, lines):
+        """Append JSON lines to the spill file, returning the error if it fails"""
+        try:
+            with open(self.spill_path, 'a') as f:
+                f.writelines(lines)
+        except OSError as e:
+            return e
+        return None
+
+    def _on_spilled(self, lines, error):
+        if error is None:
+            self.spilled += len(lines)
+        else:
+            logger.error(f"Error spilling {len(lines)} launch records to {self.spill_path}: {str(error)}")
+
+
+class DetectionStats:
+    """
+    Which source detects launches first, and how far behind the others are.
+
+    A source's lag on a launch is the time from the first source's
+    sighting to its own, so it includes up to one poll interval of each.
+    """
+
+    def __init__(self):
+        self._first = {}  # Source -> launches it saw first
+        self._seen = {}  # Source -> launches it saw
+        self._lag = {}  # Source -> LatencyWindow of lag behind the first source
+
+    def record_first(self, source):
+        self._first[source] = self._first.get(source, 0) + 1
+        self._seen[source] = self._seen.get(source, 0) + 1
+
+    def record_lag(self, source, seconds):
+        self._seen[source] = self._seen.get(source, 0) + 1
+        if source not in self._lag:
+            self._lag[source] = LatencyWindow()
+        self._lag[source].record(seconds)
+
+    def get_stats(self):
+        """Get per-source first detections, share of first detections and lag"""
+        return {
+            source: {
+                'seen': seen,
+                'first': self._first.get(source, 0),
+                'first_share': self._first.get(source, 0) / seen,
+                'lag_ms': self._lag[source].summary() if source in self._lag else LatencyWindow().summary()
+            }
+            for source, seen in self._seen.items()
+        }
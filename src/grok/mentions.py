@@ -0,0 +1,222 @@
+import os
+import sys
+import math
+import time
+import logging
+import itertools
+from datetime import datetime
+from collections import deque, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKET_SECONDS = 60  # One minute buckets
+DEFAULT_BUCKETS = 1440  # 24 hours of one minute buckets
+DEFAULT_PROFILE_TTL = float(os.getenv('TWITTER_PROFILE_TTL', 3600))  # Seconds a cached follower count stays fresh
+
+
+class MentionWindow:
+    """
+    Rolling mention aggregates of one symbol in fixed time buckets.
+
+    Each bucket holds the mention count, follower sum, engagement sum and
+    copy count of one `bucket_seconds` slot, and running totals over the
+    window are updated as mentions arrive and buckets expire. Copies
+    count every tweet a mention stands for, near-duplicates collapsed
+    into it included, so they carry the cluster weight. Reads are O(1)
+    and only buckets that received mentions are stored, so a symbol
+    mentioned once costs one bucket rather than a full 24 hour ring.
+    """
+
+    def __init__(self, bucket_seconds=DEFAULT_BUCKET_SECONDS, buckets=DEFAULT_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self._buckets = deque()  # [slot, mentions, followers, engagement, copies] in time order
+        self.mentions = 0
+        self.followers = 0
+        self.engagement = 0
+        self.copies = 0
+
+    def __len__(self):
+        return self.mentions
+
+    def _slot(self, timestamp):
+        return math.floor(timestamp / self.bucket_seconds)
+
+    def add(self, timestamp, followers, engagement):
+        """
+        Count one mention
+
+        Args:
+            timestamp: Epoch seconds of the mention
+            followers: Follower count of the author
+            engagement: Retweets plus likes
+        """
+        bucket = self._bucket(timestamp)
+        bucket[1] += 1
+        bucket[2] += followers
+        bucket[3] += engagement
+        bucket[4] += 1
+        self.mentions += 1
+        self.followers += followers
+        self.engagement += engagement
+        self.copies += 1
+        self.expire(timestamp)
+
+    def add_copy(self, timestamp):
+        """Count a near-duplicate of a mention, which only adds to copies"""
+        self._bucket(timestamp)[4] += 1
+        self.copies += 1
+        self.expire(timestamp)
+
+    def _bucket(self, timestamp):
+        slot = self._slot(timestamp)
+        newest = self._buckets[-1] if self._buckets else None
+        if newest is not None and slot < newest[0]:
+            # Late mention, counted in the newest bucket so order holds
+            slot = newest[0]
+        if newest is None or slot > newest[0]:
+            newest = [slot, 0, 0, 0, 0]
+            self._buckets.append(newest)
+        return newest
+
+    def expire(self, now=None):
+        """Drop buckets that left the window"""
+        cutoff = self._slot(now or time.time()) - self.buckets
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            _, mentions, followers, engagement, copies = self._buckets.popleft()
+            self.mentions -= mentions
+            self.followers -= followers
+            self.engagement -= engagement
+            self.copies -= copies
+
+    def totals(self, now=None):
+        """
+        Get the aggregates over the window
+
+        Returns:
+            tuple: (mentions, follower sum, engagement sum, copies)
+        """
+        self.expire(now)
+        return self.mentions, self.followers, self.engagement, self.copies
+
+
+class UserProfile:
+    """Cached author of one or more mentions"""
+
+    __slots__ = ('user_id', 'screen_name', 'followers', 'updated_at')
+
+    def __init__(self, user_id, screen_name, followers, updated_at):
+        self.user_id = user_id
+        self.screen_name = screen_name
+        self.followers = followers
+        self.updated_at = updated_at
+
+
+class UserTable:
+    """
+    Interned author profiles shared by every mention.
+
+    Mentions hold a reference to their author's profile instead of a copy
+    of the screen name and follower count. A profile is refreshed from the
+    tweet at most once per `ttl` seconds and dropped from the table once
+    stale; mentions still referencing it keep it alive. Profiles are kept
+    in refresh order, so expiry only visits the stale ones.
+    """
+
+    def __init__(self, ttl=DEFAULT_PROFILE_TTL):
+        self.ttl = ttl
+        self._profiles = OrderedDict()  # User ID -> UserProfile, least recently refreshed first
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def observe(self, user_id, screen_name, followers, now=None):
+        """Get the profile of a tweet author, refreshing it if stale"""
+        now = now or time.time()
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            profile = UserProfile(user_id, sys.intern(screen_name), followers, now)
+            self._profiles[user_id] = profile
+        elif profile.updated_at <= now - self.ttl:
+            if profile.screen_name != screen_name:
+                profile.screen_name = sys.intern(screen_name)
+            profile.followers = followers
+            profile.updated_at = now
+            self._profiles.move_to_end(user_id)
+        return profile
+
+    def expire(self, now=None):
+        """Drop profiles not refreshed within ttl"""
+        cutoff = (now or time.time()) - self.ttl
+        expired = 0
+        while self._profiles:
+            profile = next(iter(self._profiles.values()))
+            if profile.updated_at > cutoff:
+                break
+            del self._profiles[profile.user_id]
+            expired += 1
+        return expired
+
+
+class Mention:
+    """One symbol mention, about a quarter of the size of the equivalent dict"""
+
+    __slots__ = ('timestamp', 'tweet_id', 'user', 'retweets', 'likes', 'cluster')
+
+    def __init__(self, timestamp, tweet_id, user, retweets, likes, cluster=None):
+        self.timestamp = timestamp  # Epoch seconds
+        self.tweet_id = tweet_id
+        self.user = user  # Shared UserProfile
+        self.retweets = retweets
+        self.likes = likes
+        self.cluster = cluster  # TextCluster of near-identical tweets it stands for
+
+    @property
+    def weight(self):
+        """Tweets this mention stands for"""
+        return self.cluster.weight if self.cluster is not None else 1
+
+    def to_dict(self):
+        """Get the mention in the dict shape of get_trend_data"""
+        return {
+            'timestamp': datetime.fromtimestamp(self.timestamp),
+            'tweet_id': self.tweet_id,
+            'user': self.user.screen_name,
+            'followers': self.user.followers,
+            'retweets': self.retweets,
+            'likes': self.likes,
+            'weight': self.weight
+        }
+
+
+class MentionHistory:
+    """
+    Bounded raw mentions of one symbol.
+
+    Records are stored compactly and only turned into dicts when read,
+    so indexing and iteration see the same shape as a list of mention
+    dicts.
+    """
+
+    def __init__(self, maxlen=None):
+        self._mentions = deque(maxlen=maxlen)
+
+    def __len__(self):
+        return len(self._mentions)
+
+    def __iter__(self):
+        return (mention.to_dict() for mention in self._mentions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._mentions))
+            if step < 0:
+                return [self[i] for i in range(start, stop, step)]
+            return [
+                mention.to_dict()
+                for mention in itertools.islice(self._mentions, start, stop, step)
+            ]
+        return self._mentions[index].to_dict()
+
+    def append(self, mention):
+        self._mentions.append(mention)
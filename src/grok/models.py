@@ -0,0 +1,421 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = os.getenv('ANALYZER_MODEL_DIR', 'data/models')
+DEFAULT_MAX_MODELS = int(os.getenv('ANALYZER_MAX_MODELS', 100))  # Fitted models kept in memory, ~9 MB each
+DEFAULT_RETRAIN_EVERY = 24  # New rows before a scheduled retrain
+DEFAULT_DRIFT_THRESHOLD = 0.05  # Relative prediction error that forces a retrain
+DRIFT_SMOOTHING = 0.2  # Weight of the newest error in the drift average
+DEFAULT_FORGETTING = 0.995  # RLS weight kept by past rows per update
+DEFAULT_RLS_DELTA = 100.0  # Initial RLS inverse covariance scale
+
+
+def fit_random_forest(X, y, n_estimators=100):
+    """Fit a random forest, runs inside a worker process"""
+    model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=1)
+    model.fit(X, y)
+    return model
+
+
+class PricePredictor:
+    """
+    Interface of the price prediction engines used by DataAnalyzer.
+
+    Engines receive every token's labelled feature rows on each pass and
+    must answer predict() on the event loop without blocking it.
+    """
+
+    name = None
+
+    async def load(self):
+        """Restore persisted state, returns the number of tokens restored"""
+        return 0
+
+    def update(self, token_address, X, y, total_rows):
+        """
+        Feed labelled feature rows for a token
+
+        Args:
+            X: 2D array of feature rows in time order
+            y: Next price for every row of X
+            total_rows: Ticks ever seen for the token, identifies new rows
+        """
+        raise NotImplementedError
+
+    def predict(self, token_address, features):
+        """Predict the next price from one feature row, None if not ready"""
+        raise NotImplementedError
+
+    def forget(self, token_address):
+        """Drop all state of a token that is no longer tracked"""
+
+    def get_stats(self):
+        """Get engine statistics"""
+        return {}
+
+    def close(self):
+        """Release engine resources"""
+
+
+class ModelEntry:
+    """Fitted model of one token plus its retraining state"""
+
+    __slots__ = ('model', 'trained_rows', 'trained_at', 'drift', 'last_prediction')
+
+    def __init__(self, model, trained_rows, trained_at=None):
+        self.model = model
+        self.trained_rows = trained_rows  # Total rows seen when it was fitted
+        self.trained_at = trained_at or time.time()
+        self.drift = 0.0  # Smoothed relative prediction error
+        self.last_prediction = None
+
+
+class ModelRegistry(PricePredictor):
+    """
+    Per-token random forest registry with off-loop training.
+
+    Models are fitted in a ProcessPoolExecutor so the event loop only ever
+    runs inference on cached models. A token is retrained once it has seen
+    `retrain_every` new rows or its smoothed prediction error exceeds
+    `drift_threshold`. Fitted models are written to `model_dir`, and read
+    back in the background the first time a token is used after a
+    restart or after being evicted, so restarts come up warm. At most
+    `max_models` stay in memory, least recently used first out, and
+    forget() deletes the model of a token that stopped trading.
+    """
+
+    name = 'random_forest'
+
+    def __init__(
+        self,
+        model_dir=DEFAULT_MODEL_DIR,
+        retrain_every=DEFAULT_RETRAIN_EVERY,
+        drift_threshold=DEFAULT_DRIFT_THRESHOLD,
+        max_workers=2,
+        max_pending=8,
+        n_estimators=100,
+        max_models=DEFAULT_MAX_MODELS
+    ):
+        self.model_dir = model_dir
+        self.retrain_every = retrain_every
+        self.drift_threshold = drift_threshold
+        self.max_workers = max_workers
+        self.max_pending = max_pending  # Trainings queued or running at once
+        self.n_estimators = n_estimators
+        self.max_models = max_models
+        self.models = OrderedDict()  # Token address -> ModelEntry, least recently used first
+        self._on_disk = set()  # Tokens with a persisted model
+        self._loading = {}  # Token address -> asyncio.Future of a model read
+        self._training = {}  # Token address -> asyncio.Future
+        self._executor = None
+        self.evicted = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _model_path(self, token_address):
+        return os.path.join(self.model_dir, f"{os.path.basename(token_address)}.joblib")
+
+    async def load(self):
+        """
+        Index the persisted models in model_dir
+
+        Models themselves are read lazily, on a token's first use.
+        """
+        if not self.model_dir or not os.path.isdir(self.model_dir):
+            return 0
+
+        self._on_disk.update(
+            filename[:-len('.joblib')]
+            for filename in os.listdir(self.model_dir)
+            if filename.endswith('.joblib')
+        )
+        logger.info(f"Found {len(self._on_disk)} persisted models")
+        return len(self._on_disk)
+
+    def _load_model(self, token_address):
+        """
+        Start reading a token's persisted model if it has one
+
+        Returns:
+            bool: True while a read is running
+        """
+        if token_address in self._loading:
+            return True
+        if token_address not in self._on_disk:
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, joblib.load, self._model_path(token_address))
+        self._loading[token_address] = future
+        future.add_done_callback(lambda done: self._on_loaded(token_address, done))
+        return True
+
+    def _on_loaded(self, token_address, future):
+        if self._loading.get(token_address) is not future:
+            return  # Forgotten meanwhile
+        del self._loading[token_address]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Error loading model of {token_address}: {str(error)}")
+            self._on_disk.discard(token_address)  # Train a new one instead
+            return
+        saved = future.result()
+        # Row counts restart at 0 with the process, count new rows from there
+        self._store(token_address, ModelEntry(saved['model'], 0, saved['trained_at']))
+
+    def _store(self, token_address, entry):
+        """Cache a model, evicting the least recently used ones over max_models"""
+        self.models[token_address] = entry
+        self.models.move_to_end(token_address)
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)  # Read back from disk if it comes up again
+            self.evicted += 1
+
+    def record_outcome(self, token_address, actual_price):
+        """Update drift with the error of the last prediction for a token"""
+        entry = self.models.get(token_address)
+        if entry is None or entry.last_prediction is None or not actual_price:
+            return
+
+        error = abs(entry.last_prediction - actual_price) / abs(actual_price)
+        entry.drift += DRIFT_SMOOTHING * (error - entry.drift)
+
+    def update(self, token_address, X, y, total_rows):
+        """Track drift and retrain in the process pool when policy says so"""
+        if not len(y):
+            return
+        # The newest label is the latest price, the outcome of our last prediction
+        self.record_outcome(token_address, y[-1])
+        self.schedule_training(token_address, X, y, total_rows)
+
+    def needs_training(self, token_address, total_rows):
+        """Check the retraining policy for a token"""
+        if token_address in self._training:
+            return False
+        entry = self.models.get(token_address)
+        if entry is None:
+            return not self._load_model(token_address)
+        if total_rows - entry.trained_rows >= self.retrain_every:
+            return True
+        return entry.drift > self.drift_threshold
+
+    def schedule_training(self, token_address, X, y, total_rows):
+        """
+        Fit a new model for a token in the process pool if policy allows
+
+        Returns:
+            bool: True if a training job was submitted
+        """
+        if not self.needs_training(token_address, total_rows):
+            return False
+        if len(self._training) >= self.max_pending:
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(),
+            fit_random_forest,
+            np.ascontiguousarray(X),
+            np.ascontiguousarray(y),
+            self.n_estimators
+        )
+        self._training[token_address] = future
+        future.add_done_callback(
+            lambda done: self._on_trained(token_address, total_rows, done)
+        )
+        return True
+
+    def _on_trained(self, token_address, total_rows, future):
+        if self._training.get(token_address) is not future:
+            return  # Forgotten meanwhile
+        del self._training[token_address]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Model training error for {token_address}: {str(error)}")
+            return
+
+        entry = ModelEntry(future.result(), total_rows)
+        self._store(token_address, entry)
+        self._persist(token_address, entry)
+
+    def _persist(self, token_address, entry):
+        if not self.model_dir:
+            return
+        self._on_disk.add(token_address)
+        saved = {
+            'model': entry.model,
+            'trained_rows': entry.trained_rows,
+            'trained_at': entry.trained_at
+        }
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(
+            None, self._write_model, self._model_path(token_address), saved
+        )
+        task.add_done_callback(self._log_persist_error)
+
+    def _write_model(self, path, saved):
+        os.makedirs(self.model_dir, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated model
+        tmp_path = f"{path}.tmp"
+        joblib.dump(saved, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_model(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _log_persist_error(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error persisting model: {str(future.exception())}")
+
+    def predict(self, token_address, features):
+        """
+        Predict with the cached model of a token
+
+        Args:
+            features: 2D array holding one feature row
+
+        Returns:
+            float: Prediction, or None if the token has no fitted model yet
+        """
+        entry = self.models.get(token_address)
+        if entry is None:
+            self._load_model(token_address)
+            return None
+        self.models.move_to_end(token_address)
+        if getattr(entry.model, 'n_features_in_', features.shape[1]) != features.shape[1]:
+            return None  # Feature set changed since the model was fitted
+
+        prediction = float(entry.model.predict(features)[0])
+        entry.last_prediction = prediction
+        return prediction
+
+    def forget(self, token_address):
+        """Drop a token's model from memory and delete its persisted copy"""
+        self.models.pop(token_address, None)
+        self._loading.pop(token_address, None)
+        training = self._training.pop(token_address, None)
+        if training is not None:
+            training.cancel()
+        if token_address in self._on_disk:
+            self._on_disk.discard(token_address)
+            task = asyncio.get_running_loop().run_in_executor(
+                None, self._remove_model, self._model_path(token_address)
+            )
+            task.add_done_callback(self._log_persist_error)
+
+    def get_stats(self):
+        """Get registry statistics"""
+        return {
+            'engine': self.name,
+            'models': len(self.models),
+            'persisted': len(self._on_disk),
+            'evicted': self.evicted,
+            'loading': len(self._loading),
+            'training': len(self._training),
+            'drifting': sum(
+                1 for entry in self.models.values()
+                if entry.drift > self.drift_threshold
+            )
+        }
+
+    def close(self):
+        """Shut down the training process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class OnlineState:
+    """Recursive least squares state of one token"""
+
+    __slots__ = ('weights', 'inverse', 'seen_rows')
+
+    def __init__(self, n_features, delta):
+        # One extra weight for the bias term
+        size = n_features + 1
+        self.weights = np.zeros(size)
+        self.inverse = np.eye(size) * delta  # Inverse input covariance
+        self.seen_rows = 0  # Labelled rows already applied
+
+
+class OnlinePredictor(PricePredictor):
+    """
+    Per-token recursive least squares price predictor.
+
+    Each new labelled row updates the token's weights in O(features^2) and
+    a prediction is a single dot product, so the engine runs on the event
+    loop. A forgetting factor below 1 lets the fit follow regime changes.
+    State is rebuilt from tick history on restart, so nothing is persisted.
+    """
+
+    name = 'online'
+
+    def __init__(self, forgetting=DEFAULT_FORGETTING, delta=DEFAULT_RLS_DELTA):
+        self.forgetting = forgetting
+        self.delta = delta
+        self.states = {}  # Token address -> OnlineState
+
+    def update(self, token_address, X, y, total_rows):
+        """Apply one RLS step per row not seen before"""
+        state = self.states.get(token_address)
+        if state is None or len(state.weights) != X.shape[1] + 1:
+            state = OnlineState(X.shape[1], self.delta)
+            self.states[token_address] = state
+            new_rows = len(X)
+        else:
+            new_rows = min(total_rows - state.seen_rows, len(X))
+
+        weights = state.weights
+        inverse = state.inverse
+        lam = self.forgetting
+        for row in range(len(X) - new_rows, len(X)):
+            x = np.append(X[row], 1.0)
+            px = inverse @ x
+            gain = px / (lam + x @ px)
+            weights += gain * (y[row] - x @ weights)
+            inverse -= np.outer(gain, px)
+            inverse /= lam
+
+        if not np.all(np.isfinite(weights)):
+            logger.warning(f"Resetting diverged online model for {token_address}")
+            state = OnlineState(X.shape[1], self.delta)
+            self.states[token_address] = state
+        state.seen_rows = total_rows
+
+    def predict(self, token_address, features):
+        """Predict the next price with the token's current weights"""
+        state = self.states.get(token_address)
+        if state is None or len(state.weights) != features.shape[1] + 1:
+            return None
+        weights = state.weights
+        return float(features[-1] @ weights[:-1] + weights[-1])
+
+    def forget(self, token_address):
+        """Drop a token's RLS state"""
+        self.states.pop(token_address, None)
+
+    def get_stats(self):
+        """Get engine statistics"""
+        return {'engine': self.name, 'models': len(self.states)}
@@ -0,0 +1,194 @@
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEDUP_THRESHOLD = float(os.getenv('TWITTER_DEDUP_THRESHOLD', 0.8))  # Estimated Jaccard similarity of a near-duplicate
+DEFAULT_DEDUP_SIZE = int(os.getenv('TWITTER_DEDUP_SIZE', 20000))  # Clusters remembered at most
+DEFAULT_DEDUP_TTL = float(os.getenv('TWITTER_DEDUP_TTL', 3600))  # Seconds a cluster lives after its last tweet
+SHINGLE_SIZE = 5  # Characters per shingle
+BANDS = 8  # LSH bands of ROWS signature values, a pair collides in some band
+ROWS = 4  # with probability 1 - (1 - J^ROWS)^BANDS, 98.5% at J = 0.8
+MIN_TEXT_LENGTH = 24  # Shorter texts ("$WIF lfg") are too generic to cluster
+
+# Handles and t.co links vary between copies of the same shill text
+NOISE_PATTERN = re.compile(r'@\w+|https?://t\.co/\w+')
+
+_rng = np.random.default_rng(0x5eed)
+HASH_MULTIPLIERS = _rng.integers(1, 2 ** 63, BANDS * ROWS, dtype=np.uint64) | np.uint64(1)
+BAND_MULTIPLIERS = _rng.integers(1, 2 ** 63, (BANDS, ROWS), dtype=np.uint64) | np.uint64(1)
+SHINGLE_BASE = np.uint64(1099511628211)
+
+
+def normalize(text):
+    """Lowercase text without handles, t.co links and repeated whitespace"""
+    return ' '.join(NOISE_PATTERN.sub(' ', text.lower()).split())
+
+
+class TextCluster:
+    """Near-identical texts collapsed into one weighted mention"""
+
+    __slots__ = ('signature', 'keys', 'weight', 'first_seen', 'last_seen')
+
+    def __init__(self, signature, keys, now):
+        self.signature = signature  # MinHash values, uint32
+        self.keys = keys  # LSH bucket keys pointing at this cluster
+        self.weight = 1  # Texts in the cluster
+        self.first_seen = now
+        self.last_seen = now
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate detection with MinHash and LSH.
+
+    Each text is reduced to a signature of BANDS * ROWS MinHash values
+    over its character shingles, computed for a whole batch at once with
+    numpy. Signatures are split into bands and hashed into buckets; a
+    text sharing a bucket with a cluster whose signature agrees on at
+    least `threshold` of the values joins that cluster instead of
+    starting a new one. Texts only cluster with texts carrying the same
+    tag, so one template shilling different tokens stays apart.
+
+    Memory is bounded by `maxsize` clusters, evicted least recently
+    matched first, and clusters are dropped `ttl` seconds after their
+    last text.
+    """
+
+    def __init__(self, threshold=DEFAULT_DEDUP_THRESHOLD, maxsize=DEFAULT_DEDUP_SIZE, ttl=DEFAULT_DEDUP_TTL):
+        if maxsize <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._min_matches = int(np.ceil(threshold * BANDS * ROWS))
+        self._clusters = OrderedDict()  # id(cluster) -> TextCluster, least recently matched first
+        self._buckets = {}  # LSH bucket key -> TextCluster
+        self.stats = {'texts': 0, 'duplicates': 0, 'clusters': 0, 'evicted': 0}
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def signatures(self, texts):
+        """
+        Get the MinHash signatures of texts
+
+        Args:
+            texts: Normalized texts of at least SHINGLE_SIZE bytes
+
+        Returns:
+            numpy.ndarray: (len(texts), BANDS * ROWS) uint32 signatures
+        """
+        encoded = [text.encode() for text in texts]
+        lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        # Polynomial hash of every SHINGLE_SIZE byte window of the joined texts
+        count = len(data) - SHINGLE_SIZE + 1
+        shingles = data[:count].copy()
+        for offset in range(1, SHINGLE_SIZE):
+            shingles *= SHINGLE_BASE
+            shingles += data[offset:offset + count]
+
+        # Windows crossing into the next text are dropped
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        valid = np.ones(count, dtype=bool)
+        for offset in range(1, SHINGLE_SIZE):
+            valid[ends[:-1] - offset] = False
+        shingles = shingles[valid]
+        segments = starts - np.arange(len(starts)) * (SHINGLE_SIZE - 1)
+
+        # Multiplying by an odd constant permutes the 64-bit values, one
+        # permutation per MinHash function; the high half of each minimum
+        # is kept
+        hashed = HASH_MULTIPLIERS[:, None] * shingles[None, :]
+        minimums = np.minimum.reduceat(hashed, segments, axis=1)
+        return (minimums.T >> np.uint64(32)).astype(np.uint32)
+
+    def _bucket_keys(self, signatures, tags):
+        bands = signatures.astype(np.uint64).reshape(len(signatures), BANDS, ROWS)
+        keys = (bands * BAND_MULTIPLIERS[None, :, :]).sum(axis=2)
+        keys += np.arange(BANDS, dtype=np.uint64)[None, :]
+        if tags is not None:
+            keys ^= np.array([hash(tag) & 0xFFFFFFFFFFFFFFFF for tag in tags], dtype=np.uint64)[:, None]
+        return keys.tolist()
+
+    def add_batch(self, texts, tags=None, now=None):
+        """
+        Cluster a batch of texts
+
+        Args:
+            texts: Raw texts
+            tags: Hashable per text, texts only cluster with equal tags
+
+        Returns:
+            list: (cluster, duplicate) per text, cluster is None for texts
+                too short to compare
+        """
+        now = now or time.time()
+        self.expire(now)
+        results = [(None, False)] * len(texts)
+        normalized = [normalize(text) for text in texts]
+        indices = [i for i, text in enumerate(normalized) if len(text) >= MIN_TEXT_LENGTH]
+        if not indices:
+            return results
+
+        signatures = self.signatures([normalized[i] for i in indices])
+        keys = self._bucket_keys(signatures, None if tags is None else [tags[i] for i in indices])
+        self.stats['texts'] += len(indices)
+        for i, signature, text_keys in zip(indices, signatures, keys):
+            cluster = self._match(signature, text_keys)
+            if cluster is not None:
+                cluster.weight += 1
+                cluster.last_seen = now
+                self._clusters.move_to_end(id(cluster))
+                self.stats['duplicates'] += 1
+                results[i] = (cluster, True)
+                continue
+
+            cluster = TextCluster(signature, text_keys, now)
+            for key in text_keys:
+                self._buckets[key] = cluster
+            self._clusters[id(cluster)] = cluster
+            self.stats['clusters'] += 1
+            if len(self._clusters) > self.maxsize:
+                self._evict(self._clusters.popitem(last=False)[1])
+            results[i] = (cluster, False)
+        return results
+
+    def _match(self, signature, keys):
+        best, best_matches = None, self._min_matches - 1
+        for key in keys:
+            cluster = self._buckets.get(key)
+            if cluster is None or cluster is best:
+                continue
+            matches = np.count_nonzero(signature == cluster.signature)
+            if matches > best_matches:
+                best, best_matches = cluster, matches
+        return best
+
+    def _evict(self, cluster):
+        for key in cluster.keys:
+            if self._buckets.get(key) is cluster:
+                del self._buckets[key]
+        self.stats['evicted'] += 1
+
+    def expire(self, now=None):
+        """Drop clusters without a text in the last ttl seconds"""
+        cutoff = (now or time.time()) - self.ttl
+        while self._clusters:
+            cluster = next(iter(self._clusters.values()))
+            if cluster.last_seen > cutoff:
+                break
+            del self._clusters[id(cluster)]
+            self._evict(cluster)
+
+    def get_stats(self):
+        """Get text, duplicate and cluster counts"""
+        return {**self.stats, 'active_clusters': len(self._clusters), 'buckets': len(self._buckets)}
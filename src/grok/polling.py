@@ -0,0 +1,117 @@
+import os
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 5.0  # Seconds between polls before any launch is seen
+DEFAULT_MIN_POLL_INTERVAL = float(os.getenv('TRACKER_MIN_POLL_INTERVAL', 1))  # During launch bursts
+DEFAULT_MAX_POLL_INTERVAL = float(os.getenv('TRACKER_MAX_POLL_INTERVAL', 5))  # When quiet, long waits are left to error backoff
+MAX_ERROR_BACKOFF = 300.0  # Seconds between polls of a failing source at most
+QUIET_FACTOR = 1.25  # Interval multiplier after a poll without new launches
+JITTER = 0.1  # Relative jitter on every delay, so sources don't poll in lockstep
+
+
+class AdaptivePoller:
+    """
+    Poll timing and conditional request state of one launch source.
+
+    After a poll that found n new launches the interval is divided by
+    n + 1, down to `min_interval`, so a burst is polled at full rate
+    within a poll or two; it grows by a quarter after each empty or
+    unchanged poll, up to `max_interval`. Errors back off exponentially
+    from the current interval. The ETag and Last-Modified validators of
+    the last full response are sent back so an unchanged list costs a
+    304, and with `since_param` set the newest launch time seen is
+    passed as a cursor so only newer launches are returned.
+    """
+
+    def __init__(
+        self,
+        interval=DEFAULT_POLL_INTERVAL,
+        min_interval=DEFAULT_MIN_POLL_INTERVAL,
+        max_interval=DEFAULT_MAX_POLL_INTERVAL,
+        since_param=None
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.since_param = since_param
+        self.etag = None
+        self.last_modified = None
+        self.cursor = None  # Newest launch_time returned
+        self.failures = 0  # Consecutive failed polls
+        self.stats = {'polls': 0, 'not_modified': 0, 'errors': 0, 'new_launches': 0}
+
+    def request_headers(self):
+        """Get the conditional request headers"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def request_params(self, params):
+        """Get the query parameters with the cursor added if supported"""
+        if self.since_param and self.cursor is not None:
+            return {**params, self.since_param: self.cursor}
+        return params
+
+    def record_response(self, status, headers, launches=()):
+        """
+        Record the response of a poll
+
+        Any status but 200 or 304, such as a 429 or 5xx, counts as an
+        error and backs off.
+
+        Args:
+            status: HTTP status
+            headers: Response headers, for the validators of a 200
+            launches: Returned launches, for the cursor
+        """
+        if status not in (200, 304):
+            self.record_error()
+            return
+        self.stats['polls'] += 1
+        self.failures = 0
+        if status == 304:
+            self.stats['not_modified'] += 1
+            return
+        self.etag = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+        if self.since_param:
+            times = [launch['launch_time'] for launch in launches if launch.get('launch_time') is not None]
+            if times:
+                self.cursor = max(times if self.cursor is None else [self.cursor, *times])
+
+    def record_launches(self, new_launches):
+        """Adapt the interval to the launches the last poll found"""
+        self.stats['new_launches'] += new_launches
+        if new_launches:
+            interval = self.interval / (new_launches + 1)
+        else:
+            interval = self.interval * QUIET_FACTOR
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+
+    def record_error(self):
+        self.stats['polls'] += 1
+        self.stats['errors'] += 1
+        self.failures += 1
+
+    def next_delay(self):
+        """Seconds to wait before the next poll, with jitter"""
+        delay = self.interval
+        if self.failures:
+            delay = min(max(delay, DEFAULT_POLL_INTERVAL) * 2 ** self.failures, MAX_ERROR_BACKOFF)
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def get_stats(self):
+        """Get poll counts, new launches per poll and the current interval"""
+        polls = self.stats['polls']
+        return {
+            **self.stats,
+            'new_per_poll': self.stats['new_launches'] / polls if polls else 0.0,
+            'interval': self.interval,
+            'failures': self.failures
+        }
@@ -0,0 +1,248 @@
+import math
+import logging
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELATIVE_ACCURACY = 0.01  # Max relative error of a returned quantile
+DEFAULT_MAX_BINS = 512  # Bins per sketch, 4 KB of counts covering a ~27000x range
+DEFAULT_BUCKETS = 28  # Time buckets per window, 6 hours each over 7 days
+
+
+class QuantileSketch:
+    """
+    Fixed-size streaming quantile sketch with a relative error guarantee.
+
+    Values are counted in logarithmic bins (the DDSketch layout): bin i
+    covers (gamma^(i-1), gamma^i] with gamma = (1+a)/(1-a), so every
+    quantile is returned within relative error `a` of the true value at
+    that rank. Counts live in one int64 array of `max_bins` entries that
+    slides to follow the data; once the value range outgrows it the lowest
+    bins are collapsed, which only degrades the lowest quantiles. Counts
+    can be removed again, which is what time-windowed sketches build on.
+    Non-positive values are counted as 0.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy=DEFAULT_RELATIVE_ACCURACY,
+        max_bins=DEFAULT_MAX_BINS
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        if max_bins < 2:
+            raise ValueError("A sketch needs at least 2 bins")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._counts = np.zeros(max_bins, dtype=np.int64)
+        self._offset = None  # Bin index held by _counts[0]
+        self._zero = 0  # Non-positive values, they have no logarithmic bin
+        self._count = 0
+        self._cumulative = None  # Running counts, rebuilt on the first read after a write
+        self.collapsed = 0  # Values merged into the lowest bin
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        """Memory held by the bin counts"""
+        return self._counts.nbytes
+
+    def index(self, value):
+        """Get the bin index of a value, None for non-positive values"""
+        if not value > 0:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _shift(self, shift):
+        """Slide the bins up (shift > 0) or down (shift < 0) by `shift` slots"""
+        counts = self._counts
+        if shift >= self.max_bins:
+            merged = int(counts.sum())
+            self.collapsed += merged
+            counts[:] = 0
+            counts[0] = merged
+        elif shift > 0:
+            self.collapsed += int(counts[:shift].sum())
+            merged = int(counts[:shift + 1].sum())
+            counts[:-shift] = counts[shift:].copy()
+            counts[-shift:] = 0
+            counts[0] = merged
+        elif shift < 0:
+            counts[-shift:] = counts[:shift].copy()
+            counts[:-shift] = 0
+        self._offset += shift
+
+    def _slot(self, index):
+        """Get the array slot of a bin index, sliding or collapsing to fit it"""
+        if self._offset is None:
+            self._offset = index - self.max_bins // 2
+        slot = index - self._offset
+
+        if slot >= self.max_bins:
+            self._shift(slot - self.max_bins + 1)
+            slot = self.max_bins - 1
+        elif slot < 0:
+            # Slide down into empty high bins, clamp whatever doesn't fit.
+            # Collapsed counts pin slot 0 so removals can still find them.
+            used = np.flatnonzero(self._counts)
+            room = self.max_bins - 1 - (int(used[-1]) if len(used) else -1)
+            shift = 0 if self.collapsed else min(-slot, room)
+            if shift:
+                self._shift(-shift)
+                slot += shift
+            if slot < 0:
+                self.collapsed += 1
+                slot = 0
+        return slot
+
+    def add_index(self, index, count=1):
+        """Count `count` values into a bin given by index()"""
+        self._cumulative = None
+        self._count += count
+        if index is None:
+            self._zero += count
+        else:
+            self._counts[self._slot(index)] += count
+
+    def remove_index(self, index, count=1):
+        """Remove `count` values previously added to a bin"""
+        if index is None:
+            count = min(count, self._zero)
+            self._zero -= count
+        elif self._offset is not None:
+            # Values below the collapsed range were merged into slot 0
+            slot = min(max(index - self._offset, 0), self.max_bins - 1)
+            count = min(count, int(self._counts[slot]))
+            self._counts[slot] -= count
+        else:
+            return
+        self._count -= count
+        self._cumulative = None
+
+    def add(self, value, count=1):
+        """
+        Add a value
+
+        Returns:
+            int: Bin index the value was counted in, None for non-positive values
+        """
+        index = self.index(value)
+        self.add_index(index, count)
+        return index
+
+    def remove(self, value, count=1):
+        """Remove a previously added value"""
+        self.remove_index(self.index(value), count)
+
+    def quantile(self, q):
+        """
+        Get the value at quantile q
+
+        Args:
+            q: Quantile in [0, 1], e.g. 0.25 for the 25th percentile
+
+        Returns:
+            float: Value within relative_accuracy of the value at rank
+                floor(q * (n - 1)), or None if the sketch is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if not self._count:
+            return None
+
+        rank = math.floor(q * (self._count - 1)) - self._zero
+        if rank < 0:
+            return 0.0
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self._counts)
+        slot = int(np.searchsorted(self._cumulative, rank, side='right'))
+        # Midpoint of the bin in relative terms
+        return 2 * self.gamma ** (self._offset + slot) / (self.gamma + 1)
+
+    def quantiles(self, qs):
+        """Get the values at several quantiles"""
+        return [self.quantile(q) for q in qs]
+
+
+class WindowedQuantileSketch:
+    """
+    Quantile sketch over a sliding time window.
+
+    Values go into one QuantileSketch and are journaled per time bucket of
+    window / buckets seconds as (bin, count) pairs. When a bucket falls
+    out of the window its counts are removed again, so reads cost the same
+    as on a plain sketch and memory is the fixed bin array plus one small
+    journal per bucket. Expiry is bucket-granular: the sketch covers
+    between window - window / buckets and window seconds of data.
+    """
+
+    def __init__(
+        self,
+        window,
+        buckets=DEFAULT_BUCKETS,
+        relative_accuracy=DEFAULT_RELATIVE_ACCURACY,
+        max_bins=DEFAULT_MAX_BINS
+    ):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("Window and buckets must be greater than 0")
+
+        self.window = window
+        self.bucket_seconds = window / buckets
+        self.sketch = QuantileSketch(relative_accuracy, max_bins)
+        self._closed = deque()  # (bucket start, bin indices, counts, zeros) in time order
+        self._open_start = None
+        self._open = {}  # Bin index -> count of the bucket being filled
+
+    def __len__(self):
+        return len(self.sketch)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the bin counts and bucket journals"""
+        journal = sum(bins.nbytes + counts.nbytes for _, bins, counts, _ in self._closed)
+        return self.sketch.nbytes + journal + 16 * len(self._open)
+
+    def _close_bucket(self):
+        if self._open:
+            zero = self._open.pop(None, 0)
+            bins = np.fromiter(self._open, dtype=np.int32, count=len(self._open))
+            counts = np.fromiter(self._open.values(), dtype=np.int32, count=len(self._open))
+            self._closed.append((self._open_start, bins, counts, zero))
+        self._open = {}
+
+    def add(self, timestamp, value):
+        """Add a value observed at epoch `timestamp` and expire old buckets"""
+        start = math.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+        if self._open_start is None or start > self._open_start:
+            self._close_bucket()
+            self._open_start = start
+        # Late values join the open bucket and expire with it
+
+        index = self.sketch.add(value)
+        self._open[index] = self._open.get(index, 0) + 1
+        self.expire(timestamp)
+
+    def expire(self, now):
+        """Remove buckets that ended before now - window"""
+        cutoff = now - self.window
+        while self._closed and self._closed[0][0] + self.bucket_seconds <= cutoff:
+            _, bins, counts, zero = self._closed.popleft()
+            for index, count in zip(bins.tolist(), counts.tolist()):
+                self.sketch.remove_index(index, count)
+            if zero:
+                self.sketch.remove_index(None, zero)
+
+    def quantile(self, q):
+        """Get the value at quantile q over the window, None if empty"""
+        return self.sketch.quantile(q)
+
+    def quantiles(self, qs):
+        """Get the values at several quantiles over the window"""
+        return self.sketch.quantiles(qs)
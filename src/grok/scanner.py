@@ -1,25 +1,116 @@
 import os
+import json
+import time
 import tweepy
-import re
 import asyncio
 import logging
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from .stats import LatencyWindow
+from .seen import SeenIndex, DEFAULT_SEEN_SIZE
+from .symbols import SymbolExtractor
+from .mentions import MentionWindow, MentionHistory, Mention, UserTable, DEFAULT_PROFILE_TTL
+from .stream import TweetStream
+from .keywords import KeywordScheduler
+from .coalesce import AlertCoalescer
+from .neardup import NearDuplicateFilter
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+SEARCH_KEYWORDS = (
+    'memecoin solana',
+    'solana token',
+    '$SOL memecoin',
+    'new solana',
+    'launch solana'
+)
+DEFAULT_SEARCH_WORKERS = int(os.getenv('TWITTER_SEARCH_WORKERS', len(SEARCH_KEYWORDS)))
+DEFAULT_QUERY_TIMEOUT = float(os.getenv('TWITTER_QUERY_TIMEOUT', 15))  # Seconds per search
+DEFAULT_CURSOR_PATH = os.getenv('TWITTER_CURSOR_PATH', 'data/twitter_cursors.json')
+DEFAULT_MENTION_HISTORY = int(os.getenv('TWITTER_MENTION_HISTORY', 100))  # Raw mentions kept per symbol, 0 keeps none
+DEFAULT_INGEST_MODE = os.getenv('TWITTER_INGEST_MODE', 'search')  # search/stream
+STREAM_BATCH_SIZE = 500  # Streamed tweets processed per pass at most
+STREAM_RESTART_DELAY = 5  # Seconds before restarting a crashed stream reader, doubled per crash
+MAX_STREAM_RESTART_DELAY = 300
+PRUNE_INTERVAL = 60  # Seconds between sweeps of expired symbols and profiles
+
 class TwitterScanner:
-    def __init__(self):
-        self.api_key = os.getenv('TWITTER_API_KEY')
-        self.api_secret = os.getenv('TWITTER_API_SECRET')
+    def __init__(
+        self,
+        api=None,
+        keywords=SEARCH_KEYWORDS,
+        search_workers=DEFAULT_SEARCH_WORKERS,
+        query_timeout=DEFAULT_QUERY_TIMEOUT,
+        cursor_path=DEFAULT_CURSOR_PATH,
+        seen_size=DEFAULT_SEEN_SIZE,
+        mention_history=DEFAULT_MENTION_HISTORY,
+        profile_ttl=DEFAULT_PROFILE_TTL,
+        extractor=None,
+        symbol_index=None,
+        mode=DEFAULT_INGEST_MODE,
+        stream=None,
+        keyword_scheduler=None,
+        alerts=None,
+        duplicates=None
+    ):
+        if mode not in ('search', 'stream'):
+            raise ValueError(f"Invalid Twitter ingest mode '{mode}', expected search or stream")
+        self.mode = mode
+        if mode == 'stream' and stream is None:
+            # Filter rules mirror the search keywords
+            stream = TweetStream(rules=keywords)
+        self.stream = stream  # TweetStream feeding tweets as they're posted
         
-        if not self.api_key or not self.api_secret:
-            raise ValueError("Twitter API credentials not found in .env file")
+        if api is None and mode == 'search':
+            self.api_key = os.getenv('TWITTER_API_KEY')
+            self.api_secret = os.getenv('TWITTER_API_SECRET')
             
-        self.auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
-        self.api = tweepy.API(self.auth)
-        self.trends = {}  # Store trend data
+            if not self.api_key or not self.api_secret:
+                raise ValueError("Twitter API credentials not found in .env file")
+                
+            self.auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
+            api = tweepy.API(self.auth, timeout=query_timeout)
+            # One keep-alive pool shared by all search threads
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=search_workers)
+            api.session.mount('https://', adapter)
+        self.api = api
+        # Polls each query as often as its yield and the remaining quota justify
+        self.keyword_scheduler = keyword_scheduler or KeywordScheduler(keywords)
+        self.search_workers = search_workers
+        self.query_timeout = query_timeout
+        self._executor = None  # Threads running blocking tweepy calls
+        self.search_latency = LatencyWindow()  # Per query
+        self.scan_latency = LatencyWindow()  # Whole concurrent search
+        self.search_errors = 0
+        self.stream_restarts = 0  # Crashed stream readers restarted
+        self.cursor_path = cursor_path
+        self.cursors = self._load_cursors()  # Query -> newest tweet ID fetched (since_id)
+        self._cursors_changed = False
+        self._cursor_write = None
+        self.seen = SeenIndex(seen_size)  # Tweet IDs already processed
+        self.scan_stats = {'new': 0, 'duplicate': 0, 'near_duplicate': 0}  # Last scan, near duplicates are also new
+        self.tweet_stats = {'new': 0, 'duplicate': 0, 'near_duplicate': 0}  # Since start
+        self.mention_history = mention_history
+        self.windows = OrderedDict()  # Symbol -> MentionWindow of the last 24 hours, least recently mentioned first
+        self._pruned_at = 0.0
+        self.users = UserTable(profile_ttl)  # Author profiles shared by mentions
+        self.extractor = extractor or SymbolExtractor()  # Cashtags and mint addresses
+        self.symbol_index = symbol_index  # SymbolIndex shared with LaunchTracker
+        self.trends = {}  # Symbol -> MentionHistory of the most recent raw mentions
+        self.alerts = alerts or AlertCoalescer()  # At most one update per symbol per window
+        self.duplicates = duplicates if duplicates is not None else NearDuplicateFilter()  # Clusters of near-identical shill tweets
+        
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.search_workers,
+                thread_name_prefix='twitter-search'
+            )
+        return self._executor
         
     async def start_scanning(self, callback):
         """
@@ -28,93 +119,359 @@ class TwitterScanner:
         Args:
             callback: Function to call with new token data
         """
+        if self.mode == 'stream':
+            await self._stream_and_process(callback)
+            return
+            
         while True:
             try:
                 await self._scan_and_process(callback)
-                await asyncio.sleep(10)  # Scan every 10 seconds
+                await asyncio.sleep(self.keyword_scheduler.next_due_in())
                 
             except Exception as e:
                 logger.error(f"Error in Twitter scanning: {str(e)}")
                 await asyncio.sleep(60)  # Wait longer on error
                 
+    async def _stream_and_process(self, callback):
+        """
+        Process filtered-stream tweets in batches as they arrive
+        
+        The stream reader is watched while waiting for tweets, so a reader
+        that dies on an unexpected error is logged and restarted with
+        backoff instead of leaving the queue empty forever.
+        """
+        reader = asyncio.create_task(self._run_stream())
+        batch = None
+        crashes = 0  # Consecutive reader crashes without a tweet in between
+        try:
+            while True:
+                if batch is None:
+                    batch = asyncio.create_task(self.stream.get_batch(STREAM_BATCH_SIZE))
+                await asyncio.wait((batch, reader), return_when=asyncio.FIRST_COMPLETED)
+                
+                if reader.done():
+                    crashes += 1
+                    self.stream_restarts += 1
+                    delay = min(STREAM_RESTART_DELAY * 2 ** (crashes - 1), MAX_STREAM_RESTART_DELAY)
+                    logger.error(
+                        f"Twitter stream reader stopped: {reader.exception()!r}, "
+                        f"restarting in {delay}s"
+                    )
+                    reader = asyncio.create_task(self._run_stream(delay))
+                    
+                if not batch.done():
+                    continue
+                tweets = batch.result()
+                batch = None
+                crashes = 0
+                try:
+                    await self._process_tweets(tweets, callback)
+                except Exception as e:
+                    logger.error(f"Error processing streamed tweets: {str(e)}")
+        finally:
+            for task in (reader, batch):
+                if task is not None:
+                    task.cancel()
+                    
+    async def _run_stream(self, delay=0):
+        """Run the stream reader after `delay` seconds"""
+        await asyncio.sleep(delay)
+        await self.stream.run()
+            
+    @property
+    def keywords(self):
+        return self.keyword_scheduler.keywords
+        
+    def set_keywords(self, keywords):
+        """Replace the search keyword queries at runtime, and the stream's filter rules"""
+        self.keyword_scheduler.set_keywords(keywords)
+        if self.mode == 'stream':
+            self.stream.set_rules(self.keywords)
+        
     async def _scan_and_process(self, callback):
         """Scan tweets and process found tokens"""
-        # Search for memecoin related tweets
-        tweets = await self._search_tweets()
+        # Search the memecoin queries that are due
+        queries = self.keyword_scheduler.due()
+        if not queries:
+            return
+        results = await self._search_queries(queries)
+        outcome = await self._process_tweets(
+            [tweet for _, tweets in results for tweet in tweets], callback
+        )
         
-        for tweet in tweets:
-            # Extract token symbols
-            symbols = self._extract_symbols(tweet.text)
+        # Credit each new tweet to the first query that returned it
+        for query, tweets in results:
+            new_tweets = relevant = discoveries = 0
+            for tweet in tweets:
+                found = outcome.pop(tweet.id, None)
+                if found is not None:
+                    new_tweets += 1
+                    relevant += found >= 0
+                    discoveries += max(found, 0)
+            self.keyword_scheduler.record(query, new_tweets, relevant, discoveries)
+        
+    async def _process_tweets(self, tweets, callback):
+        """
+        Extract, score and report the tokens of a batch of tweets
+        
+        Returns:
+            dict: Tweet ID -> tokens first seen in it, or -1 for new tweets
+                without any token reference or near-identical to an earlier one
+        """
+        # A tweet matching several queries comes back once per query
+        fresh = [tweet for tweet in tweets if self.seen.add(tweet.id)]
+        self.scan_stats = {'new': len(fresh), 'duplicate': len(tweets) - len(fresh), 'near_duplicate': 0}
+        
+        # Extract cashtags and mint addresses of the whole scan in one pass
+        texts = [self._tweet_text(tweet) for tweet in fresh]
+        references = self.extractor.extract_batch(texts)
+        keys = [self._trend_keys(symbols, mints) for symbols, mints in references]
+        
+        # Near-identical tweets about the same tokens collapse into the
+        # first one's mention, which carries the cluster size as its weight;
+        # the windows count them as copies, not as new mentions
+        clusters = [(None, False)] * len(fresh)
+        relevant = [i for i, symbols in enumerate(keys) if symbols]
+        found = self.duplicates.add_batch(
+            [texts[i] for i in relevant],
+            [frozenset(keys[i]) for i in relevant]
+        )
+        for i, result in zip(relevant, found):
+            clusters[i] = result
+        self.scan_stats['near_duplicate'] = sum(1 for _, duplicate in found if duplicate)
+        for name, count in self.scan_stats.items():
+            self.tweet_stats[name] += count
+        
+        outcome = {}
+        for tweet, text, (_, mints), symbols, (cluster, duplicate) in zip(fresh, texts, references, keys, clusters):
+            if duplicate:
+                outcome[tweet.id] = -1
+                for symbol in symbols:
+                    window = self.windows.get(symbol)
+                    if window is not None:
+                        window.add_copy(time.time())
+                continue
+            outcome[tweet.id] = sum(1 for symbol in symbols if symbol not in self.windows) if symbols else -1
             
             # Update trend data
-            timestamp = datetime.now()
+            timestamp = time.time()
+            user = self.users.observe(
+                tweet.user.id,
+                tweet.user.screen_name,
+                tweet.user.followers_count,
+                timestamp
+            )
             for symbol in symbols:
-                if symbol not in self.trends:
-                    self.trends[symbol] = []
-                    
-                self.trends[symbol].append({
-                    'timestamp': timestamp,
-                    'tweet_id': tweet.id,
-                    'user': tweet.user.screen_name,
-                    'followers': tweet.user.followers_count,
-                    'retweets': tweet.retweet_count,
-                    'likes': tweet.favorite_count
-                })
+                window = self.windows.get(symbol)
+                if window is None:
+                    window = MentionWindow()
+                    self.windows[symbol] = window
+                else:
+                    self.windows.move_to_end(symbol)
+                window.add(
+                    timestamp,
+                    user.followers,
+                    tweet.retweet_count + tweet.favorite_count
+                )
+                
+                if self.mention_history:
+                    if symbol not in self.trends:
+                        self.trends[symbol] = MentionHistory(self.mention_history)
+                    self.trends[symbol].append(Mention(
+                        timestamp,
+                        tweet.id,
+                        user,
+                        tweet.retweet_count,
+                        tweet.favorite_count,
+                        cluster
+                    ))
                 
                 # Calculate trend strength
                 trend_strength = self._calculate_trend_strength(symbol)
                 
                 # Notify about strong trends
                 if trend_strength > 0.7:  # Threshold for strong trends
-                    await callback({
+                    alert = self.alerts.offer({
                         'symbol': symbol,
                         'trend_strength': trend_strength,
-                        'mentions': len(self.trends[symbol]),
-                        'latest_tweet': tweet.text,
+                        'mentions': len(window),
+                        'copies': window.copies,
+                        'mints': self._resolve_mints(symbol, mints),
+                        'latest_tweet': text,
                         'source': 'twitter'
-                    })
-                    
+                    }, timestamp)
+                    if alert is not None:
+                        await callback(alert)
+                        
+        # Updates held back during their symbol's window
+        for alert in self.alerts.flush_due():
+            await callback(alert)
+            
+        self._prune_windows()
+        return outcome
+        
+    def _prune_windows(self, interval=PRUNE_INTERVAL):
+        """Forget symbols without mentions in the last 24 hours and stale profiles"""
+        now = time.time()
+        if now - self._pruned_at < interval:
+            return
+        self._pruned_at = now
+        
+        # Windows are in last mention order, so the expired ones lead
+        while self.windows:
+            symbol, window = next(iter(self.windows.items()))
+            if window.totals(now)[0]:
+                break
+            del self.windows[symbol]
+            self.trends.pop(symbol, None)
+        self.users.expire(now)
+            
     async def _search_tweets(self):
-        """Search for relevant tweets"""
-        keywords = [
-            'memecoin solana',
-            'solana token',
-            '$SOL memecoin',
-            'new solana',
-            'launch solana'
-        ]
-        
-        all_tweets = []
-        for query in keywords:
-            try:
-                tweets = self.api.search_tweets(
-                    q=query,
-                    count=100,
-                    tweet_mode='extended',
-                    lang='en'
-                )
-                all_tweets.extend(tweets)
-            except tweepy.TweepError as e:
-                logger.error(f"Twitter API error: {str(e)}")
-                
-        return all_tweets
+        """Search all keyword queries concurrently"""
+        results = await self._search_queries(self.keywords)
+        return [tweet for _, tweets in results for tweet in tweets]
+        
+    async def _search_queries(self, queries):
+        """
+        Search keyword queries concurrently
+        
+        Blocking tweepy calls run in a bounded thread pool, so the scan
+        takes as long as the slowest query and never blocks the loop.
+        
+        Returns:
+            list: (query, tweets) pairs in query order
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._search_query(query) for query in queries)
+        )
+        self.scan_latency.record(time.perf_counter() - started)
+        self._persist_cursors()
+        return list(zip(queries, results))
+        
+    async def _search_query(self, query):
+        """Run one search in the thread pool, empty on error or timeout"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            tweets = await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._get_executor(), self._search, query, self.cursors.get(query)
+                ),
+                timeout=self.query_timeout
+            )
+            self._record_quota(getattr(self.api, 'last_response', None))
+            if tweets:
+                self._advance_cursor(query, max(tweet.id for tweet in tweets))
+            return tweets
+        except asyncio.TimeoutError:
+            self.search_errors += 1
+            logger.error(f"Twitter search timed out after {self.query_timeout}s: {query}")
+        except tweepy.TweepyException as e:
+            self.search_errors += 1
+            if isinstance(e, tweepy.HTTPException):
+                self._record_quota(e.response)
+            logger.error(f"Twitter API error: {str(e)}")
+        finally:
+            self.search_latency.record(time.perf_counter() - started)
+        return []
+        
+    def _search(self, query, since_id=None):
+        """Blocking search call, runs in a worker thread"""
+        return self.api.search_tweets(
+            q=query,
+            count=100,
+            tweet_mode='extended',
+            lang='en',
+            since_id=since_id
+        )
+        
+    def _record_quota(self, response):
+        """Pass the search rate limit headers of a response to the scheduler"""
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return
+        try:
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset_at = float(headers['x-rate-limit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        # Limits are per endpoint, so any query's headers describe all of them
+        self.keyword_scheduler.update_quota(remaining, reset_at)
+        
+    def _advance_cursor(self, query, tweet_id):
+        """Move a query's since_id forward"""
+        if tweet_id > self.cursors.get(query, 0):
+            self.cursors[query] = tweet_id
+            self._cursors_changed = True
+            
+    def _persist_cursors(self):
+        """Write changed cursors in the background, one write at a time"""
+        if not self.cursor_path or not self._cursors_changed:
+            return
+        if self._cursor_write is not None and not self._cursor_write.done():
+            return  # The next scan writes the newer cursors
+        self._cursors_changed = False
+        loop = asyncio.get_running_loop()
+        self._cursor_write = loop.run_in_executor(
+            None, self._write_cursors, dict(self.cursors)
+        )
+        self._cursor_write.add_done_callback(self._log_cursor_error)
+            
+    def _load_cursors(self):
+        """Load persisted since_id cursors, empty if missing or unreadable"""
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return {}
+        try:
+            with open(self.cursor_path) as f:
+                return {query: int(tweet_id) for query, tweet_id in json.load(f).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Error loading Twitter cursors from {self.cursor_path}: {str(e)}")
+            return {}
+            
+    def _write_cursors(self, cursors):
+        directory = os.path.dirname(self.cursor_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated file
+        tmp_path = f"{self.cursor_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cursors, f)
+        os.replace(tmp_path, self.cursor_path)
+        
+    @staticmethod
+    def _log_cursor_error(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error persisting Twitter cursors: {str(future.exception())}")
         
     def _extract_symbols(self, text):
         """Extract potential token symbols from text"""
-        # Match $SYMBOL pattern (3-10 uppercase letters)
-        pattern = r'\$[A-Z]{3,10}\b'
-        symbols = re.findall(pattern, text)
-        
-        # Remove $ prefix and filter out common words
-        filtered = set()
-        common_words = {'THE', 'AND', 'FOR', 'SOL'}  # Expand as needed
-        
-        for symbol in symbols:
-            symbol = symbol[1:]  # Remove $
-            if symbol not in common_words:
-                filtered.add(symbol)
-                
-        return filtered
+        return self.extractor.extract(text)[0]
+        
+    @staticmethod
+    def _tweet_text(tweet):
+        """Get the untruncated text of a tweet"""
+        # Extended mode tweets carry the text in full_text only
+        return getattr(tweet, 'full_text', None) or tweet.text
+        
+    def _trend_keys(self, symbols, mints):
+        """Trend on symbols, and on mints by their symbol when it is known"""
+        keys = set(symbols)
+        for mint in mints:
+            symbol = self.symbol_index.symbol_for(mint) if self.symbol_index else None
+            keys.add(symbol or mint)
+        return keys
+        
+    def _resolve_mints(self, key, tweet_mints):
+        """Get candidate mint addresses of a trend key"""
+        if key in tweet_mints:
+            return [key]
+        if self.symbol_index is None:
+            return []
+        # Mints linked in the tweet disambiguate a reused ticker
+        candidates = self.symbol_index.mints_for(key)
+        linked = [mint for mint in candidates if mint in tweet_mints]
+        return linked or list(candidates)
         
     def _calculate_trend_strength(self, symbol):
         """
@@ -124,28 +481,18 @@ class TwitterScanner:
         - Tweet engagement (likes, retweets)
         - Time decay
         """
-        if symbol not in self.trends:
+        window = self.windows.get(symbol)
+        if window is None:
             return 0
             
-        mentions = self.trends[symbol]
-        now = datetime.now()
-        
-        # Only consider mentions in last 24 hours
-        recent_mentions = [
-            m for m in mentions 
-            if (now - m['timestamp']).total_seconds() < 86400
-        ]
-        
-        if not recent_mentions:
+        # Running totals over the last 24 hours
+        num_mentions, followers, engagement, _ = window.totals()
+        if not num_mentions:
             return 0
             
         # Factors in trend strength
-        num_mentions = len(recent_mentions)
-        avg_followers = sum(m['followers'] for m in recent_mentions) / num_mentions
-        avg_engagement = sum(
-            m['retweets'] + m['likes'] 
-            for m in recent_mentions
-        ) / num_mentions
+        avg_followers = followers / num_mentions
+        avg_engagement = engagement / num_mentions
         
         # Normalize factors
         norm_mentions = min(num_mentions / 50, 1.0)  # Cap at 50 mentions
@@ -166,3 +513,24 @@ class TwitterScanner:
         if symbol:
             return self.trends.get(symbol, [])
         return self.trends
+        
+    def get_stats(self):
+        """Get search and deduplication statistics"""
+        return {
+            'mode': self.mode,
+            'stream': {**self.stream.get_stats(), 'reader_restarts': self.stream_restarts} if self.stream else None,
+            'tweets': {'last_scan': dict(self.scan_stats), 'total': dict(self.tweet_stats)},
+            'seen_ids': len(self.seen),
+            'search_errors': self.search_errors,
+            'keywords': self.keyword_scheduler.get_stats(),
+            'alerts': self.alerts.get_stats(),
+            'near_duplicates': self.duplicates.get_stats(),
+            'query_latency_ms': self.search_latency.summary(),
+            'scan_latency_ms': self.scan_latency.summary()
+        }
+        
+    def close(self):
+        """Shut down the search thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
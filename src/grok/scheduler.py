@@ -0,0 +1,160 @@
+import time
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 30.0  # Seconds between analyses of a token with new data
+DEFAULT_HOT_INTERVAL = 0.5  # Seconds between analyses of a hot token
+DEFAULT_HOT_TTL = 300.0  # Seconds a volume spike keeps a token hot
+DEFAULT_SPIKE_FACTOR = 3.0  # Tick volume over the window average that counts as a spike
+
+
+class AnalysisScheduler:
+    """
+    Dirty-set priority scheduler for token analysis.
+
+    Tokens enter the dirty set when new data arrives and are queued in a
+    heap by due time: last analysis plus the hot or normal interval. Hot
+    tokens (open positions, recent volume spikes) come due sub-second,
+    tokens without new data are never queued unless `idle_interval` asks
+    for a periodic refresh. Heap entries are invalidated lazily through
+    `_due`, so re-prioritizing a token is O(log n).
+    """
+
+    def __init__(
+        self,
+        interval=DEFAULT_INTERVAL,
+        hot_interval=DEFAULT_HOT_INTERVAL,
+        idle_interval=None,
+        hot_ttl=DEFAULT_HOT_TTL
+    ):
+        self.interval = interval
+        self.hot_interval = hot_interval
+        self.idle_interval = idle_interval  # None means idle tokens are skipped
+        self.hot_ttl = hot_ttl
+        self.dirty = set()  # Tokens with data newer than their last analysis
+        self.last_analyzed = {}  # Token address -> epoch of last analysis
+        self._heap = []  # (due, token address)
+        self._due = {}  # Token address -> due time of its live heap entry
+        self._hot_until = {}  # Token address -> epoch its hot status expires
+        self._pinned = set()  # Always hot, e.g. tokens with open positions
+
+    def is_hot(self, token_address, now=None):
+        if token_address in self._pinned:
+            return True
+        until = self._hot_until.get(token_address)
+        if until is None:
+            return False
+        if until < (now or time.time()):
+            del self._hot_until[token_address]
+            return False
+        return True
+
+    def _interval_for(self, token_address, now):
+        return self.hot_interval if self.is_hot(token_address, now) else self.interval
+
+    def _schedule(self, token_address, now):
+        last = self.last_analyzed.get(token_address)
+        due = now if last is None else last + self._interval_for(token_address, now)
+        current = self._due.get(token_address)
+        if current is not None and current <= due:
+            return
+        self._due[token_address] = due
+        heapq.heappush(self._heap, (due, token_address))
+
+    def mark_dirty(self, token_address):
+        """Record new data for a token"""
+        if token_address in self.dirty:
+            return
+        self.dirty.add(token_address)
+        self._schedule(token_address, time.time())
+
+    def mark_hot(self, token_address, ttl=None):
+        """Analyze a token at the hot interval for the next `ttl` seconds"""
+        now = time.time()
+        self._hot_until[token_address] = now + (ttl or self.hot_ttl)
+        if token_address in self.dirty:
+            self._schedule(token_address, now)
+
+    def set_pinned(self, token_addresses):
+        """Replace the set of always-hot tokens, e.g. open positions"""
+        self._pinned = set(token_addresses)
+        now = time.time()
+        for token_address in self._pinned & self.dirty:
+            self._schedule(token_address, now)
+
+    def pop_due(self, now=None):
+        """
+        Pop every token whose analysis is due and mark it analyzed
+
+        Tokens leave the dirty set here, so data arriving while the
+        analysis runs queues them again.
+
+        Returns:
+            list: Token addresses, hot ones first
+        """
+        now = now or time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_time, token_address = heapq.heappop(self._heap)
+            if self._due.get(token_address) != due_time:
+                continue  # Superseded by an earlier entry
+            del self._due[token_address]
+            due.append(token_address)
+
+        if self.idle_interval:
+            cutoff = now - self.idle_interval
+            due.extend(
+                token_address for token_address, last in self.last_analyzed.items()
+                if last <= cutoff and token_address not in self.dirty
+            )
+
+        for token_address in due:
+            self.dirty.discard(token_address)
+            self.last_analyzed[token_address] = now
+
+        due.sort(key=lambda token_address: not self.is_hot(token_address, now))
+        return due
+
+    def forget(self, token_address):
+        """Drop all scheduling state of a token"""
+        self.dirty.discard(token_address)
+        self.last_analyzed.pop(token_address, None)
+        self._due.pop(token_address, None)
+        self._hot_until.pop(token_address, None)
+
+    def next_due_in(self, now=None, cap=None):
+        """Seconds until the next queued token is due, at most `cap`"""
+        now = now or time.time()
+        wait = cap if cap is not None else self.interval
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)  # Drop superseded entries
+        if self._heap:
+            wait = min(wait, max(self._heap[0][0] - now, 0.0))
+        return wait
+
+    def get_stats(self, now=None):
+        """
+        Get scheduler statistics
+
+        Returns:
+            dict: Queue depth, dirty/hot counts and the age in seconds of
+                every token's last analysis
+        """
+        now = now or time.time()
+        ages = {
+            token_address: now - last
+            for token_address, last in self.last_analyzed.items()
+        }
+        hot = {
+            token_address for token_address in list(self._hot_until)
+            if self.is_hot(token_address, now)
+        }
+        return {
+            'queue_depth': len(self._due),
+            'dirty_tokens': len(self.dirty),
+            'hot_tokens': len(hot | self._pinned),
+            'max_analysis_age': max(ages.values(), default=0.0),
+            'analysis_age': ages
+        }
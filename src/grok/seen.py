@@ -0,0 +1,67 @@
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEN_SIZE = 100000  # IDs remembered per index
+
+
+class SeenIndex:
+    """
+    Bounded set of recently seen IDs for deduplication.
+
+    IDs are kept in insertion order and the oldest is evicted once
+    `maxsize` is reached, so memory stays flat however long the process
+    runs. With `ttl` set, IDs are also forgotten that many seconds after
+    they were first seen.
+    """
+
+    def __init__(self, maxsize=DEFAULT_SEEN_SIZE, ttl=None):
+        if maxsize <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._seen = OrderedDict()  # ID -> epoch first seen
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, key):
+        seen_at = self._seen.get(key)
+        if seen_at is None:
+            return False
+        if self.ttl is not None and seen_at <= time.time() - self.ttl:
+            return False
+        return True
+
+    def add(self, key, now=None):
+        """
+        Record an ID
+
+        Returns:
+            bool: True if the ID was not seen before
+        """
+        now = now or time.time()
+        self.expire(now)
+        if key in self._seen:
+            return False
+
+        self._seen[key] = now
+        if len(self._seen) > self.maxsize:
+            self._seen.popitem(last=False)
+            self.evicted += 1
+        return True
+
+    def expire(self, now=None):
+        """Forget IDs older than ttl"""
+        if self.ttl is None:
+            return
+        cutoff = (now or time.time()) - self.ttl
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if seen_at > cutoff:
+                break
+            del self._seen[key]
+            self.evicted += 1
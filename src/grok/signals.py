@@ -0,0 +1,225 @@
+import os
+import json
+import logging
+import operator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.getenv('SIGNAL_RULES_PATH', 'config/signal_rules.json')
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+# Built-in rules, used when no rules file exists
+DEFAULT_RULES = [
+    {
+        'name': 'uptrend_momentum',
+        'type': 'buy',
+        'strength': 0.7,
+        'reason': 'Strong uptrend with positive momentum',
+        'conditions': [
+            {'field': 'trend', 'operator': '==', 'threshold': 'uptrend'},
+            {'field': 'momentum', 'operator': '>', 'threshold': 0}
+        ]
+    },
+    {
+        'name': 'at_support',
+        'type': 'buy',
+        'strength': 0.6,
+        'reason': 'Price at support level',
+        'field': 'current_price',
+        'operator': '<=',
+        'threshold_field': 'support_level'
+    },
+    {
+        'name': 'volume_spike',
+        'type': 'buy',
+        'strength': 0.5,
+        'reason': 'High volume spike',
+        'field': 'volume_1h',
+        'operator': '>',
+        'threshold_field': 'volume_ma24',
+        'multiplier': 2
+    }
+]
+
+
+class Condition:
+    """One compiled `field operator threshold` comparison"""
+
+    __slots__ = ('field', 'compare', 'threshold', 'threshold_field', 'multiplier')
+
+    def __init__(self, spec):
+        self.field = spec['field']
+        op = spec.get('operator', spec.get('op'))
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}' for field '{self.field}'")
+        self.compare = OPERATORS[op]
+        self.threshold_field = spec.get('threshold_field')
+        self.threshold = spec.get('threshold')
+        if self.threshold is None and self.threshold_field is None:
+            raise ValueError(f"Condition on '{self.field}' needs threshold or threshold_field")
+        self.multiplier = spec.get('multiplier', 1)
+
+    def fields(self):
+        return [self.field] + ([self.threshold_field] if self.threshold_field else [])
+
+    def mask(self, table):
+        """Evaluate against every row of a metrics table"""
+        if self.threshold_field:
+            threshold = table[self.threshold_field]
+            if self.multiplier != 1:
+                threshold = threshold * self.multiplier
+        else:
+            threshold = self.threshold
+        return np.asarray(self.compare(table[self.field], threshold), dtype=bool)
+
+
+class SignalRule:
+    """A compiled rule: all conditions must hold to emit its signal"""
+
+    __slots__ = ('name', 'conditions', 'signal')
+
+    def __init__(self, spec):
+        self.name = spec.get('name') or spec.get('reason')
+        specs = spec.get('conditions') or [spec]
+        self.conditions = [Condition(condition) for condition in specs]
+        strength = float(spec['strength'])
+        if not 0 <= strength <= 1:
+            raise ValueError(f"Rule '{self.name}' strength must be between 0 and 1")
+        self.signal = {
+            'type': spec.get('type', 'buy'),
+            'strength': strength,
+            'reason': spec['reason']
+        }
+
+    def mask(self, table):
+        result = self.conditions[0].mask(table)
+        for condition in self.conditions[1:]:
+            result &= condition.mask(table)
+        return result
+
+
+class SignalEngine:
+    """
+    Declarative trading signal rules evaluated as vectorized masks.
+
+    Rules are compiled once into numpy comparisons and evaluated over a
+    metrics table with one column per field and one row per token, so a
+    pass costs one array operation per condition regardless of the token
+    count. Rules come from a JSON file that is re-read when it changes,
+    falling back to DEFAULT_RULES if it doesn't exist.
+    """
+
+    def __init__(self, rules=None, path=DEFAULT_RULES_PATH):
+        self.path = path
+        self._mtime = None
+        self.rules = []
+        self.fields = set()
+        if rules is not None:
+            self.set_rules(rules)
+        elif not self.reload_if_changed():
+            self.set_rules(DEFAULT_RULES)
+
+    def set_rules(self, specs):
+        """Compile and install rules, raises ValueError if any is invalid"""
+        try:
+            rules = [SignalRule(spec) for spec in specs]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid signal rule: {str(e)}")
+
+        fields = set()
+        for rule in rules:
+            for condition in rule.conditions:
+                fields.update(condition.fields())
+        self.rules = rules
+        self.fields = fields
+        logger.info(f"Loaded {len(rules)} signal rules")
+
+    def reload_if_changed(self):
+        """
+        Re-read the rules file if it was modified
+
+        Invalid files are logged and the current rules are kept.
+
+        Returns:
+            bool: True if new rules were installed
+        """
+        if not self.path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        try:
+            with open(self.path) as f:
+                self.set_rules(json.load(f))
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading signal rules from {self.path}: {str(e)}")
+            return False
+
+    def build_table(self, metrics_list):
+        """Build a columnar metrics table from per-token metric dicts"""
+        table = {}
+        for field in self.fields:
+            values = [metrics.get(field) for metrics in metrics_list]
+            if any(isinstance(value, str) for value in values):
+                table[field] = np.array(values, dtype=object)
+            else:
+                table[field] = np.array(values, dtype=float)
+        return table
+
+    def masks(self, table, size):
+        """
+        Evaluate every rule over a metrics table
+
+        Args:
+            table: Field name -> array with one entry per token
+            size: Number of tokens in the table
+
+        Returns:
+            np.ndarray: rules x tokens boolean matrix, rules that fail to
+                evaluate match nothing
+        """
+        result = np.zeros((len(self.rules), size), dtype=bool)
+        for i, rule in enumerate(self.rules):
+            try:
+                result[i] = rule.mask(table)
+            except KeyError as e:
+                logger.error(f"Signal rule '{rule.name}' uses unknown field {str(e)}")
+            except TypeError as e:
+                logger.error(f"Signal rule '{rule.name}' compares incompatible values: {str(e)}")
+        return result
+
+    def evaluate(self, table, size):
+        """
+        Evaluate every rule over a metrics table
+
+        Returns:
+            list: Signal list per token, in table order
+        """
+        signals = [[] for _ in range(size)]
+        # Token-major so each token's signals come out in rule order
+        tokens, rules = np.nonzero(self.masks(table, size).T)
+        for token, rule in zip(tokens.tolist(), rules.tolist()):
+            signals[token].append(dict(self.rules[rule].signal))
+        return signals
+
+    def evaluate_metrics(self, metrics_list):
+        """Evaluate every rule for a list of per-token metric dicts"""
+        if not metrics_list:
+            return []
+        return self.evaluate(self.build_table(metrics_list), len(metrics_list))
@@ -0,0 +1,286 @@
+import os
+import time
+import random
+import asyncio
+import logging
+
+import aiohttp
+
+from .stats import LatencyWindow
+from .polling import AdaptivePoller
+from .symbols import BASE58_ALPHABET
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GMGN_URL = os.getenv('GMGN_API_URL', 'https://api.gmgn.com')  # Example URL
+DEFAULT_PUMPFUN_URL = os.getenv('PUMPFUN_API_URL', 'https://api.pumpfun.com')  # Example URL
+DEFAULT_CONNECTIONS_PER_HOST = int(os.getenv('TRACKER_CONNECTIONS_PER_HOST', 4))  # Also polls in flight per source
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv('TRACKER_REQUEST_TIMEOUT', 10))  # Seconds per poll request
+KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection stays open, well above the poll interval
+DNS_CACHE_TTL = 300  # Seconds a resolved host is cached
+DEGRADED_AFTER = 1  # Consecutive failed polls before a source is reported degraded
+FAILING_AFTER = 3  # and failing
+# Query parameters taking the newest launch_time already seen, for APIs that have one
+GMGN_SINCE_PARAM = os.getenv('GMGN_SINCE_PARAM') or None
+PUMPFUN_SINCE_PARAM = os.getenv('PUMPFUN_SINCE_PARAM') or None
+
+
+class SourceHealth:
+    """Request outcomes and latency of one launch source"""
+
+    def __init__(self):
+        self.latency = LatencyWindow()  # Per successful request
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.failures = 0  # Consecutive failed polls
+        self.in_flight = 0
+        self.last_success = None  # Epoch of the last successful poll
+
+    @property
+    def status(self):
+        if self.failures >= FAILING_AFTER:
+            return 'failing'
+        if self.failures >= DEGRADED_AFTER:
+            return 'degraded'
+        return 'healthy'
+
+    def record_success(self, seconds):
+        self.requests += 1
+        self.failures = 0
+        self.last_success = time.time()
+        self.latency.record(seconds)
+
+    def record_error(self, timeout=False):
+        self.requests += 1
+        self.errors += 1
+        self.timeouts += timeout
+        self.failures += 1
+
+    def get_stats(self):
+        return {
+            'status': self.status,
+            'latency_ms': self.latency.summary(),
+            'requests': self.requests,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'in_flight': self.in_flight,
+            'last_success': self.last_success
+        }
+
+
+class LaunchSource:
+    """
+    Adapter for one launch feed.
+
+    Subclasses set the endpoint, auth headers and query parameters, and
+    map the feed's launch objects to the tracker's field names in
+    normalize(). Each source owns its keep-alive session, its adaptive
+    poller and its health stats, and has its own limit on polls in
+    flight and its own request timeout.
+    """
+
+    name = None
+    path = ''
+    params = {}
+
+    def __init__(
+        self,
+        url,
+        api_key=None,
+        max_concurrency=DEFAULT_CONNECTIONS_PER_HOST,
+        timeout=DEFAULT_REQUEST_TIMEOUT,
+        poller=None,
+        name=None
+    ):
+        self.name = name or self.name
+        self.url = url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.poller = poller or AdaptivePoller()  # Adaptive interval and conditional request state
+        self.health = SourceHealth()
+        self._session = None
+
+    def headers(self):
+        """Get the auth headers of every request"""
+        return {}
+
+    def normalize(self, launch):
+        """
+        Map one launch object of the feed to the tracker's fields
+
+        Returns:
+            dict: Fields including token_address, None values for fields
+                the feed doesn't provide
+        """
+        return {
+            'token_address': launch.get('token_address'),
+            'symbol': launch.get('symbol'),
+            'name': launch.get('name'),
+            'launch_time': launch.get('launch_time'),
+            'initial_price': launch.get('initial_price'),
+            'initial_liquidity': launch.get('initial_liquidity')
+        }
+
+    def _get_session(self):
+        """
+        Get the pooled session, created on first use
+
+        Connections are kept alive between polls, so only the first
+        request to a host pays for DNS, TCP and TLS setup.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.max_concurrency,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={**self.headers(), 'Content-Type': 'application/json'},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def fetch(self):
+        """
+        Get the launches of the feed
+
+        Conditional on the last response, so an unchanged list comes
+        back as an empty 304. Every response is recorded on the poller,
+        error statuses included.
+
+        Returns:
+            tuple: (HTTP status, raw launches or None on an error status)
+        """
+        session = self._get_session()
+        async with session.get(
+            f"{self.url}{self.path}",
+            params=self.poller.request_params(self.params),
+            headers=self.poller.request_headers()
+        ) as response:
+            if response.status == 304:
+                launches = []
+            elif response.status != 200:
+                await response.read()  # Drain so the connection can be reused
+                self.poller.record_response(response.status, response.headers)
+                return response.status, None
+            else:
+                launches = await response.json()
+            self.poller.record_response(response.status, response.headers, launches)
+        return response.status, launches
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def get_stats(self):
+        """Get health, latency and polling state"""
+        return {**self.health.get_stats(), 'polling': self.poller.get_stats()}
+
+
+class GMGNSource(LaunchSource):
+    """GMGN new launches, with market data"""
+
+    name = 'gmgn'
+    path = '/new_launches'
+    params = {'chain': 'solana'}
+
+    def __init__(self, url=DEFAULT_GMGN_URL, api_key=None, **kwargs):
+        kwargs.setdefault('poller', AdaptivePoller(since_param=GMGN_SINCE_PARAM))
+        super().__init__(url, api_key or os.getenv('GMGN_API_KEY'), **kwargs)
+
+    def headers(self):
+        return {'Authorization': f'Bearer {self.api_key}'}
+
+    def normalize(self, launch):
+        fields = super().normalize(launch)
+        fields.update({
+            'market_cap': launch.get('market_cap'),
+            'volume_24h': launch.get('volume_24h'),
+            'holders': launch.get('holders')
+        })
+        return fields
+
+
+class PumpFunSource(LaunchSource):
+    """PumpFun launches, with pair and launch type"""
+
+    name = 'pumpfun'
+    path = '/launches'
+    params = {'blockchain': 'solana'}
+
+    def __init__(self, url=DEFAULT_PUMPFUN_URL, api_key=None, **kwargs):
+        kwargs.setdefault('poller', AdaptivePoller(since_param=PUMPFUN_SINCE_PARAM))
+        super().__init__(url, api_key or os.getenv('PUMPFUN_API_KEY'), **kwargs)
+
+    def headers(self):
+        return {'X-API-Key': self.api_key}
+
+    def normalize(self, launch):
+        fields = super().normalize(launch)
+        fields.update({
+            'launch_type': launch.get('launch_type'),
+            'platform': launch.get('platform'),
+            'pair_address': launch.get('pair_address')
+        })
+        return fields
+
+
+class FakeLaunchSource(LaunchSource):
+    """
+    In-process launch feed for load tests, no network involved.
+
+    Launches are created at `rate` per second and each fetch returns the
+    ones created since the previous fetch plus that fetch's launches
+    again, as real feeds repeat their newest launches. Fetches take a
+    random time up to `latency` seconds and fail with a 503 at
+    `failure_rate`. Sources sharing a `seed` create the same mints, so
+    several fakes can stand in for feeds that overlap.
+    """
+
+    def __init__(self, name='fake', rate=1.0, latency=0.05, failure_rate=0.0, seed=None, **kwargs):
+        super().__init__(f'fake://{name}', name=name, **kwargs)
+        self.rate = rate
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._mints = random.Random(seed)  # Separate stream so mints don't depend on timing
+        self._created = 0  # Launches created so far
+        self._started = None
+        self._previous = []
+
+    def _launch(self, index):
+        mint = '8' + ''.join(self._mints.choice(BASE58_ALPHABET) for _ in range(43))
+        return {
+            'token_address': mint,
+            'symbol': f'FAKE{index}',
+            'name': f'Fake token {index}',
+            'launch_time': self._started + (index + 1) / self.rate,  # When it was created
+            'initial_price': self._rng.random() / 1000,
+            'initial_liquidity': self._rng.random() * 10000
+        }
+
+    async def fetch(self):
+        now = time.time()
+        if self._started is None:
+            self._started = now
+        await asyncio.sleep(self._rng.uniform(0, self.latency))
+        if self._rng.random() < self.failure_rate:
+            self.poller.record_response(503, {})
+            return 503, None
+
+        due = int((time.time() - self._started) * self.rate)
+        created = [self._launch(index) for index in range(self._created, due)]
+        self._created = max(due, self._created)
+        launches = self._previous + created
+        self._previous = created
+        self.poller.record_response(200, {}, launches)
+        return 200, launches
+
+    async def close(self):
+        pass
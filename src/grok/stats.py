@@ -0,0 +1,29 @@
+import logging
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """Bounded window of recent latency samples with percentile reads"""
+
+    def __init__(self, size=1024):
+        self._samples = deque(maxlen=size)
+        self.count = 0  # Samples ever recorded
+
+    def record(self, seconds):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, *qs):
+        """Get latency percentiles in milliseconds, None without samples"""
+        if not self._samples:
+            return {f'p{q}': None for q in qs}
+        values = np.percentile(np.fromiter(self._samples, dtype=float), qs) * 1000
+        return {f'p{q}': float(value) for q, value in zip(qs, values)}
+
+    def summary(self):
+        """Get p50/p99 latency in milliseconds and the sample count"""
+        return {'count': self.count, **self.percentiles(50, 99)}
@@ -0,0 +1,268 @@
+import os
+import json
+import random
+import asyncio
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAM_URL = os.getenv('TWITTER_STREAM_URL', 'https://api.twitter.com/2/tweets/search/stream')
+DEFAULT_STREAM_QUEUE_SIZE = 10000  # Parsed tweets buffered ahead of the scanner
+STALL_TIMEOUT = 30  # Seconds without data or keep-alive before reconnecting, the API sends one every 20s
+
+# Reconnect backoff in seconds: (initial, cap) per failure kind, following
+# the API's guidance of linear-ish growth for network errors and slower,
+# longer waits for HTTP errors and rate limits
+NETWORK_BACKOFF = (0.25, 16)
+HTTP_BACKOFF = (5, 320)
+RATE_LIMIT_BACKOFF = (60, 960)
+
+STREAM_PARAMS = {
+    'expansions': 'author_id',
+    'tweet.fields': 'public_metrics,created_at',
+    'user.fields': 'public_metrics'
+}
+
+
+class StreamUser:
+    """Tweet author in the attribute shape of a tweepy v1.1 User"""
+
+    __slots__ = ('id', 'screen_name', 'followers_count')
+
+    def __init__(self, id, screen_name, followers_count):
+        self.id = id
+        self.screen_name = screen_name
+        self.followers_count = followers_count
+
+
+class StreamTweet:
+    """Streamed tweet in the attribute shape of a tweepy v1.1 Status"""
+
+    __slots__ = ('id', 'text', 'user', 'retweet_count', 'favorite_count')
+
+    def __init__(self, id, text, user, retweet_count, favorite_count):
+        self.id = id
+        self.text = text
+        self.user = user
+        self.retweet_count = retweet_count
+        self.favorite_count = favorite_count
+
+    @classmethod
+    def from_payload(cls, payload):
+        """
+        Build a tweet from one filtered-stream JSON object
+
+        Returns:
+            StreamTweet: The tweet, or None for payloads without tweet data
+        """
+        data = payload.get('data')
+        if not data:
+            return None
+        users = {
+            user['id']: user
+            for user in payload.get('includes', {}).get('users', ())
+        }
+        author = users.get(data.get('author_id'), {})
+        metrics = data.get('public_metrics', {})
+        return cls(
+            int(data['id']),
+            data.get('text', ''),
+            StreamUser(
+                int(data.get('author_id') or 0),
+                author.get('username', ''),
+                author.get('public_metrics', {}).get('followers_count', 0)
+            ),
+            metrics.get('retweet_count', 0),
+            metrics.get('like_count', 0)
+        )
+
+
+class TweetStream:
+    """
+    Long-lived filtered-stream connection feeding a bounded queue.
+
+    The chunked response is read line by line and every tweet is parsed
+    as soon as its line is complete. Tweets go into an asyncio.Queue;
+    when the consumer falls behind, put() blocks, reading stops and TCP
+    flow control pushes back on the server instead of buffering without
+    bound. Disconnects reconnect with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        bearer_token=None,
+        url=DEFAULT_STREAM_URL,
+        rules=(),
+        queue_size=DEFAULT_STREAM_QUEUE_SIZE,
+        stall_timeout=STALL_TIMEOUT
+    ):
+        self.bearer_token = bearer_token or os.getenv('TWITTER_BEARER_TOKEN')
+        if not self.bearer_token:
+            raise ValueError("Twitter bearer token not found in .env file")
+
+        self.url = url
+        self.rules = list(rules)  # Filter rule values kept on the stream
+        self.stall_timeout = stall_timeout
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self._rules_synced = False
+        self._rules_version = 0  # Bumped by set_rules, a sync of an older version isn't current
+        self._retired = set()  # Rules dropped by set_rules, deleted on the next sync
+        self._sync_lock = asyncio.Lock()
+        self._session = None  # Session of the running reader, for live rule changes
+        self._sync_task = None
+        self._failures = 0  # Consecutive failed connections
+        self.stats = {
+            'connects': 0,
+            'disconnects': 0,
+            'tweets': 0,
+            'keep_alives': 0,
+            'parse_errors': 0
+        }
+
+    def _headers(self):
+        return {'Authorization': f'Bearer {self.bearer_token}'}
+
+    def set_rules(self, rules):
+        """
+        Replace the filter rules
+
+        A running stream syncs them right away, the open connection picks
+        up rule changes without reconnecting. Rules dropped from the
+        previous set are deleted; rules this stream never configured are
+        left alone.
+        """
+        rules = list(dict.fromkeys(rules))
+        self._retired.update(rule for rule in self.rules if rule not in rules)
+        self._retired.difference_update(rules)
+        self.rules = rules
+        self._rules_version += 1
+        self._rules_synced = False
+        if self._session is not None:
+            self._sync_task = asyncio.create_task(self._resync(self._session))
+
+    async def _resync(self, session):
+        try:
+            await self.sync_rules(session)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Retried before the next connect
+            logger.error(f"Error syncing filtered-stream rules: {str(e)}")
+
+    async def sync_rules(self, session):
+        """Add configured rules the stream doesn't have yet and delete retired ones"""
+        async with self._sync_lock:
+            version = self._rules_version
+            retired = set(self._retired)
+            async with session.get(f"{self.url}/rules", headers=self._headers()) as response:
+                response.raise_for_status()
+                existing = {rule['value']: rule['id'] for rule in (await response.json()).get('data', ())}
+
+            missing = [{'value': rule} for rule in self.rules if rule not in existing]
+            if missing:
+                async with session.post(
+                    f"{self.url}/rules",
+                    headers=self._headers(),
+                    json={'add': missing}
+                ) as response:
+                    response.raise_for_status()
+                logger.info(f"Added {len(missing)} filtered-stream rules")
+
+            stale = [existing[rule] for rule in retired if rule in existing]
+            if stale:
+                async with session.post(
+                    f"{self.url}/rules",
+                    headers=self._headers(),
+                    json={'delete': {'ids': stale}}
+                ) as response:
+                    response.raise_for_status()
+                logger.info(f"Deleted {len(stale)} filtered-stream rules")
+            self._retired -= retired
+            self._rules_synced = version == self._rules_version
+
+    def _backoff(self, schedule):
+        initial, cap = schedule
+        delay = min(initial * 2 ** (self._failures - 1), cap)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run(self):
+        """Connect and keep reading until cancelled"""
+        timeout = aiohttp.ClientTimeout(total=None, connect=10, sock_read=self.stall_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            self._session = session
+            try:
+                await self._connect(session)
+            finally:
+                self._session = None
+
+    async def _connect(self, session):
+        """Read the stream on `session`, reconnecting with backoff"""
+        while True:
+            schedule = NETWORK_BACKOFF
+            try:
+                if (self.rules or self._retired) and not self._rules_synced:
+                    await self.sync_rules(session)
+                async with session.get(
+                    self.url,
+                    headers=self._headers(),
+                    params=STREAM_PARAMS
+                ) as response:
+                    if response.status == 429:
+                        schedule = RATE_LIMIT_BACKOFF
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, (), status=429, message='rate limited'
+                        )
+                    response.raise_for_status()
+                    self.stats['connects'] += 1
+                    logger.info("Connected to Twitter filtered stream")
+                    await self._read(response)
+                raise aiohttp.ClientPayloadError('stream closed by server')
+
+            except asyncio.CancelledError:
+                raise
+            except aiohttp.ClientResponseError as e:
+                if schedule is not RATE_LIMIT_BACKOFF:
+                    schedule = HTTP_BACKOFF
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+
+            self.stats['disconnects'] += 1
+            self._failures += 1
+            delay = self._backoff(schedule)
+            logger.warning(
+                f"Twitter stream disconnected ({str(error) or type(error).__name__}), "
+                f"reconnecting in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _read(self, response):
+        """Parse newline-delimited tweets into the queue until the stream ends"""
+        async for line in response.content:
+            line = line.strip()
+            if not line:
+                self.stats['keep_alives'] += 1  # Blank keep-alive line
+                continue
+            try:
+                tweet = StreamTweet.from_payload(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                self.stats['parse_errors'] += 1
+                logger.error(f"Error parsing streamed tweet: {str(e)}")
+                continue
+            if tweet is None:
+                continue
+
+            self._failures = 0  # Data flowing again resets the backoff
+            self.stats['tweets'] += 1
+            await self.queue.put(tweet)  # Blocks when the consumer is behind
+
+    async def get_batch(self, max_size):
+        """Wait for at least one tweet, then take up to max_size queued ones"""
+        batch = [await self.queue.get()]
+        while len(batch) < max_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    def get_stats(self):
+        """Get stream statistics"""
+        return {**self.stats, 'queue_depth': self.queue.qsize()}
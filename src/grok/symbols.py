@@ -0,0 +1,222 @@
+import os
+import re
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STOPWORDS_PATH = os.getenv('SYMBOL_STOPWORDS_PATH', 'config/symbol_stopwords.txt')
+
+# Cashtags that are never new memecoins: words, fiat, majors and
+# stablecoins, and crypto jargon that gets dollar-prefixed in shill tweets
+DEFAULT_STOPWORDS = frozenset('''
+    THE AND FOR ARE BUT NOT YOU ALL ANY CAN HAD HER WAS ONE OUR OUT DAY GET
+    HAS HIM HIS HOW MAN NEW NOW OLD SEE TWO WAY WHO BOY DID ITS LET PUT SAY
+    SHE TOO USE THIS THAT WITH HAVE FROM THEY WILL YOUR WHAT WHEN JUST LIKE
+    BUY SELL HOLD MOON PUMP DUMP SEND GEM GEMS APE NEXT HUGE FREE LIVE
+    SOL USD USDT USDC EUR GBP JPY BTC ETH BNB XRP ADA DOT AVAX MATIC
+    LINK LTC TRX TON ARB OPS ATOM NEAR WBTC WETH WSOL DAI
+    BUSD TUSD USDE FDUSD PYUSD JUP RAY ORCA JTO PYTH
+    CEO NFT NFTS DEX CEX ATH ATL APY APR TVL ROI DYOR NFA FOMO FUD HODL
+    LFG WAGMI NGMI IMO TBH ICO IDO IEO KYC AMA DAO DEFI GAS
+    SPX SPY QQQ NDX DJI VIX TSLA AAPL NVDA AMZN MSFT GOOG META COIN MSTR
+'''.split())
+
+# Solana addresses are 32 bytes, 32 to 44 base58 characters
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_VALUES = {char: value for value, char in enumerate(BASE58_ALPHABET)}
+# Byte -> digit value, 255 for bytes outside the alphabet
+BASE58_DIGITS = bytes(BASE58_VALUES.get(chr(byte), 255) for byte in range(256))
+
+CASHTAG_PATTERN = re.compile(r'\$([A-Z]{3,10})\b')
+
+# Mints are found as runs of 32 to 44 base58 characters, bare or inside
+# links such as pump.fun/coin/<mint> or dexscreener.com/solana/<mint>.
+# Mapping every base58 character to 'a' turns that into a substring
+# search for 32 'a's, which runs at C speed instead of a regex attempt
+# at every position.
+MIN_MINT_LENGTH = 32
+MAX_MINT_LENGTH = 44
+BASE58_RUNS = str.maketrans({char: 'a' for char in BASE58_ALPHABET})
+RUN_PROBE = 'a' * MIN_MINT_LENGTH
+RUN_END = re.compile('[^a]')
+
+
+def mint_bytes(address):
+    """
+    Decode a base58 mint address
+
+    Returns:
+        bytes: The 32 address bytes, None if it isn't a Solana address
+    """
+    digits = address.encode().translate(BASE58_DIGITS)
+    if not digits or max(digits) >= 58:
+        return None
+    value = 0
+    for digit in digits:
+        value = value * 58 + digit
+    leading_zeros = len(address) - len(address.lstrip('1'))
+    if leading_zeros + (value.bit_length() + 7) // 8 != 32:
+        return None
+    return value.to_bytes(32, 'big')
+
+
+def is_mint_address(candidate):
+    """Check that a base58 string decodes to exactly 32 bytes"""
+    return mint_bytes(candidate) is not None
+
+
+def load_stopwords(path=DEFAULT_STOPWORDS_PATH):
+    """
+    Load extra stopwords from a file with one symbol per line
+
+    Blank lines and lines starting with # are skipped.
+
+    Returns:
+        set: Upper-cased symbols, empty if the file doesn't exist
+    """
+    if not path or not os.path.exists(path):
+        return set()
+    try:
+        with open(path) as f:
+            return {
+                line.strip().lstrip('$').upper() for line in f
+                if line.strip() and not line.startswith('#')
+            }
+    except OSError as e:
+        logger.error(f"Error loading symbol stopwords from {path}: {str(e)}")
+        return set()
+
+
+class SymbolExtractor:
+    """
+    Batch extraction of cashtags and mint addresses from tweet text.
+
+    Cashtags come from one C-level findall per text. For mints the batch
+    is joined into one string and searched once for base58 runs, which are
+    mapped back to their tweet by offset. Stopwords and blacklisted symbols are
+    one frozenset, so the filter costs the same however large it grows.
+    """
+
+    def __init__(self, stopwords=None, blacklist=(), stopwords_path=DEFAULT_STOPWORDS_PATH):
+        stopwords = DEFAULT_STOPWORDS if stopwords is None else stopwords
+        self.stopwords = frozenset(
+            symbol.upper() for symbol in (*stopwords, *blacklist, *load_stopwords(stopwords_path))
+        )
+        self._mint_cache = {}  # Candidate -> bool, mints repeat across tweets
+
+    def _is_mint(self, candidate):
+        valid = self._mint_cache.get(candidate)
+        if valid is None:
+            if len(self._mint_cache) > 100000:
+                self._mint_cache.clear()
+            valid = self._mint_cache[candidate] = is_mint_address(candidate)
+        return valid
+
+    def extract(self, text):
+        """
+        Extract token references from one text
+
+        Returns:
+            tuple: (set of symbols, set of mint addresses)
+        """
+        return self.extract_batch([text])[0]
+
+    def extract_batch(self, texts):
+        """
+        Extract token references from many texts in one pass
+
+        Args:
+            texts: List of tweet texts
+
+        Returns:
+            list: (set of symbols, set of mint addresses) per text, in order
+        """
+        stopwords = self.stopwords
+        findall = CASHTAG_PATTERN.findall
+        results = [
+            ({symbol for symbol in findall(text) if symbol not in stopwords}, set())
+            for text in texts
+        ]
+        if not texts:
+            return results
+
+        # Mints are rare, so the batch is joined and searched in one go.
+        # Newlines aren't base58, so a run never spans two texts.
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        joined = '\n'.join(texts)
+
+        for position, mint in self._mint_candidates(joined):
+            if self._is_mint(mint):
+                results[bisect.bisect_right(starts, position) - 1][1].add(mint)
+        return results
+
+    @staticmethod
+    def _mint_candidates(joined):
+        """Yield (offset, run) for every base58 run of mint length"""
+        runs = joined.translate(BASE58_RUNS)
+        position = runs.find(RUN_PROBE)
+        while position != -1:
+            # find() returns the leftmost probe, so this is the start of a run
+            end = RUN_END.search(runs, position + MIN_MINT_LENGTH)
+            end = end.start() if end else len(runs)
+            if end - position <= MAX_MINT_LENGTH:
+                yield position, joined[position:end]
+            position = runs.find(RUN_PROBE, end)
+
+
+class SymbolIndex:
+    """
+    Two-way index between ticker symbols and mint addresses.
+
+    Tickers are not unique, so a symbol maps to every mint launched under
+    it, newest last. Both directions are dict lookups.
+    """
+
+    def __init__(self):
+        self._mints = {}  # Upper-cased symbol -> list of mint addresses
+        self._symbols = {}  # Mint address -> symbol
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def add(self, symbol, mint):
+        """Record that `mint` trades under `symbol`"""
+        if not symbol or not mint:
+            return
+        symbol = symbol.lstrip('$').upper()
+        previous = self._symbols.get(mint)
+        if previous == symbol:
+            return
+        if previous is not None:
+            self._mints[previous].remove(mint)
+            if not self._mints[previous]:
+                del self._mints[previous]
+        self._symbols[mint] = symbol
+        self._mints.setdefault(symbol, []).append(mint)
+
+    def remove(self, mint):
+        """Forget a mint"""
+        symbol = self._symbols.pop(mint, None)
+        if symbol is None:
+            return
+        self._mints[symbol].remove(mint)
+        if not self._mints[symbol]:
+            del self._mints[symbol]
+
+    def update_from_launches(self, launches):
+        """Index launches shaped like LaunchTracker.tracked_launches"""
+        for mint, launch in launches.items():
+            self.add(launch.get('symbol'), mint)
+
+    def mints_for(self, symbol):
+        """Get candidate mints of a symbol, newest last"""
+        return tuple(self._mints.get(symbol.lstrip('$').upper(), ()))
+
+    def symbol_for(self, mint):
+        """Get the symbol of a mint, None if unknown"""
+        return self._symbols.get(mint)
@@ -0,0 +1,206 @@
+import time
+import logging
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns kept for every tick, in storage order
+TICK_COLUMNS = (
+    'timestamp',
+    'price',
+    'volume',
+    'liquidity',
+    'social_mentions',
+    'sentiment'
+)
+
+DEFAULT_CAPACITY = 20000  # Ticks kept per token
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # Keep only last 7 days of data
+
+
+def to_epoch(value):
+    """Convert a tick timestamp (ISO string, datetime or number) to epoch seconds"""
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float, np.floating, np.integer)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+class ColumnRing:
+    """
+    Columnar ring buffer with contiguous, zero-copy reads.
+
+    Every column is a float64 array of twice the allocated size and each
+    row is written to both halves, so the live window is always one
+    contiguous slice. Storage starts small and doubles up to `capacity`,
+    so rarely updated series stay cheap. Appends are amortized O(1) and
+    reads are read-only array views in time order. Columns named in
+    `widths` hold that many values per row and read as 2D views, columns
+    named in `dtypes` use that float type instead of float64.
+    """
+
+    def __init__(self, columns, capacity, initial_size=64, widths=None, dtypes=None):
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+
+        self.capacity = capacity
+        self.column_names = tuple(columns)
+        widths = widths or {}
+        # Per-row shape of every column, () for scalars
+        self._shapes = {name: (widths[name],) if name in widths else () for name in self.column_names}
+        self._dtypes = dtypes or {}
+        self._size = min(initial_size, capacity)  # Allocated rows per half
+        self._columns = {
+            name: self._allocate(name, self._size) for name in self.column_names
+        }
+        self._head = 0  # Next physical slot to write, in [0, size)
+        self._count = 0  # Number of live rows
+        self._total = 0  # Rows ever appended
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def total(self):
+        """Number of rows ever appended, including evicted ones"""
+        return self._total
+
+    def _allocate(self, name, size):
+        return np.full((2 * size, *self._shapes[name]), np.nan, dtype=self._dtypes.get(name, np.float64))
+
+    def _grow(self):
+        size = min(self._size * 2, self.capacity)
+        for name in self.column_names:
+            live = self.column(name)
+            column = self._allocate(name, size)
+            column[:self._count] = live
+            column[size:size + self._count] = live
+            self._columns[name] = column
+        self._size = size
+        self._head = self._count % size
+
+    def append_row(self, values):
+        """Append one row given as a sequence in column order"""
+        if self._count == self._size and self._size < self.capacity:
+            self._grow()
+
+        slot = self._head
+        mirror = slot + self._size
+        for name, value in zip(self.column_names, values):
+            column = self._columns[name]
+            column[slot] = value
+            column[mirror] = value
+
+        self._head = (slot + 1) % self._size
+        self._total += 1
+        if self._count < self._size:
+            self._count += 1
+
+    def set_last(self, name, value):
+        """Overwrite a column of the most recent row in place"""
+        slot = (self._head - 1) % self._size
+        column = self._columns[name]
+        column[slot] = value
+        column[slot + self._size] = value
+
+    def drop_oldest(self, n):
+        """Forget the n oldest rows"""
+        self._count -= min(n, self._count)
+
+    def column(self, name):
+        """Get a read-only, zero-copy view of a column in time order"""
+        start = (self._head - self._count) % self._size
+        view = self._columns[name][start:start + self._count]
+        view.flags.writeable = False
+        return view
+
+    def tail(self, name, n):
+        """Get a view of the last n values of a column"""
+        view = self.column(name)
+        return view[-n:] if n < len(view) else view
+
+    def last(self, name):
+        """Get the most recent value of a column"""
+        if not self._count:
+            return None
+        return float(self._columns[name][(self._head - 1) % self._size])
+
+
+class TickBuffer(ColumnRing):
+    """
+    Fixed-capacity columnar ring buffer holding the ticks of one token.
+
+    Appends are O(1), age eviction is a binary search on the timestamp
+    column and reads are zero-copy, read-only array views. Ticks older
+    than the newest one are counted in `late_ticks` and dropped, like
+    BarSeries does, so the timestamp column stays sorted.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_age=DEFAULT_MAX_AGE):
+        super().__init__(TICK_COLUMNS, capacity)
+        self.max_age = max_age
+        self._present = set()  # Optional columns that have received a value
+        self.late_ticks = 0
+
+    def append(self, tick, timestamp=None):
+        """
+        Append one tick and evict ticks older than max_age
+
+        Args:
+            tick: Dict with 'timestamp', 'price', 'volume' and optionally
+                'liquidity', 'social_mentions' and 'sentiment'
+            timestamp: Epoch of the tick if already parsed
+
+        Returns:
+            bool: False if the tick is older than the newest one and was dropped
+        """
+        if timestamp is None:
+            timestamp = to_epoch(tick.get('timestamp'))
+        newest = self.last('timestamp')
+        if newest is not None and timestamp < newest:
+            self.late_ticks += 1
+            return False
+
+        values = [timestamp]
+        for name in TICK_COLUMNS[1:]:
+            value = tick.get(name)
+            if value is None:
+                value = np.nan
+            else:
+                self._present.add(name)
+            values.append(value)
+        self.append_row(values)
+
+        if self.max_age:
+            self.evict_before(time.time() - self.max_age)
+        return True
+
+    def evict_before(self, cutoff):
+        """
+        Drop all ticks with timestamp <= cutoff
+
+        Returns:
+            int: Number of evicted ticks
+        """
+        timestamps = self.column('timestamp')
+        drop = int(np.searchsorted(timestamps, cutoff, side='right'))
+        if drop:
+            self.drop_oldest(drop)
+        return drop
+
+    def has(self, name):
+        """Check whether an optional column has ever received a value"""
+        return name == 'timestamp' or name in self._present
+
+    def to_dict(self):
+        """Get views of every populated column keyed by name"""
+        return {
+            name: self.column(name)
+            for name in TICK_COLUMNS
+            if self.has(name)
+        }
@@ -1,130 +1,258 @@
 import os
-import aiohttp
+import time
 import asyncio
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
 
+from .seen import SeenIndex
+from .launches import LaunchStore, DetectionStats, DEFAULT_LAUNCH_RECORDS, DEFAULT_LAUNCH_TTL, DEFAULT_SPILL_PATH, DEFAULT_SEEN_LAUNCHES, DEFAULT_SEEN_TTL
+from .sources import GMGNSource, PumpFunSource, DEFAULT_GMGN_URL, DEFAULT_PUMPFUN_URL, DEFAULT_CONNECTIONS_PER_HOST, DEFAULT_REQUEST_TIMEOUT
+from .symbols import SymbolIndex
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+RESTART_DELAY = 5  # Seconds before a crashed source loop is restarted
+
 class LaunchTracker:
-    def __init__(self):
-        self.gmgn_api_key = os.getenv('GMGN_API_KEY')
-        self.pumpfun_api_key = os.getenv('PUMPFUN_API_KEY')
-        
-        if not self.gmgn_api_key or not self.pumpfun_api_key:
-            raise ValueError("API keys not found in .env file")
+    def __init__(
+        self,
+        symbol_index=None,
+        gmgn_url=DEFAULT_GMGN_URL,
+        pumpfun_url=DEFAULT_PUMPFUN_URL,
+        connections_per_host=DEFAULT_CONNECTIONS_PER_HOST,
+        request_timeout=DEFAULT_REQUEST_TIMEOUT,
+        launch_records=DEFAULT_LAUNCH_RECORDS,
+        launch_ttl=DEFAULT_LAUNCH_TTL,
+        spill_path=DEFAULT_SPILL_PATH,
+        seen_launches=DEFAULT_SEEN_LAUNCHES,
+        seen_ttl=DEFAULT_SEEN_TTL,
+        sources=None
+    ):
+        if sources is None:
+            self.gmgn_api_key = os.getenv('GMGN_API_KEY')
+            self.pumpfun_api_key = os.getenv('PUMPFUN_API_KEY')
             
-        self.gmgn_url = "https://api.gmgn.com"  # Example URL
-        self.pumpfun_url = "https://api.pumpfun.com"  # Example URL
-        self.tracked_launches = {}
+            if not self.gmgn_api_key or not self.pumpfun_api_key:
+                raise ValueError("API keys not found in .env file")
+                
+            sources = [
+                GMGNSource(gmgn_url, self.gmgn_api_key, max_concurrency=connections_per_host, timeout=request_timeout),
+                PumpFunSource(pumpfun_url, self.pumpfun_api_key, max_concurrency=connections_per_host, timeout=request_timeout)
+            ]
+        self.sources = {source.name: source for source in sources}  # Name -> LaunchSource adapter
+        self.symbol_index = symbol_index if symbol_index is not None else SymbolIndex()  # Symbol <-> mint of tracked launches
+        # Addresses of every launch seen, for dedup long after the record is gone
+        self.seen_launches = SeenIndex(seen_launches, ttl=seen_ttl)
+        self.tracked_launches = LaunchStore(  # Full records of recent launches
+            launch_records,
+            launch_ttl,
+            spill_path,
+            on_evict=lambda address, launch: self.symbol_index.remove(address)
+        )
+        self.detection = DetectionStats()  # Which source sees launches first
         
     async def start_tracking(self, callback):
         """
         Start continuous launch tracking
         
+        Every source runs in its own task, so a slow or failing source
+        never holds up the others, and a source loop that crashes is
+        restarted.
+        
         Args:
             callback: Function to call with new launch data
         """
-        while True:
-            try:
-                # Track from multiple sources concurrently
-                await asyncio.gather(
-                    self._track_gmgn(callback),
-                    self._track_pumpfun(callback)
-                )
-                await asyncio.sleep(5)  # Check every 5 seconds
-                
-            except Exception as e:
-                logger.error(f"Error in launch tracking: {str(e)}")
-                await asyncio.sleep(30)  # Wait longer on error
+        tasks = {
+            asyncio.create_task(self._run_source(source, callback)): source
+            for source in self.sources.values()
+        }
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = tasks.pop(task)
+                    logger.error(f"{source.name} launch source stopped: {task.exception()!r}, restarting")
+                    tasks[asyncio.create_task(self._run_source(source, callback, RESTART_DELAY))] = source
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.close()
+            
+    async def _run_source(self, source, callback, delay=0):
+        """
+        Poll one source at the interval its recent launches justify
+        
+        The next delay is read once the poll has recorded its outcome, so
+        the adaptive interval and error backoff apply to the very next
+        poll. Only a poll that outlasts the interval gets a second one
+        started alongside it, up to max_concurrency polls at once.
+        """
+        await asyncio.sleep(delay)
+        slots = asyncio.Semaphore(source.max_concurrency)
+        polled = asyncio.Event()  # Set when a poll has recorded its outcome
+        polls = set()
+        
+        def finished(task):
+            polls.discard(task)
+            slots.release()
+            
+        try:
+            while True:
+                await slots.acquire()
+                polled.clear()
+                task = asyncio.create_task(self._poll(source, callback, polled))
+                polls.add(task)
+                task.add_done_callback(finished)
+                try:
+                    await asyncio.wait_for(polled.wait(), source.poller.next_delay())
+                except asyncio.TimeoutError:
+                    continue  # Still running after a whole interval
+                await asyncio.sleep(source.poller.next_delay())
+        finally:
+            for task in polls:
+                task.cancel()
                 
-    async def _track_gmgn(self, callback):
-        """Track launches from GMGN"""
+    async def _poll(self, source, callback, polled=None):
+        """
+        Fetch and process one poll of a source
+        
+        Args:
+            polled: Event to set once the outcome is recorded on the poller
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {self.gmgn_api_key}',
-                    'Content-Type': 'application/json'
-                }
+            await self._poll_once(source, callback)
+        finally:
+            if polled is not None:
+                polled.set()
                 
-                async with session.get(
-                    f"{self.gmgn_url}/new_launches",
-                    headers=headers,
-                    params={'chain': 'solana'}
-                ) as response:
-                    if response.status == 200:
-                        launches = await response.json()
-                        await self._process_launches(launches, 'gmgn', callback)
-                    else:
-                        logger.error(f"GMGN API error: {response.status}")
-                        
+    async def _poll_once(self, source, callback):
+        """Fetch one poll of a source and record its outcome"""
+        health = source.health
+        health.in_flight += 1
+        start = time.perf_counter()
+        try:
+            status, launches = await asyncio.wait_for(source.fetch(), source.timeout)
+        except asyncio.TimeoutError:
+            health.record_error(timeout=True)
+            source.poller.record_error()
+            logger.error(f"{source.name} launch poll timed out after {source.timeout}s")
+            return
         except Exception as e:
-            logger.error(f"GMGN tracking error: {str(e)}")
+            health.record_error()
+            source.poller.record_error()
+            logger.error(f"{source.name} tracking error: {str(e)}")
+            return
+        finally:
+            health.in_flight -= 1
             
-    async def _track_pumpfun(self, callback):
-        """Track launches from PumpFun"""
+        if launches is None:
+            health.record_error()  # The poller recorded the error status itself
+            logger.error(f"{source.name} API error: {status}")
+            return
+        health.record_success(time.perf_counter() - start)
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'X-API-Key': self.pumpfun_api_key,
-                    'Content-Type': 'application/json'
-                }
-                
-                async with session.get(
-                    f"{self.pumpfun_url}/launches",
-                    headers=headers,
-                    params={'blockchain': 'solana'}
-                ) as response:
-                    if response.status == 200:
-                        launches = await response.json()
-                        await self._process_launches(launches, 'pumpfun', callback)
-                    else:
-                        logger.error(f"PumpFun API error: {response.status}")
-                        
+            new_launches = await self._process_launches(launches, source.name, callback)
         except Exception as e:
-            logger.error(f"PumpFun tracking error: {str(e)}")
-            
+            logger.error(f"Error processing {source.name} launches: {str(e)}")
+            return
+        source.poller.record_launches(new_launches)
+        
     async def _process_launches(self, launches, source, callback):
-        """Process launch data and notify if new"""
+        """
+        Process launch data and notify about new launches and enrichments
+        
+        The first sighting of a mint from any source emits a 'launch'
+        event with the full record. Later sightings merge fields the
+        record doesn't have yet and emit an 'enrichment' event with just
+        those fields, and the first sighting by each further source also
+        records its lag behind the first one.
+        
+        Returns:
+            int: Number of new launches
+        """
+        normalize = self.sources[source].normalize
+        new_launches = 0
         for launch in launches:
-            token_address = launch.get('token_address')
+            fields = normalize(launch)
+            token_address = fields.pop('token_address', None)
             
             if not token_address:
                 continue
                 
+            now = time.time()
+            
             # Check if this is a new launch
-            if token_address not in self.tracked_launches:
+            if self.seen_launches.add(token_address, now):
                 processed_launch = {
-                    'symbol': launch.get('symbol'),
-                    'name': launch.get('name'),
+                    **fields,
                     'address': token_address,
-                    'launch_time': launch.get('launch_time'),
-                    'initial_price': launch.get('initial_price'),
-                    'initial_liquidity': launch.get('initial_liquidity'),
-                    'source': source,
-                    'detected_at': datetime.now().isoformat()
+                    'source': source,  # Source that saw it first
+                    'detected_at': datetime.now().isoformat(),
+                    'sources': {source: now}  # Source -> epoch it first saw the launch
                 }
                 
-                # Add additional metrics if available
-                if source == 'gmgn':
-                    processed_launch.update({
-                        'market_cap': launch.get('market_cap'),
-                        'volume_24h': launch.get('volume_24h'),
-                        'holders': launch.get('holders')
-                    })
-                elif source == 'pumpfun':
-                    processed_launch.update({
-                        'launch_type': launch.get('launch_type'),
-                        'platform': launch.get('platform'),
-                        'pair_address': launch.get('pair_address')
-                    })
-                    
                 # Store and notify
-                self.tracked_launches[token_address] = processed_launch
-                await callback(processed_launch)
+                self.tracked_launches.add(token_address, processed_launch, now)
+                self.symbol_index.add(processed_launch['symbol'], token_address)
+                self.detection.record_first(source)
+                new_launches += 1
+                await callback({
+                    **processed_launch,
+                    'sources': dict(processed_launch['sources']),
+                    'event': 'launch'
+                })
+                continue
+                
+            record = self.tracked_launches.get(token_address, now=now)
+            if record is None:
+                continue  # Seen long ago, the record is gone
+                
+            added = {
+                name: value for name, value in fields.items()
+                if value is not None and record.get(name) is None
+            }
+            lag = None
+            if source not in record['sources']:
+                record['sources'][source] = now
+                lag = now - record['sources'][record['source']]
+                self.detection.record_lag(source, lag)
+            if not added and lag is None:
+                continue
+                
+            record.update(added)
+            if 'symbol' in added:
+                self.symbol_index.add(added['symbol'], token_address)
+            await callback({
+                'event': 'enrichment',
+                'address': token_address,
+                'symbol': record['symbol'],
+                'source': source,
+                'fields': added,
+                'lag': lag  # Seconds behind the first source, None if this source saw it before
+            })
+        return new_launches
                 
     def get_tracked_launches(self):
-        """Get all tracked launches"""
-        return self.tracked_launches
+        """Get the recent launches still held in memory"""
+        return dict(self.tracked_launches.items())
+        
+    def get_stats(self):
+        """Get per-source health, latency and polling state, and launch counts"""
+        stats = {name: source.get_stats() for name, source in self.sources.items()}
+        stats['launches'] = {
+            'seen': len(self.seen_launches),
+            'records': len(self.tracked_launches),
+            'evicted': self.tracked_launches.evicted,
+            'spilled': self.tracked_launches.spilled
+        }
+        stats['detection'] = self.detection.get_stats()
+        return stats
+        
+    async def close(self):
+        """Close the sources' pooled sessions and their connections, and write spilled records"""
+        for source in self.sources.values():
+            await source.close()
+        await self.tracked_launches.flush()